@@ -792,7 +792,11 @@ class SimulationEngine:
         # Create and save a temporary bot config (will be cleaned up later)
         bot_config = TradingBotConfig.objects.create(
             user=self.simulation_run.user,
-            name=f"Sim_{self.simulation_run.name}_Bot_{bot_sim_config.bot_index}",
+            # Suffixed with the config id: bot names are unique per user
+            name=(
+                f"Sim_{self.simulation_run.name}_Bot_{bot_sim_config.bot_index}"
+                f"_{bot_sim_config.id.hex[:8]}"
+            ),
             is_active=False,  # Not active, just for simulation
             budget_type="cash",
             budget_cash=budget_cash,
@@ -480,7 +480,11 @@ def _execute_single_bot_simulation_internal(
 
         bot_config = TradingBotConfig.objects.create(
             user=simulation_run.user,
-            name=f"Sim_{simulation_run.name}_Bot_{bot_sim_config.bot_index}",
+            # Suffixed with the config id: bot names are unique per user
+            name=(
+                f"Sim_{simulation_run.name}_Bot_{bot_sim_config.bot_index}"
+                f"_{bot_sim_config.id.hex[:8]}"
+            ),
             is_active=False,
             budget_type="cash",
             budget_cash=budget_cash,
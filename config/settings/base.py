@@ -153,6 +153,14 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD", ""),
         "HOST": os.environ.get("DB_HOST", ""),
         "PORT": os.environ.get("DB_PORT", ""),
+        # Reuse connections across requests instead of reconnecting each time
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        # Required when PostgreSQL sits behind PgBouncer in transaction mode
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get(
+            "DB_DISABLE_SERVER_SIDE_CURSORS", "False"
+        ).lower()
+        == "true",
     }
 }
 
@@ -24,6 +24,11 @@ DATABASES = {
             "sslmode": "require",
         },
         "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get(
+            "DB_DISABLE_SERVER_SIDE_CURSORS", "False"
+        ).lower()
+        == "true",
     }
 }
 
@@ -21,6 +21,11 @@ DATABASES = {
         "HOST": os.environ.get("DB_HOST", "db"),
         "PORT": os.environ.get("DB_PORT", "5432"),
         "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get(
+            "DB_DISABLE_SERVER_SIDE_CURSORS", "False"
+        ).lower()
+        == "true",
     }
 }
 
@@ -196,7 +196,7 @@ export interface Stock {
 }
 
 export interface StockPrice {
-  id: string;
+  id: number;
   stock: string;
   stock_symbol: string;
   stock_name?: string;
@@ -216,7 +216,7 @@ export interface StockPrice {
 }
 
 export interface IntradayPrice {
-  id: string;
+  id: number;
   stock_symbol: string;
   stock_name?: string;
   timestamp: string;
@@ -234,7 +234,7 @@ export interface IntradayPrice {
 }
 
 export interface StockTick {
-  id: string;
+  id: number;
   stock_symbol: string;
   price: number;
   volume: number;
@@ -779,6 +779,8 @@ export interface TradingBotConfig {
   bot_portfolio_holdings?: BotPortfolio[];
   total_equity?: number;
   portfolio_value?: number;
+  has_stocks?: boolean;
+  has_portfolio?: boolean;
   created_at: string;
   updated_at: string;
 }
@@ -46,13 +46,7 @@ class StockAdmin(admin.ModelAdmin):
     )
 
     def market_cap_display(self, obj):
-        if obj.market_cap:
-            if obj.market_cap >= 1_000_000_000:
-                return f"${obj.market_cap / 1_000_000_000:.1f}B"
-            if obj.market_cap >= 1_000_000:
-                return f"${obj.market_cap / 1_000_000:.1f}M"
-            return f"${obj.market_cap:,}"
-        return "-"
+        return obj.market_cap_formatted
 
     market_cap_display.short_description = "Market Cap"
 
@@ -666,19 +660,22 @@ class TradingBotConfigAdmin(admin.ModelAdmin):
     is_active_display.short_description = "Status"
     is_active_display.admin_order_field = "is_active"
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_assignment_flags()
+
     def budget_display(self, obj):
         if obj.budget_type == "cash":
             if obj.budget_cash:
                 return f"${obj.budget_cash:,.2f}"
             return "-"
-        portfolio_count = obj.budget_portfolio.count()
+        portfolio_count = obj.budget_portfolio.count() if obj.has_portfolio else 0
         return f"{portfolio_count} position{'s' if portfolio_count != 1 else ''}"
 
     budget_display.short_description = "Budget"
     budget_display.admin_order_field = "budget_cash"
 
     def assigned_stocks_count(self, obj):
-        count = obj.assigned_stocks.count()
+        count = obj.assigned_stocks.count() if obj.has_stocks else 0
         return f"{count} stock{'s' if count != 1 else ''}"
 
     assigned_stocks_count.short_description = "Assigned Stocks"
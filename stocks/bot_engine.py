@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 
 from django.db import transaction
+from django.db.models import Max, Min, Subquery, Sum, Window
+from django.db.models.functions import Coalesce, FirstValue, TruncDate
 from django.utils import timezone
 
 from . import indicators, pattern_detector
@@ -55,6 +57,9 @@ class TradingBot:
         self.bot_config = bot_config
         self.user = bot_config.user
         self.risk_manager = RiskManager(bot_config)
+        # Signal history rows collected during run_analysis() and written
+        # together at the end of it; None outside a run
+        self._pending_signal_history = None
         # Initialize signal persistence tracker if enabled
         self.signal_persistence_tracker = None
         if bot_config.signal_persistence_type and bot_config.signal_persistence_value:
@@ -100,6 +105,16 @@ class TradingBot:
         all_stocks = list(set(assigned_stocks + portfolio_stocks))
         stocks_to_analyze = all_stocks
 
+        self._pending_signal_history = []
+        try:
+            self._analyze_stocks(stocks_to_analyze, results)
+        finally:
+            self._flush_signal_history()
+
+        return results
+
+    def _analyze_stocks(self, stocks_to_analyze: list[Stock], results: dict) -> None:
+        """Analyze each stock and sort it into the run_analysis() results."""
         for stock_item in stocks_to_analyze:
             try:
                 analysis = self.analyze_stock(stock_item)
@@ -179,7 +194,24 @@ class TradingBot:
                     }
                 )
 
-        return results
+    def _flush_signal_history(self) -> None:
+        """Write the signal history rows collected during run_analysis()."""
+        pending, self._pending_signal_history = self._pending_signal_history, None
+        if not pending:
+            return
+        try:
+            BotSignalHistory.record_batch(pending)
+        except Exception:
+            # Fall back to one insert per row so a bad row only loses itself
+            logger.exception("Error batching signal history")
+            for signal_history in pending:
+                try:
+                    with transaction.atomic():
+                        BotSignalHistory.objects.create(**signal_history)
+                except Exception:
+                    logger.exception(
+                        f"Error storing signal history for {signal_history['stock']}"
+                    )
 
     def analyze_stock(self, stock: Stock, timestamp: datetime | None = None) -> dict:
         """
@@ -532,7 +564,6 @@ class TradingBot:
             "risk_score": risk_score,
         }
 
-    @transaction.atomic
     def execute_trade(
         self, stock: Stock, action: str, analysis_result: dict
     ) -> Order | None:
@@ -615,25 +646,8 @@ class TradingBot:
             logger.warning(f"Trade validation failed: {reason}")
             return None
 
-        # Create order (quantity will be converted to integer in execute)
-        order = Order.objects.create(
-            user=self.user,
-            stock=stock,
-            transaction_type=action,
-            order_type="market",
-            quantity=quantity,
-            bot_config=self.bot_config,
-            notes=f"Auto-traded by bot: {self.bot_config.name}. {analysis_result.get('reason', '')}",
-        )
-
-        # Execute order
-        executed = order.execute()
-        if not executed:
-            logger.error(f"Order execution failed for {stock.symbol}")
-            order.delete()
-            return None
-
-        # Create execution record
+        # Build the execution payload up front so the write transaction below
+        # only spans the INSERT/UPDATE statements.
         patterns_data = analysis_result.get("patterns", [])
         if isinstance(patterns_data, list):
             # Store all patterns with unique keys to preserve duplicates
@@ -657,42 +671,62 @@ class TradingBot:
                     self.signal_persistence_tracker.get_signal_history()
                 )
 
-        TradingBotExecution.objects.create(
-            bot_config=self.bot_config,
-            stock=stock,
-            action=action,
-            reason=analysis_result.get("reason", ""),
-            indicators_data=analysis_result.get("indicators", {}),
-            patterns_detected=patterns_dict,
-            risk_score=analysis_result.get("risk_score"),
-            persistence_met=persistence_met,
-            persistence_count=persistence_count,
-            persistence_signal_history=persistence_signal_history or [],
-            executed_order=order,
-        )
+        with transaction.atomic():
+            # Create order (quantity will be converted to integer in execute)
+            order = Order.objects.create(
+                user=self.user,
+                stock=stock,
+                transaction_type=action,
+                order_type="market",
+                quantity=quantity,
+                bot_config=self.bot_config,
+                notes=f"Auto-traded by bot: {self.bot_config.name}. {analysis_result.get('reason', '')}",
+            )
 
-        # Update signal history with execution reference
-        try:
-            latest_signal_history = (
-                BotSignalHistory.objects.filter(bot_config=self.bot_config, stock=stock)
-                .order_by("-timestamp")
-                .first()
+            # Execute order
+            executed = order.execute()
+            if not executed:
+                logger.error(f"Order execution failed for {stock.symbol}")
+                order.delete()
+                return None
+
+            # Create execution record
+            execution = TradingBotExecution.objects.create(
+                bot_config=self.bot_config,
+                stock=stock,
+                action=action,
+                reason=analysis_result.get("reason", ""),
+                indicators_data=analysis_result.get("indicators", {}),
+                patterns_detected=patterns_dict,
+                risk_score=analysis_result.get("risk_score"),
+                persistence_met=persistence_met,
+                persistence_count=persistence_count,
+                persistence_signal_history=persistence_signal_history or [],
+                executed_order=order,
             )
-            if latest_signal_history:
-                latest_signal_history.execution = (
-                    TradingBotExecution.objects.filter(
-                        bot_config=self.bot_config, stock=stock, executed_order=order
+
+            # Update signal history with execution reference. The savepoint
+            # keeps a failure here from rolling back the executed order.
+            try:
+                with transaction.atomic():
+                    latest_signal_history = (
+                        BotSignalHistory.objects.filter(
+                            bot_config=self.bot_config, stock=stock
+                        )
+                        .order_by("-timestamp")
+                        .values("pk")[:1]
                     )
-                    .order_by("-timestamp")
-                    .first()
-                )
-                latest_signal_history.save()
-        except Exception:
-            logger.exception("Error updating signal history with execution")
+                    BotSignalHistory.objects.filter(
+                        pk=Subquery(latest_signal_history)
+                    ).update(execution=execution)
+            except Exception:
+                logger.exception("Error updating signal history with execution")
 
-        logger.info(
-            f"Bot {self.bot_config.name} executed {action} order for {stock.symbol}: {quantity} shares @ {current_price}"
-        )
+            message = (
+                f"Bot {self.bot_config.name} executed {action} order for "
+                f"{stock.symbol}: {quantity} shares @ {current_price}"
+            )
+            transaction.on_commit(lambda: logger.info(message))
 
         return order
 
@@ -709,7 +743,6 @@ class TradingBot:
             List of price data dictionaries with OHLCV format.
             Each dict includes a '_data_source' key indicating 'tick' or 'price'.
         """
-        from collections import defaultdict
         from datetime import timedelta
 
         # Calculate date range for the requested period
@@ -718,78 +751,51 @@ class TradingBot:
 
         # First, try to get tick data and aggregate into daily candles
         # Only use tick data if it exists - do not fall back to price data if ticks exist
-        ticks = list(
+        # The candles are built in SQL, so only one row per day is materialized
+        # instead of a model instance (and Decimal) per tick
+        day = TruncDate("timestamp")
+        by_day = {"partition_by": [day]}
+        candles = (
             StockTick.objects.filter(
                 stock=stock,
                 timestamp__date__gte=start_date,
                 timestamp__date__lte=end_date,
-            ).order_by("timestamp")
-        )
-
-        if ticks:
-            # Aggregate ticks into daily OHLCV candles
-            # Group ticks by date
-            candles = defaultdict(
-                lambda: {
-                    "open": None,
-                    "high": None,
-                    "low": None,
-                    "close": None,
-                    "volume": 0,
-                    "date": None,
-                }
+                price__gt=0,
             )
+            .annotate(
+                day=day,
+                open=Window(FirstValue("price"), order_by="timestamp", **by_day),
+                close=Window(FirstValue("price"), order_by="-timestamp", **by_day),
+                high=Window(Max("price"), **by_day),
+                low=Window(Min("price"), **by_day),
+                day_volume=Window(Sum(Coalesce("volume", 0)), **by_day),
+            )
+            .values("day", "open", "high", "low", "close", "day_volume")
+            .order_by("day")
+            .distinct()
+        )
 
-            for tick in ticks:
-                tick_date = tick.timestamp.date()
-                candle_key = tick_date.isoformat()
-
-                price = float(tick.price) if tick.price else None
-                if price is None:
-                    continue
-
-                candle = candles[candle_key]
-
-                # Set open price (first tick of the day)
-                if candle["open"] is None:
-                    candle["open"] = price
-                    candle["date"] = tick_date
-
-                # Update high and low
-                if candle["high"] is None or price > candle["high"]:
-                    candle["high"] = price
-                if candle["low"] is None or price < candle["low"]:
-                    candle["low"] = price
-
-                # Set close price (last tick of the day)
-                candle["close"] = price
-
-                # Accumulate volume
-                candle["volume"] += tick.volume or 0
-
-            # Convert to list format expected by indicators
-            price_data = [
-                {
-                    "symbol": stock.symbol,
-                    "open_price": Decimal(str(candle["open"])),
-                    "high_price": Decimal(str(candle["high"])),
-                    "low_price": Decimal(str(candle["low"])),
-                    "close_price": Decimal(str(candle["close"])),
-                    "volume": candle["volume"],
-                    "date": candle["date"].isoformat() if candle["date"] else None,
-                    "_data_source": "tick",  # Mark as tick data
-                }
-                for candle_key in sorted(candles.keys())
-                for candle in [candles[candle_key]]
-                if candle["open"] is not None
-            ]
+        # Convert to list format expected by indicators
+        price_data = [
+            {
+                "symbol": stock.symbol,
+                "open_price": candle["open"],
+                "high_price": candle["high"],
+                "low_price": candle["low"],
+                "close_price": candle["close"],
+                "volume": candle["day_volume"],
+                "date": candle["day"].isoformat(),
+                "_data_source": "tick",  # Mark as tick data
+            }
+            for candle in candles
+        ]
 
-            # Limit to requested number of days (most recent)
-            if len(price_data) > limit:
-                price_data = price_data[-limit:]
+        # Limit to requested number of days (most recent)
+        if len(price_data) > limit:
+            price_data = price_data[-limit:]
 
-            if price_data:
-                return price_data
+        if price_data:
+            return price_data
 
         daily_prices = list(
             StockPrice.objects.filter(
@@ -1366,10 +1372,10 @@ class TradingBot:
                     persistence_state
                 )
 
-            BotSignalHistory.objects.create(
-                bot_config=self.bot_config,
-                stock=stock,
-                price_data_snapshot={
+            signal_history = {
+                "bot_config": self.bot_config,
+                "stock": stock,
+                "price_data_snapshot": {
                     "latest": self._serialize_price_data(price_data[-1])
                     if price_data
                     else {},
@@ -1378,23 +1384,27 @@ class TradingBot:
                     "tick_data": tick_data,
                     "tick_count": len(tick_data),
                 },
-                ml_signals={"predictions": ml_signals, "count": len(ml_signals)},
-                social_signals=social_signals or {},
-                news_signals=news_signals or {},
-                indicator_signals={
+                "ml_signals": {"predictions": ml_signals, "count": len(ml_signals)},
+                "social_signals": social_signals or {},
+                "news_signals": news_signals or {},
+                "indicator_signals": {
                     "signals": indicator_signals,
                     "count": len(indicator_signals),
                 },
-                pattern_signals={
+                "pattern_signals": {
                     "patterns": pattern_signals,
                     "count": len(pattern_signals),
                 },
-                aggregated_signal=aggregated_signal_with_persistence,
-                final_decision=final_decision,
-                decision_confidence=Decimal(str(decision_confidence))
+                "aggregated_signal": aggregated_signal_with_persistence,
+                "final_decision": final_decision,
+                "decision_confidence": Decimal(str(decision_confidence))
                 * Decimal("100.0"),
-                risk_score=Decimal(str(risk_score)) if risk_score else None,
-            )
+                "risk_score": Decimal(str(risk_score)) if risk_score else None,
+            }
+            if self._pending_signal_history is not None:
+                self._pending_signal_history.append(signal_history)
+            else:
+                BotSignalHistory.objects.create(**signal_history)
         except Exception:
             logger.exception("Error storing signal history")
 
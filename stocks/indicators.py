@@ -11,11 +11,18 @@ from typing import Any
 logger = logging.getLogger(__name__)
 
 
-def to_number(value: Any) -> float | None:
+_NUMERIC_TYPES = (int, float)
+
+
+def to_number(value: Any, _isinf=math.isinf) -> float | None:
     """Convert a value to a number, handling strings and Decimal."""
+    # Plain floats are by far the most common input, so check them first;
+    # NaN is the only value that is not equal to itself
+    if type(value) is float:
+        return None if value != value or _isinf(value) else value  # noqa: PLR0124
     if value is None:
         return None
-    if isinstance(value, int | float):
+    if isinstance(value, _NUMERIC_TYPES):
         num = float(value)
         return num if not (math.isnan(num) or math.isinf(num)) else None
     if isinstance(value, Decimal):
@@ -0,0 +1,45 @@
+"""
+Management command to backfill Stock.latest_close from existing daily prices.
+New prices keep the column current through the StockPrice trigger; this is
+only needed once after the trigger is installed or after bulk corrections.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+
+from stocks.models import Stock, StockPrice
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Backfill Stock.latest_close and latest_close_date from daily prices"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--symbol",
+            type=str,
+            help="Backfill a specific stock symbol",
+        )
+
+    def handle(self, *args, **options):
+        symbol = options.get("symbol")
+
+        stocks = Stock.objects.all()
+        if symbol:
+            stocks = stocks.filter(symbol=symbol.upper())
+
+        latest = StockPrice.objects.filter(
+            stock=OuterRef("pk"), interval="1d"
+        ).order_by("-date")
+        updated = stocks.update(
+            latest_close=Subquery(latest.values("close_price")[:1]),
+            latest_close_date=Subquery(latest.values("date")[:1]),
+        )
+
+        logger.info(f"Backfilled latest close for {updated} stocks")
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled latest close for {updated} stocks")
+        )
@@ -0,0 +1,143 @@
+"""
+Management command to turn the price/tick tables into TimescaleDB hypertables.
+Only useful when the PostgreSQL server ships the timescaledb extension; the
+tables keep working as plain tables everywhere else. Hypertables append into
+time-ordered chunks (range partitions on the time column), so inserts stay
+sequential, time-range reads only touch the chunks that overlap the range,
+and old chunks are dropped whole instead of deleted row by row.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from stocks.models import IntradayPrice, StockPrice, StockTick
+
+logger = logging.getLogger(__name__)
+
+# (model, time column, chunk interval) converted to hypertables. Ticks get a
+# chunk per day and intraday bars one per week, sized to their volume.
+HYPERTABLES = [
+    (StockPrice, "date", "90 days"),
+    (StockTick, "timestamp", "1 day"),
+    (IntradayPrice, "timestamp", "7 days"),
+]
+
+# Tables whose old chunks --retain-days may drop; daily bars are kept forever
+RETENTION_TABLES = {StockTick, IntradayPrice}
+
+
+class Command(BaseCommand):
+    help = "Convert StockPrice, StockTick and IntradayPrice to TimescaleDB hypertables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--compress-after-days",
+            type=int,
+            default=7,
+            help="Compress chunks older than this many days (0 disables compression)",
+        )
+        parser.add_argument(
+            "--retain-days",
+            type=int,
+            default=0,
+            help=(
+                "Drop tick and intraday chunks older than this many days "
+                "(0 keeps all data)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        compress_after_days = options["compress_after_days"]
+        retain_days = options["retain_days"]
+
+        if connection.vendor != "postgresql":
+            msg = "TimescaleDB requires a PostgreSQL database."
+            raise CommandError(msg)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'"
+            )
+            if cursor.fetchone() is None:
+                msg = "The timescaledb extension is not available on this server."
+                raise CommandError(msg)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+            for model, time_column, chunk_interval in HYPERTABLES:
+                table = model._meta.db_table
+                cursor.execute(
+                    "SELECT 1 FROM timescaledb_information.hypertables "
+                    "WHERE hypertable_name = %s",
+                    [table],
+                )
+                if cursor.fetchone() is not None:
+                    # Only affects chunks created from now on
+                    cursor.execute(
+                        "SELECT set_chunk_time_interval(%s, %s::interval)",
+                        [table, chunk_interval],
+                    )
+                    self.stdout.write(
+                        f"{table}: already a hypertable, {chunk_interval} chunks"
+                    )
+                else:
+                    self._convert(
+                        cursor, table, time_column, chunk_interval, compress_after_days
+                    )
+                    logger.info(
+                        "Converted %s to a hypertable on %s", table, time_column
+                    )
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"{table}: hypertable on {time_column}, "
+                            f"{chunk_interval} chunks"
+                        )
+                    )
+                if retain_days > 0 and model in RETENTION_TABLES:
+                    cursor.execute(
+                        "SELECT add_retention_policy(%s, %s::interval, "
+                        "if_not_exists => true)",
+                        [table, f"{retain_days} days"],
+                    )
+
+    def _convert(self, cursor, table, time_column, chunk_interval, compress_after_days):
+        """
+        Convert one table to a hypertable.
+
+        Timescale requires every unique index to contain the time column, so
+        the primary key is widened to (id, time column) first. After that the
+        database no longer enforces that ``id`` alone is unique: two rows may
+        share an ``id`` as long as their time column differs. ``id`` values
+        stay unique only because every insert takes them from the column's
+        identity sequence, and Django's assumption that ``id`` identifies a
+        single row (``get(pk=...)``, updates and deletes by pk) rests on that
+        sequence alone. Rows must never be inserted with an explicit ``id``.
+        """
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'p'",
+            [table],
+        )
+        row = cursor.fetchone()
+        if row is not None:
+            cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{row[0]}"')
+        cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {time_column})")
+        cursor.execute(
+            "SELECT create_hypertable(%s, %s, "
+            "chunk_time_interval => %s::interval, migrate_data => true, "
+            "if_not_exists => true)",
+            [table, time_column, chunk_interval],
+        )
+
+        if compress_after_days > 0:
+            cursor.execute(
+                f"ALTER TABLE {table} SET (timescaledb.compress, "
+                f"timescaledb.compress_segmentby = 'stock_id', "
+                f"timescaledb.compress_orderby = '{time_column} DESC')"
+            )
+            cursor.execute(
+                "SELECT add_compression_policy(%s, %s::interval, if_not_exists => true)",
+                [table, f"{compress_after_days} days"],
+            )
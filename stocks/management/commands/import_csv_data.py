@@ -530,15 +530,8 @@ class Command(BaseCommand):
                                 timestamp=tick.timestamp,
                             ).delete()
 
-                # Use bulk_create with ignore_conflicts to handle duplicates
-                # Since StockTick doesn't have a unique constraint, we'll use ignore_conflicts
-                # to skip any exact duplicates
-                created = StockTick.objects.bulk_create(
-                    stock_ticks,
-                    batch_size=1000,
-                    ignore_conflicts=True,
-                )
-                return len(created)
+                # COPY-based ingest; conflicting rows are skipped
+                return StockTick.objects.ingest(stock_ticks)
         except Exception:
             logger.exception("Error bulk creating stock ticks")
             raise
@@ -586,14 +579,9 @@ class Command(BaseCommand):
                                 interval=price.interval,
                             ).delete()
 
-                # Use bulk_create with ignore_conflicts to handle duplicates
-                # StockPrice has unique_together constraint on stock, date, timestamp, interval
-                created = StockPrice.objects.bulk_create(
-                    stock_prices,
-                    batch_size=1000,
-                    ignore_conflicts=True,
-                )
-                return len(created)
+                # COPY-based ingest; rows clashing with the unique_together
+                # constraint on stock, date, timestamp, interval are skipped
+                return StockPrice.objects.ingest(stock_prices)
         except Exception:
             logger.exception("Error bulk creating stock prices")
             raise
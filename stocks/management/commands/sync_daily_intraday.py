@@ -228,9 +228,9 @@ class Command(BaseCommand):
                         )
                     )
 
-                # Bulk create for efficiency
+                # COPY-based ingest for efficiency
                 if intraday_prices:
-                    IntradayPrice.objects.bulk_create(intraday_prices, batch_size=1000)
+                    IntradayPrice.objects.ingest(intraday_prices)
 
         except Exception:
             logger.exception("Error saving intraday data for %s", stock.symbol)
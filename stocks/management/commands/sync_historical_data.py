@@ -301,9 +301,9 @@ class Command(BaseCommand):
                         )
                     )
 
-                # Bulk create for efficiency
+                # COPY-based ingest for efficiency
                 if historical_prices:
-                    StockPrice.objects.bulk_create(historical_prices, batch_size=1000)
+                    StockPrice.objects.ingest(historical_prices)
                     records_created = len(historical_prices)
 
         except Exception:
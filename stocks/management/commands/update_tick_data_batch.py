@@ -228,10 +228,8 @@ class Command(BaseCommand):
                 if ticks_to_create:
                     try:
                         with transaction.atomic():
-                            StockTick.objects.bulk_create(
-                                ticks_to_create,
-                                ignore_conflicts=True,  # Skip duplicates
-                            )
+                            # COPY-based ingest, skipping duplicates
+                            StockTick.objects.ingest(ticks_to_create)
                         total_ticks_created += len(ticks_to_create)
                         self.stdout.write(
                             self.style.SUCCESS(
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# (index name, model name, JSON column) for jsonb_path_ops GIN indexes.
+# jsonb_path_ops only supports the containment operator (@>), which is what
+# ``<field>__contains={...}`` lookups compile to on PostgreSQL.
+GIN_INDEXES = [
+    ("bsh_agg_gin", "BotSignalHistory", "aggregated_signal"),
+    ("bsh_ind_gin", "BotSignalHistory", "indicator_signals"),
+]
+
+
+def create_gin_indexes(apps, schema_editor):
+    """
+    Create GIN indexes on the hot JSON signal columns.
+
+    GIN indexes only exist on PostgreSQL; SQLite (development/testing) keeps
+    the plain JSON columns.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for index_name, model_name, column in GIN_INDEXES:
+        table = apps.get_model("stocks", model_name)._meta.db_table
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} "
+            f"ON {table} USING gin ({column} jsonb_path_ops)"
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    """Drop the GIN indexes created by create_gin_indexes."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for index_name, _model_name, _column in GIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0017_change_portfolio_quantity_to_integer"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:28
+
+import json
+import zlib
+
+import django.db.models.deletion
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+
+def move_price_snapshots_to_payload(apps, schema_editor):
+    """Compress existing price_data_snapshot values into BotSignalHistoryPayload."""
+    BotSignalHistory = apps.get_model("stocks", "BotSignalHistory")
+    BotSignalHistoryPayload = apps.get_model("stocks", "BotSignalHistoryPayload")
+
+    batch = []
+    for history_id, snapshot in (
+        BotSignalHistory.objects.exclude(price_data_snapshot={})
+        .values_list("id", "price_data_snapshot")
+        .iterator(chunk_size=500)
+    ):
+        data = zlib.compress(
+            json.dumps(snapshot, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+        )
+        batch.append(BotSignalHistoryPayload(history_id=history_id, data=data))
+        if len(batch) >= 500:
+            BotSignalHistoryPayload.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        BotSignalHistoryPayload.objects.bulk_create(batch)
+
+
+def restore_price_snapshots(apps, schema_editor):
+    """Copy compressed payloads back into the price_data_snapshot column."""
+    BotSignalHistory = apps.get_model("stocks", "BotSignalHistory")
+    BotSignalHistoryPayload = apps.get_model("stocks", "BotSignalHistoryPayload")
+
+    for payload in BotSignalHistoryPayload.objects.iterator(chunk_size=500):
+        BotSignalHistory.objects.filter(pk=payload.history_id).update(
+            price_data_snapshot=json.loads(zlib.decompress(bytes(payload.data)))
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0018_add_signal_jsonb_gin_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BotSignalHistoryPayload",
+            fields=[
+                (
+                    "history",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="payload",
+                        serialize=False,
+                        to="stocks.botsignalhistory",
+                    ),
+                ),
+                (
+                    "data",
+                    models.BinaryField(
+                        help_text="zlib-compressed JSON price data snapshot",
+                        verbose_name="data",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Bot Signal History Payload",
+                "verbose_name_plural": "Bot Signal History Payloads",
+            },
+        ),
+        migrations.RunPython(move_price_snapshots_to_payload, restore_price_snapshots),
+        migrations.RemoveField(
+            model_name="botsignalhistory",
+            name="price_data_snapshot",
+        ),
+    ]
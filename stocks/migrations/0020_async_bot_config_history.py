@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0019_move_price_snapshot_to_payload"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="historicalportfolio",
+            name="updated_at",
+        ),
+        migrations.RemoveField(
+            model_name="historicaltradingbotconfig",
+            name="updated_at",
+        ),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:39
+
+from django.db import migrations, models
+
+# Keeps Stock.latest_close/latest_close_date in step with the newest daily
+# StockPrice row. The guard on latest_close_date means back-filling older bars
+# never overwrites a newer close.
+POSTGRES_CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION stocks_update_latest_close() RETURNS trigger AS $$
+BEGIN
+    IF NEW."interval" = '1d' THEN
+        UPDATE stocks_stock
+        SET latest_close = NEW.close_price, latest_close_date = NEW.date
+        WHERE id = NEW.stock_id
+          AND (latest_close_date IS NULL OR latest_close_date <= NEW.date);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS stock_price_latest_close ON stocks_stockprice;
+CREATE TRIGGER stock_price_latest_close
+    AFTER INSERT OR UPDATE OF close_price, date ON stocks_stockprice
+    FOR EACH ROW EXECUTE FUNCTION stocks_update_latest_close();
+"""
+
+POSTGRES_DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS stock_price_latest_close ON stocks_stockprice;
+DROP FUNCTION IF EXISTS stocks_update_latest_close();
+"""
+
+SQLITE_TRIGGER_BODY = """
+BEGIN
+    UPDATE stocks_stock
+    SET latest_close = NEW.close_price, latest_close_date = NEW.date
+    WHERE id = NEW.stock_id
+      AND (latest_close_date IS NULL OR latest_close_date <= NEW.date);
+END
+"""
+
+SQLITE_CREATE_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS stock_price_latest_close_insert "
+    "AFTER INSERT ON stocks_stockprice "
+    f"WHEN NEW.\"interval\" = '1d' {SQLITE_TRIGGER_BODY}",
+    "CREATE TRIGGER IF NOT EXISTS stock_price_latest_close_update "
+    "AFTER UPDATE OF close_price, date ON stocks_stockprice "
+    f"WHEN NEW.\"interval\" = '1d' {SQLITE_TRIGGER_BODY}",
+]
+
+SQLITE_DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS stock_price_latest_close_insert",
+    "DROP TRIGGER IF EXISTS stock_price_latest_close_update",
+]
+
+
+def create_latest_close_trigger(apps, schema_editor):
+    """
+    Install the trigger that maintains Stock.latest_close.
+
+    Existing rows are populated with ``manage.py backfill_latest_close``.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_CREATE_TRIGGER)
+    elif vendor == "sqlite":
+        for statement in SQLITE_CREATE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def drop_latest_close_trigger(apps, schema_editor):
+    """Drop the trigger installed by create_latest_close_trigger."""
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_DROP_TRIGGER)
+    elif vendor == "sqlite":
+        for statement in SQLITE_DROP_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0020_async_bot_config_history"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stock",
+            name="latest_close",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=4,
+                editable=False,
+                help_text="Close price of the most recent daily bar",
+                max_digits=12,
+                null=True,
+                verbose_name="latest close",
+            ),
+        ),
+        migrations.AddField(
+            model_name="stock",
+            name="latest_close_date",
+            field=models.DateField(
+                blank=True,
+                editable=False,
+                help_text="Trading date of the most recent daily bar",
+                null=True,
+                verbose_name="latest close date",
+            ),
+        ),
+        migrations.RunPython(create_latest_close_trigger, drop_latest_close_trigger),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0021_add_stock_latest_close"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="portfolio",
+            name="stocks_port_stock_i_fd521b_idx",
+        ),
+        migrations.AlterField(
+            model_name="portfolio",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="portfolio_holdings",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="portfolio",
+            index=models.Index(
+                fields=["user"],
+                include=("stock", "quantity", "purchase_price"),
+                name="portfolio_user_cover_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,147 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:46
+
+from django.db import migrations, models
+
+OPTIONAL_JSON_FIELDS = (
+    "ml_model_weights",
+    "signal_thresholds",
+    "indicator_thresholds",
+    "buy_rules",
+    "sell_rules",
+)
+
+
+def empty_json_to_null(apps, schema_editor):
+    """Store empty optional JSON settings as NULL."""
+    TradingBotConfig = apps.get_model("stocks", "TradingBotConfig")
+    for field_name in OPTIONAL_JSON_FIELDS:
+        TradingBotConfig.objects.filter(**{field_name: {}}).update(**{field_name: None})
+
+
+def null_json_to_empty(apps, schema_editor):
+    """Restore NULL optional JSON settings to empty objects."""
+    TradingBotConfig = apps.get_model("stocks", "TradingBotConfig")
+    for field_name in OPTIONAL_JSON_FIELDS:
+        TradingBotConfig.objects.filter(**{f"{field_name}__isnull": True}).update(
+            **{field_name: {}}
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0022_portfolio_covering_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicaltradingbotconfig",
+            name="buy_rules",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Buy condition rules (JSON)",
+                null=True,
+                verbose_name="buy rules",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="historicaltradingbotconfig",
+            name="indicator_thresholds",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Custom thresholds for indicator signals (overrides defaults). Format: {'rsi': {'oversold': 30, 'overbought': 70}, ...}",
+                null=True,
+                verbose_name="indicator thresholds",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="historicaltradingbotconfig",
+            name="ml_model_weights",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Weights for each ML model (model_id: weight)",
+                null=True,
+                verbose_name="ml model weights",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="historicaltradingbotconfig",
+            name="sell_rules",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Sell condition rules (JSON)",
+                null=True,
+                verbose_name="sell rules",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="historicaltradingbotconfig",
+            name="signal_thresholds",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Minimum thresholds for signals (confidence, strength, count)",
+                null=True,
+                verbose_name="signal thresholds",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tradingbotconfig",
+            name="buy_rules",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Buy condition rules (JSON)",
+                null=True,
+                verbose_name="buy rules",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tradingbotconfig",
+            name="indicator_thresholds",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Custom thresholds for indicator signals (overrides defaults). Format: {'rsi': {'oversold': 30, 'overbought': 70}, ...}",
+                null=True,
+                verbose_name="indicator thresholds",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tradingbotconfig",
+            name="ml_model_weights",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Weights for each ML model (model_id: weight)",
+                null=True,
+                verbose_name="ml model weights",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tradingbotconfig",
+            name="sell_rules",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Sell condition rules (JSON)",
+                null=True,
+                verbose_name="sell rules",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tradingbotconfig",
+            name="signal_thresholds",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="Minimum thresholds for signals (confidence, strength, count)",
+                null=True,
+                verbose_name="signal thresholds",
+            ),
+        ),
+        migrations.RunPython(empty_json_to_null, null_json_to_empty),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:51
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0023_nullable_optional_bot_json"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="botsignalhistory",
+            options={
+                "default_manager_name": "objects",
+                "ordering": ["-timestamp"],
+                "verbose_name": "Bot Signal History",
+                "verbose_name_plural": "Bot Signal Histories",
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:58
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0024_bot_signal_history_managers"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="portfolio",
+            name="total_cost",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("quantity"), "*", models.F("purchase_price")
+                ),
+                help_text="Quantity times purchase price, computed by the database",
+                output_field=models.DecimalField(decimal_places=4, max_digits=20),
+                verbose_name="total cost",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="portfolio",
+            index=models.Index(
+                fields=["user", "total_cost"], name="stocks_port_user_id_91d9dc_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-17 08:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def rename_duplicate_bot_names(apps, schema_editor):
+    """Suffix duplicate (user, name) bot configs so the constraint can apply."""
+    TradingBotConfig = apps.get_model("stocks", "TradingBotConfig")
+
+    duplicates = (
+        TradingBotConfig.objects.values("user_id", "name")
+        .annotate(total=models.Count("id"))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates:
+        configs = TradingBotConfig.objects.filter(
+            user_id=duplicate["user_id"], name=duplicate["name"]
+        ).order_by("created_at")
+        siblings = TradingBotConfig.objects.filter(user_id=duplicate["user_id"])
+        index = 1
+        # Keep the oldest config's name, suffix the rest with the next free
+        # "(N)" so a suffix never collides with a name the user already has
+        for config in configs[1:]:
+            while True:
+                index += 1
+                candidate = f"{duplicate['name'][:190]} ({index})"
+                if not siblings.filter(name=candidate).exclude(pk=config.pk).exists():
+                    break
+            config.name = candidate
+            config.save(update_fields=["name"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0025_portfolio_generated_total_cost"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_bot_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="tradingbotconfig",
+            constraint=models.UniqueConstraint(
+                fields=("user", "name"), name="uq_bot_per_user_name"
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.8 on 2026-10-17 08:37
+
+from django.db import migrations
+
+# (index name, model name, column) for BRIN indexes. Price and tick rows are
+# appended in time order, so a BRIN index serves unscoped date/timestamp range
+# scans at a fraction of a B-tree's size and insert cost.
+BRIN_INDEXES = [
+    ("stockprice_date_brin", "StockPrice", "date"),
+    ("stocktick_ts_brin", "StockTick", "timestamp"),
+    ("intradayprice_ts_brin", "IntradayPrice", "timestamp"),
+]
+
+
+def create_brin_indexes(apps, schema_editor):
+    """
+    Create BRIN indexes on the time columns of the price tables.
+
+    BRIN indexes only exist on PostgreSQL; SQLite (development/testing) does
+    without them.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for index_name, model_name, column in BRIN_INDEXES:
+        table = apps.get_model("stocks", model_name)._meta.db_table
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} "
+            f"ON {table} USING brin ({column}) WITH (pages_per_range = 128)"
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    """Drop the BRIN indexes created by create_brin_indexes."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for index_name, _model_name, _column in BRIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0026_unique_bot_name_per_user"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="intradayprice",
+            name="stocks_intr_stock_i_7d8eb0_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="intradayprice",
+            name="stocks_intr_timesta_f64a08_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="stockprice",
+            name="stocks_stoc_stock_i_86bebf_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="stockprice",
+            name="stocks_stoc_date_0355dc_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="stockprice",
+            name="stocks_stoc_timesta_7a363a_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="stocktick",
+            name="stocks_stoc_timesta_0f1adf_idx",
+        ),
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
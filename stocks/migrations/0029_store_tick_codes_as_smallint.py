@@ -0,0 +1,128 @@
+# Generated by Django 5.2.8 on 2026-10-17 08:54
+
+from django.db import migrations, models
+
+import stocks.fields
+
+SESSION_TYPE_CODES = {"pre_market": 1, "regular": 2, "after_hours": 3}
+TRADE_TYPE_CODES = {"buy": 1, "sell": 2, "market": 3}
+
+# (model name, varchar column, smallint column, codes)
+CODE_COLUMNS = [
+    ("IntradayPrice", "session_type", "session_type_code", SESSION_TYPE_CODES),
+    ("StockTick", "trade_type", "trade_type_code", TRADE_TYPE_CODES),
+]
+
+
+def copy_codes_to_smallint(apps, schema_editor):
+    """Translate the varchar codes into the new smallint columns."""
+    for model_name, old_field, new_field, codes in CODE_COLUMNS:
+        model = apps.get_model("stocks", model_name)
+        model.objects.update(
+            **{
+                new_field: models.Case(
+                    *[
+                        models.When(**{old_field: code}, then=models.Value(value))
+                        for code, value in codes.items()
+                    ],
+                    default=None,
+                    output_field=models.PositiveSmallIntegerField(),
+                )
+            }
+        )
+
+
+def copy_codes_to_varchar(apps, schema_editor):
+    """Translate the smallint columns back into the varchar codes."""
+    for model_name, old_field, new_field, codes in CODE_COLUMNS:
+        model = apps.get_model("stocks", model_name)
+        model.objects.update(
+            **{
+                old_field: models.Case(
+                    *[
+                        models.When(**{new_field: value}, then=models.Value(code))
+                        for code, value in codes.items()
+                    ],
+                    default=None,
+                    output_field=models.CharField(),
+                )
+            }
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0028_replace_time_indexes_with_brin"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="intradayprice",
+            name="stocks_intr_stock_i_f47bfe_idx",
+        ),
+        migrations.AddField(
+            model_name="intradayprice",
+            name="session_type_code",
+            field=stocks.fields.SmallIntCodeField(
+                choices=[
+                    ("pre_market", "Pre-Market"),
+                    ("regular", "Regular Hours"),
+                    ("after_hours", "After Hours"),
+                ],
+                codes=SESSION_TYPE_CODES,
+                null=True,
+                verbose_name="session type",
+            ),
+        ),
+        migrations.AddField(
+            model_name="stocktick",
+            name="trade_type_code",
+            field=stocks.fields.SmallIntCodeField(
+                blank=True,
+                choices=[("buy", "Buy"), ("sell", "Sell"), ("market", "Market")],
+                codes=TRADE_TYPE_CODES,
+                null=True,
+                verbose_name="trade type",
+            ),
+        ),
+        migrations.RunPython(copy_codes_to_smallint, copy_codes_to_varchar),
+        migrations.RemoveField(
+            model_name="intradayprice",
+            name="session_type",
+        ),
+        migrations.RemoveField(
+            model_name="stocktick",
+            name="trade_type",
+        ),
+        migrations.RenameField(
+            model_name="intradayprice",
+            old_name="session_type_code",
+            new_name="session_type",
+        ),
+        migrations.RenameField(
+            model_name="stocktick",
+            old_name="trade_type_code",
+            new_name="trade_type",
+        ),
+        migrations.AlterField(
+            model_name="intradayprice",
+            name="session_type",
+            field=stocks.fields.SmallIntCodeField(
+                choices=[
+                    ("pre_market", "Pre-Market"),
+                    ("regular", "Regular Hours"),
+                    ("after_hours", "After Hours"),
+                ],
+                codes=SESSION_TYPE_CODES,
+                default="regular",
+                verbose_name="session type",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="intradayprice",
+            index=models.Index(
+                fields=["stock", "session_type", "timestamp"],
+                name="stocks_intr_stock_i_f47bfe_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.8 on 2026-10-17 09:01
+
+import importlib
+
+from django.db import migrations, models
+
+latest_close_migration = importlib.import_module(
+    "stocks.migrations.0021_add_stock_latest_close"
+)
+
+
+def drop_sqlite_latest_close_triggers(apps, schema_editor):
+    """
+    Drop the SQLite latest_close triggers while stocks_stock is rebuilt.
+
+    SQLite adds the column by copying stocks_stock into a new table and
+    renaming it, which fails while StockPrice triggers reference the table.
+    """
+    if schema_editor.connection.vendor == "sqlite":
+        latest_close_migration.drop_latest_close_trigger(apps, schema_editor)
+
+
+def create_sqlite_latest_close_triggers(apps, schema_editor):
+    """Reinstall the SQLite triggers dropped for the table rebuild."""
+    if schema_editor.connection.vendor == "sqlite":
+        latest_close_migration.create_latest_close_trigger(apps, schema_editor)
+
+
+def format_market_cap(market_cap):
+    """Copy of stocks.models.format_market_cap at the time of this migration."""
+    if not market_cap:
+        return ""
+    if market_cap >= 1_000_000_000:
+        return f"${market_cap / 1_000_000_000:.1f}B"
+    if market_cap >= 1_000_000:
+        return f"${market_cap / 1_000_000:.1f}M"
+    return f"${market_cap:,}"
+
+
+def populate_market_cap_formatted(apps, schema_editor):
+    """Fill market_cap_formatted for existing stocks."""
+    Stock = apps.get_model("stocks", "Stock")
+
+    batch = []
+    for stock in (
+        Stock.objects.exclude(market_cap=None)
+        .only("id", "market_cap")
+        .iterator(chunk_size=500)
+    ):
+        stock.market_cap_formatted = format_market_cap(stock.market_cap)
+        batch.append(stock)
+        if len(batch) >= 500:
+            Stock.objects.bulk_update(batch, ["market_cap_formatted"])
+            batch = []
+    if batch:
+        Stock.objects.bulk_update(batch, ["market_cap_formatted"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0029_store_tick_codes_as_smallint"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            drop_sqlite_latest_close_triggers, create_sqlite_latest_close_triggers
+        ),
+        migrations.AddField(
+            model_name="historicalstock",
+            name="market_cap_formatted",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Display form of market_cap, computed on save",
+                max_length=16,
+                verbose_name="market cap (formatted)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="stock",
+            name="market_cap_formatted",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Display form of market_cap, computed on save",
+                max_length=16,
+                verbose_name="market cap (formatted)",
+            ),
+        ),
+        migrations.RunPython(
+            create_sqlite_latest_close_triggers, drop_sqlite_latest_close_triggers
+        ),
+        migrations.RunPython(populate_market_cap_formatted, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.8 on 2026-10-17 09:07
+
+import importlib
+
+from django.db import migrations, models
+from django.db.migrations.exceptions import IrreversibleError
+
+latest_close_migration = importlib.import_module(
+    "stocks.migrations.0021_add_stock_latest_close"
+)
+
+PRICE_MODELS = ["StockPrice", "StockTick", "IntradayPrice"]
+
+# A UUID column cannot be cast to bigint, so the key is rebuilt on a new
+# identity column; existing rows are numbered as the column is added.
+POSTGRES_BIGINT_PK = """
+ALTER TABLE {table} DROP CONSTRAINT IF EXISTS "{constraint}";
+ALTER TABLE {table} DROP COLUMN id;
+ALTER TABLE {table} ADD COLUMN id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY;
+"""
+
+POSTGRES_UUID_PK = """
+ALTER TABLE {table} DROP CONSTRAINT IF EXISTS "{constraint}";
+ALTER TABLE {table} DROP COLUMN id;
+ALTER TABLE {table} ADD COLUMN id uuid NOT NULL DEFAULT gen_random_uuid() PRIMARY KEY;
+ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT;
+"""
+
+
+def _postgres_rebuild_pk(schema_editor, table, sql):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'p'",
+            [table],
+        )
+        row = cursor.fetchone()
+    constraint = row[0] if row else f"{table}_pkey"
+    schema_editor.execute(sql.format(table=table, constraint=constraint))
+
+
+def use_bigint_pk(apps, schema_editor):
+    """
+    Replace the UUID primary keys with bigint identity keys.
+
+    On SQLite the table is rebuilt with an INTEGER PRIMARY KEY and the rows
+    are numbered by SQLite; the rebuild drops the StockPrice latest_close
+    triggers, so they are reinstalled afterwards.
+    """
+    vendor = schema_editor.connection.vendor
+    for model_name in PRICE_MODELS:
+        model = apps.get_model("stocks", model_name)
+        if vendor == "postgresql":
+            _postgres_rebuild_pk(
+                schema_editor, model._meta.db_table, POSTGRES_BIGINT_PK
+            )
+        else:
+            field = models.BigAutoField(primary_key=True)
+            field.set_attributes_from_name("id")
+            schema_editor._remake_table(model, create_field=field)
+    if vendor == "sqlite":
+        latest_close_migration.create_latest_close_trigger(apps, schema_editor)
+
+
+def use_uuid_pk(apps, schema_editor):
+    """Restore random UUID primary keys (PostgreSQL only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        msg = "Restoring UUID primary keys is only supported on PostgreSQL."
+        raise IrreversibleError(msg)
+    for model_name in PRICE_MODELS:
+        model = apps.get_model("stocks", model_name)
+        _postgres_rebuild_pk(schema_editor, model._meta.db_table, POSTGRES_UUID_PK)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0030_stock_market_cap_formatted"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(use_bigint_pk, use_uuid_pk),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="intradayprice",
+                    name="id",
+                    field=models.BigAutoField(primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name="stockprice",
+                    name="id",
+                    field=models.BigAutoField(primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name="stocktick",
+                    name="id",
+                    field=models.BigAutoField(primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 5.2.8 on 2026-10-17 12:40
+
+import importlib
+
+from django.db import migrations
+
+latest_close_migration = importlib.import_module(
+    "stocks.migrations.0021_add_stock_latest_close"
+)
+
+# Newest daily close of the stock row being updated, or NULL without one
+LATEST_DAILY_CLOSE = """
+    latest_close = (
+        SELECT p.close_price FROM stocks_stockprice p
+        WHERE p.stock_id = stocks_stock.id AND p."interval" = '1d'
+        ORDER BY p.date DESC LIMIT 1
+    ),
+    latest_close_date = (
+        SELECT MAX(p.date) FROM stocks_stockprice p
+        WHERE p.stock_id = stocks_stock.id AND p."interval" = '1d'
+    )
+"""
+
+# Inserts only move latest_close forward, so they keep the cheap guarded
+# update from 0021. Updates and deletes can remove the newest daily bar (a
+# deleted row, a changed interval, date or stock), so they recompute the
+# column for the stock the row belonged to.
+POSTGRES_CREATE_TRIGGER = f"""
+CREATE OR REPLACE FUNCTION stocks_update_latest_close() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE stocks_stock SET {LATEST_DAILY_CLOSE}
+        WHERE id = OLD.stock_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW."interval" = '1d' THEN
+        UPDATE stocks_stock
+        SET latest_close = NEW.close_price, latest_close_date = NEW.date
+        WHERE id = NEW.stock_id
+          AND (latest_close_date IS NULL OR latest_close_date <= NEW.date);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS stock_price_latest_close ON stocks_stockprice;
+CREATE TRIGGER stock_price_latest_close
+    AFTER INSERT OR DELETE
+    OR UPDATE OF close_price, date, "interval", stock_id ON stocks_stockprice
+    FOR EACH ROW EXECUTE FUNCTION stocks_update_latest_close();
+"""
+
+POSTGRES_DROP_TRIGGER = latest_close_migration.POSTGRES_DROP_TRIGGER
+
+SQLITE_CREATE_TRIGGERS = [
+    latest_close_migration.SQLITE_CREATE_TRIGGERS[0],
+    "CREATE TRIGGER IF NOT EXISTS stock_price_latest_close_update "
+    'AFTER UPDATE OF close_price, date, "interval", stock_id '
+    "ON stocks_stockprice "
+    "WHEN OLD.\"interval\" = '1d' OR NEW.\"interval\" = '1d' "
+    f"BEGIN UPDATE stocks_stock SET {LATEST_DAILY_CLOSE} "
+    "WHERE id IN (OLD.stock_id, NEW.stock_id); END",
+    "CREATE TRIGGER IF NOT EXISTS stock_price_latest_close_delete "
+    "AFTER DELETE ON stocks_stockprice "
+    "WHEN OLD.\"interval\" = '1d' "
+    f"BEGIN UPDATE stocks_stock SET {LATEST_DAILY_CLOSE} "
+    "WHERE id = OLD.stock_id; END",
+]
+
+SQLITE_DROP_TRIGGERS = [
+    *latest_close_migration.SQLITE_DROP_TRIGGERS,
+    "DROP TRIGGER IF EXISTS stock_price_latest_close_delete",
+]
+
+# Values left stale by deletes and corrections before this migration
+RESYNC_LATEST_CLOSE = f"UPDATE stocks_stock SET {LATEST_DAILY_CLOSE}"
+
+
+def create_latest_close_trigger(apps, schema_editor):
+    """Install the triggers that keep Stock.latest_close current."""
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_CREATE_TRIGGER)
+    elif vendor == "sqlite":
+        for statement in SQLITE_CREATE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def drop_latest_close_trigger(apps, schema_editor):
+    """Drop the triggers installed by create_latest_close_trigger."""
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_DROP_TRIGGER)
+    elif vendor == "sqlite":
+        for statement in SQLITE_DROP_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+def replace_latest_close_trigger(apps, schema_editor):
+    """Swap the insert-only triggers for ones that also handle deletes."""
+    latest_close_migration.drop_latest_close_trigger(apps, schema_editor)
+    create_latest_close_trigger(apps, schema_editor)
+    if schema_editor.connection.vendor in ("postgresql", "sqlite"):
+        schema_editor.execute(RESYNC_LATEST_CLOSE)
+
+
+def restore_latest_close_trigger(apps, schema_editor):
+    """Reinstall the triggers from 0021."""
+    drop_latest_close_trigger(apps, schema_editor)
+    latest_close_migration.create_latest_close_trigger(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0031_use_bigint_pk_on_price_tables"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            replace_latest_close_trigger, restore_latest_close_trigger
+        ),
+    ]
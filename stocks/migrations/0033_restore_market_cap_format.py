@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-17 14:10
+
+from django.db import migrations
+
+
+def format_market_cap(market_cap):
+    """Copy of stocks.models.format_market_cap at the time of this migration."""
+    if not market_cap:
+        return "N/A"
+    if market_cap >= 1_000_000_000_000:
+        return f"${market_cap / 1_000_000_000_000:.1f}T"
+    if market_cap >= 1_000_000_000:
+        return f"${market_cap / 1_000_000_000:.1f}B"
+    if market_cap >= 1_000_000:
+        return f"${market_cap / 1_000_000:.1f}M"
+    return f"${market_cap:,}"
+
+
+def reformat_market_cap(apps, schema_editor):
+    """Rewrite market_cap_formatted with the trillion tier and N/A fallback."""
+    Stock = apps.get_model("stocks", "Stock")
+
+    batch = []
+    for stock in Stock.objects.only("id", "market_cap").iterator(chunk_size=500):
+        stock.market_cap_formatted = format_market_cap(stock.market_cap)
+        batch.append(stock)
+        if len(batch) >= 500:
+            Stock.objects.bulk_update(batch, ["market_cap_formatted"])
+            batch = []
+    if batch:
+        Stock.objects.bulk_update(batch, ["market_cap_formatted"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0032_recompute_latest_close_on_update_delete"),
+    ]
+
+    operations = [
+        migrations.RunPython(reformat_market_cap, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-17 14:12
+
+from django.db import migrations
+
+INDEX_NAME = "portfolio_user_cover_idx"
+
+
+def create_covering_index(apps, schema_editor):
+    """
+    Keep the covering portfolio index on PostgreSQL only.
+
+    INCLUDE columns only exist on PostgreSQL; elsewhere migration 0022 left a
+    plain index on user_id that the (user, purchase_date) index already
+    serves, so it is dropped.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+        return
+
+    table = apps.get_model("stocks", "Portfolio")._meta.db_table
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+        f"ON {table} (user_id) INCLUDE (stock_id, quantity, purchase_price)"
+    )
+
+
+def restore_plain_index(apps, schema_editor):
+    """Recreate the index 0022 left on non-PostgreSQL databases."""
+    if schema_editor.connection.vendor == "postgresql":
+        return
+
+    table = apps.get_model("stocks", "Portfolio")._meta.db_table
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {table} (user_id)"
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stocks", "0033_restore_market_cap_format"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_covering_index, restore_plain_index),
+            ],
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name="portfolio",
+                    name=INDEX_NAME,
+                ),
+            ],
+        ),
+    ]
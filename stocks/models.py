@@ -1,19 +1,269 @@
+import contextlib
+import io
+import json
 import logging
 import uuid
+import zlib
 from datetime import timedelta
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import DatabaseError, connections, models, router, transaction
+from django.db.models.functions import Coalesce, Floor, RowNumber
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from simple_history.models import HistoricalRecords
 
+from .fields import SmallIntCodeField
+
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+def _copy_text(value):
+    """Render a prepared value as a field in PostgreSQL COPY text format."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def format_market_cap(market_cap):
+    """
+    Format a market capitalization for display (e.g. ``$2.5B``).
+
+    Args:
+        market_cap: Market cap in USD, or None
+
+    Returns:
+        Formatted string, ``"N/A"`` when the market cap is unknown
+    """
+    if not market_cap:
+        return "N/A"
+    if market_cap >= 1_000_000_000_000:
+        return f"${market_cap / 1_000_000_000_000:.1f}T"
+    if market_cap >= 1_000_000_000:
+        return f"${market_cap / 1_000_000_000:.1f}B"
+    if market_cap >= 1_000_000:
+        return f"${market_cap / 1_000_000:.1f}M"
+    return f"${market_cap:,}"
+
+
+class BulkIngestManager(models.Manager):
+    """Manager adding a COPY-based ``ingest()`` for high-volume price tables."""
+
+    def ingest(self, objs, batch_size=5000):
+        """
+        Insert many rows, skipping rows that conflict with existing ones.
+
+        On PostgreSQL each batch is streamed with ``COPY`` into a temporary
+        table and moved across with ``INSERT ... ON CONFLICT DO NOTHING``,
+        avoiding the parse/plan cost of large multi-row INSERTs. Other
+        backends fall back to ``bulk_create(ignore_conflicts=True)``.
+
+        Args:
+            objs: Unsaved model instances to insert
+            batch_size: Number of rows per COPY batch
+
+        Returns:
+            Number of rows inserted (rows submitted on fallback backends)
+        """
+        objs = list(objs)
+        if not objs:
+            return 0
+
+        connection = connections[self.db]
+        if connection.vendor != "postgresql":
+            self.bulk_create(objs, batch_size=batch_size, ignore_conflicts=True)
+            return len(objs)
+
+        opts = self.model._meta
+        # Auto primary keys are left to the table's identity column
+        fields = [
+            field
+            for field in opts.concrete_fields
+            if not field.generated and field is not opts.auto_field
+        ]
+        quote = connection.ops.quote_name
+        table = quote(opts.db_table)
+        staging = quote(f"{opts.db_table}_ingest")
+        columns = ", ".join(quote(field.column) for field in fields)
+
+        inserted = 0
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            # Only the copied columns, without the NOT NULL id of the table
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {staging} ON COMMIT DROP "  # noqa: S608
+                f"AS SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            for start in range(0, len(objs), batch_size):
+                buffer = io.StringIO()
+                for obj in objs[start : start + batch_size]:
+                    buffer.write(
+                        "\t".join(
+                            _copy_text(
+                                field.get_db_prep_save(
+                                    field.pre_save(obj, add=True), connection
+                                )
+                            )
+                            for field in fields
+                        )
+                    )
+                    buffer.write("\n")
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN", buffer)
+                # Identifiers come from model metadata, not user input
+                cursor.execute(
+                    f"INSERT INTO {table} ({columns}) "  # noqa: S608
+                    f"SELECT {columns} FROM {staging} ON CONFLICT DO NOTHING"
+                )
+                inserted += cursor.rowcount
+                cursor.execute(f"TRUNCATE {staging}")
+        return inserted
+
+
+def _numeric_literal(value):
+    """
+    Wrap a constant for Decimal arithmetic in SQL.
+
+    The value is bound as a float: SQLite narrows a Decimal parameter such as
+    ``100.0`` to an integer and then divides integers, while psycopg2 inlines
+    the float as a numeric literal on PostgreSQL.
+    """
+    return models.ExpressionWrapper(
+        models.Value(float(value)), output_field=models.DecimalField()
+    )
+
+
+class OHLCQuerySet(models.QuerySet):
+    """QuerySet helpers for OHLC bar tables."""
+
+    def with_metrics(self):
+        """
+        Compute open-to-close change in SQL.
+
+        Annotates ``_price_change`` and ``_price_change_percent``, which the
+        ``price_change`` / ``price_change_percent`` properties return instead
+        of redoing the Decimal arithmetic per row during serialization.
+
+        Returns:
+            QuerySet annotated with the price change metrics
+        """
+        metric_field = models.DecimalField(max_digits=20, decimal_places=4)
+        change = models.F("close_price") - models.F("open_price")
+        return self.annotate(
+            _price_change=Coalesce(
+                models.ExpressionWrapper(change, output_field=metric_field),
+                models.Value(Decimal("0.00")),
+                output_field=metric_field,
+            ),
+            _price_change_percent=models.Case(
+                models.When(
+                    open_price__gt=0,
+                    then=models.ExpressionWrapper(
+                        change * _numeric_literal(100) / models.F("open_price"),
+                        output_field=metric_field,
+                    ),
+                ),
+                default=models.Value(Decimal("0.00")),
+                output_field=metric_field,
+            ),
+        )
+
+
+class IntradayPriceQuerySet(OHLCQuerySet):
+    """QuerySet helpers for IntradayPrice."""
+
+    def with_metrics(self):
+        """
+        Compute open-to-close change and the typical price in SQL.
+
+        Adds ``_typical_price`` ((high + low + close) / 3) on top of
+        ``OHLCQuerySet.with_metrics()``.
+
+        Returns:
+            QuerySet annotated with the price metrics
+        """
+        return (
+            super()
+            .with_metrics()
+            .annotate(
+                _typical_price=models.ExpressionWrapper(
+                    (
+                        models.F("high_price")
+                        + models.F("low_price")
+                        + models.F("close_price")
+                    )
+                    / _numeric_literal(3),
+                    output_field=models.DecimalField(max_digits=20, decimal_places=4),
+                )
+            )
+        )
+
+
+class StockTickQuerySet(models.QuerySet):
+    """QuerySet helpers for StockTick."""
+
+    def with_metrics(self):
+        """
+        Compute the bid-ask spread in SQL.
+
+        Annotates ``_spread`` and ``_spread_percentage`` (NULL when either
+        side of the quote is missing), read by the ``spread`` /
+        ``spread_percentage`` properties.
+
+        Returns:
+            QuerySet annotated with the spread metrics
+        """
+        metric_field = models.DecimalField(max_digits=20, decimal_places=4)
+        spread = models.F("ask_price") - models.F("bid_price")
+        return self.annotate(
+            _spread=models.Case(
+                models.When(
+                    bid_price__gt=0,
+                    ask_price__gt=0,
+                    then=models.ExpressionWrapper(spread, output_field=metric_field),
+                ),
+                default=None,
+                output_field=metric_field,
+            ),
+            _spread_percentage=models.Case(
+                models.When(
+                    bid_price__gt=0,
+                    ask_price__gt=0,
+                    then=models.ExpressionWrapper(
+                        spread * _numeric_literal(100) / models.F("bid_price"),
+                        output_field=metric_field,
+                    ),
+                ),
+                default=None,
+                output_field=metric_field,
+            ),
+        )
+
+
+class StockQuerySet(models.QuerySet):
+    """QuerySet helpers for Stock."""
+
+    def lite(self):
+        """
+        Skip the ``description`` TextField.
+
+        For lists and lookups that only need the symbol, name and price
+        columns; accessing ``description`` on a result queries it separately.
+        """
+        return self.defer("description")
+
+
 class Stock(models.Model):
     """
     Model representing a stock/security.
@@ -44,17 +294,46 @@ class Stock(models.Model):
         blank=True,
         help_text=_("Market capitalization in USD"),
     )
+    market_cap_formatted = models.CharField(
+        _("market cap (formatted)"),
+        max_length=16,
+        blank=True,
+        editable=False,
+        help_text=_("Display form of market_cap, computed on save"),
+    )
     description = models.TextField(
         _("description"), blank=True, help_text=_("Company description")
     )
 
+    # Denormalized latest daily close, maintained by a database trigger on
+    # StockPrice (see migration 0021) so valuations avoid a latest-per-group
+    # lookup on the prices table.
+    latest_close = models.DecimalField(
+        _("latest close"),
+        max_digits=12,
+        decimal_places=4,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Close price of the most recent daily bar"),
+    )
+    latest_close_date = models.DateField(
+        _("latest close date"),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Trading date of the most recent daily bar"),
+    )
+
     # Metadata
     is_active = models.BooleanField(_("active"), default=True)
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
     # History tracking
-    history = HistoricalRecords()
+    history = HistoricalRecords(excluded_fields=["latest_close", "latest_close_date"])
+
+    objects = StockQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("Stock")
@@ -69,28 +348,152 @@ class Stock(models.Model):
     def __str__(self):
         return f"{self.symbol} - {self.name}"
 
-    @property
-    def market_cap_formatted(self):
-        """Return formatted market cap string."""
-        if not self.market_cap:
-            return "N/A"
-
-        if self.market_cap >= 1_000_000_000_000:  # Trillion
-            return f"${self.market_cap / 1_000_000_000_000:.1f}T"
-        if self.market_cap >= 1_000_000_000:  # Billion
-            return f"${self.market_cap / 1_000_000_000:.1f}B"
-        if self.market_cap >= 1_000_000:  # Million
-            return f"${self.market_cap / 1_000_000:.1f}M"
-        return f"${self.market_cap:,}"
+    # Written by the StockPrice trigger rather than by Stock.save()
+    TRIGGER_FIELDS = ("latest_close", "latest_close_date")
+
+    def save(self, *args, **kwargs):
+        """
+        Save the stock without writing the trigger-maintained columns.
+
+        ``latest_close``/``latest_close_date`` are written by the StockPrice
+        trigger, so a full save of an existing stock names every other loaded
+        field in ``update_fields`` and a stale in-memory value is never saved
+        back over them. Callers that list the columns in ``update_fields``
+        still write them. If the row has been deleted, the stock is inserted
+        again as a plain ``save()`` would.
+
+        ``market_cap_formatted`` is derived from ``market_cap`` here so list
+        responses read it instead of formatting per row. It is left alone when
+        ``market_cap`` was deferred, so ``.only()`` saves do not load it.
+        """
+        deferred = self.get_deferred_fields()
+        if "market_cap" not in deferred:
+            self.market_cap_formatted = format_market_cap(self.market_cap)
+
+        update_fields = kwargs.get("update_fields")
+        restricted = (
+            update_fields is None
+            and not self._state.adding
+            and not kwargs.get("force_insert")
+        )
+        if restricted:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and not field.generated
+                and field.name not in self.TRIGGER_FIELDS
+                and field.attname not in deferred
+            ]
+        elif update_fields is not None and "market_cap" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "market_cap_formatted"}
+
+        try:
+            super().save(*args, **kwargs)
+        except DatabaseError as exc:
+            # Django raises a bare DatabaseError when the UPDATE matched no
+            # row; driver errors arrive as its subclasses and are re-raised
+            if not restricted or type(exc) is not DatabaseError:
+                raise
+            using = kwargs.get("using") or router.db_for_write(
+                type(self), instance=self
+            )
+            # No statement failed, so the enclosing transaction is still usable
+            in_atomic = connections[using].in_atomic_block
+            if in_atomic:
+                transaction.set_rollback(False, using=using)
+            if type(self)._base_manager.using(using).filter(pk=self.pk).exists():
+                if in_atomic:
+                    transaction.set_rollback(True, using=using)
+                raise
+            del kwargs["update_fields"]
+            super().save(*args, force_insert=True, **kwargs)
 
     @property
     def latest_price(self):
-        """Get the latest stock price."""
+        """
+        Get the latest stock price.
+
+        Returns the value primed by ``prefetch_latest_prices`` when present so
+        list views and batched order sweeps do not query once per row.
+        """
+        if hasattr(self, "_latest_price_cache"):
+            return self._latest_price_cache
         return self.prices.filter(interval="1d").order_by("-date").first()
 
+    @property
+    def latest_close_price(self):
+        """
+        Get the latest daily close price.
+
+        Reads the trigger-maintained ``latest_close`` column and only falls
+        back to querying prices when it has not been populated yet.
+
+        Returns:
+            Close price as Decimal, or None if the stock has no daily prices
+        """
+        if self.latest_close is not None:
+            return self.latest_close
+        latest_price = self.latest_price
+        return latest_price.close_price if latest_price else None
+
+    @staticmethod
+    def bulk_latest_prices(stock_ids):
+        """
+        Get the latest daily price for many stocks in one query.
+
+        Args:
+            stock_ids: Iterable of Stock primary keys
+
+        Returns:
+            Dict mapping stock id to its latest daily StockPrice
+        """
+        prices = (
+            StockPrice.objects.filter(stock_id__in=set(stock_ids), interval="1d")
+            .annotate(
+                row_number=models.Window(
+                    RowNumber(),
+                    partition_by=models.F("stock_id"),
+                    order_by=models.F("date").desc(),
+                )
+            )
+            .filter(row_number=1)
+        )
+        return {price.stock_id: price for price in prices}
+
+    @classmethod
+    def prefetch_latest_prices(cls, stocks):
+        """
+        Prime ``latest_price`` on the given stocks with a single query.
+
+        Args:
+            stocks: Iterable of Stock instances
+
+        Returns:
+            The stocks as a list
+        """
+        stocks = list(stocks)
+        latest_prices = cls.bulk_latest_prices(stock.pk for stock in stocks)
+        for stock in stocks:
+            stock._latest_price_cache = latest_prices.get(stock.pk)
+        return stocks
+
     def get_price_history(self, days=30):
-        """Get price history for the last N days."""
-        return self.prices.filter(interval="1d").order_by("-date")[:days]
+        """Get price history for the last N days (OHLCV columns only)."""
+        return (
+            self.prices.filter(interval="1d")
+            .only(
+                "stock",
+                "date",
+                "interval",
+                "open_price",
+                "high_price",
+                "low_price",
+                "close_price",
+                "volume",
+            )
+            .order_by("-date")[:days]
+        )
 
     def get_intraday_data(self, interval="5m", hours=24):
         """Get intraday data for the last N hours."""
@@ -105,7 +508,7 @@ class StockPrice(models.Model):
     Model for storing historical stock price data (time series).
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.BigAutoField(primary_key=True)
     stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name="prices")
 
     # Price data
@@ -185,18 +588,20 @@ class StockPrice(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = BulkIngestManager.from_queryset(OHLCQuerySet)()
+
     class Meta:
         verbose_name = _("Stock Price")
         verbose_name_plural = _("Stock Prices")
         ordering = ["-date", "-created_at"]
         unique_together = ["stock", "date", "timestamp", "interval"]
+        # (stock, date) lookups use the unique_together index. Unscoped date
+        # range scans use a BRIN index created in migration 0028
+        # (PostgreSQL only).
         indexes = [
-            models.Index(fields=["stock", "date"]),
             models.Index(fields=["stock", "interval", "date"]),
             models.Index(fields=["stock", "timestamp"]),
             models.Index(fields=["stock", "interval", "timestamp"]),
-            models.Index(fields=["date"]),
-            models.Index(fields=["timestamp"]),
         ]
 
     def __str__(self):
@@ -205,6 +610,8 @@ class StockPrice(models.Model):
     @property
     def price_change(self):
         """Calculate price change from open to close."""
+        if hasattr(self, "_price_change"):
+            return self._price_change
         if self.close_price is None or self.open_price is None:
             return Decimal("0.00")
         return self.close_price - self.open_price
@@ -212,11 +619,26 @@ class StockPrice(models.Model):
     @property
     def price_change_percent(self):
         """Calculate percentage price change from open to close."""
+        if hasattr(self, "_price_change_percent"):
+            return self._price_change_percent
         if self.open_price and self.open_price > 0:
             return (self.price_change / self.open_price) * 100
         return Decimal("0.00")
 
 
+class UserWatchlistQuerySet(models.QuerySet):
+    """QuerySet helpers for UserWatchlist."""
+
+    def lite(self):
+        """
+        Load entries with their stock, skipping both free-text columns.
+
+        Defers the entry's ``notes`` and the stock's ``description``, which
+        summary views never show.
+        """
+        return self.select_related("stock").defer("notes", "stock__description")
+
+
 class UserWatchlist(models.Model):
     """
     Model for user's stock watchlist.
@@ -246,6 +668,8 @@ class UserWatchlist(models.Model):
 
     history = HistoricalRecords()
 
+    objects = UserWatchlistQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("User Watchlist")
         verbose_name_plural = _("User Watchlists")
@@ -313,7 +737,7 @@ class StockTick(models.Model):
     This stores individual trades/price updates.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.BigAutoField(primary_key=True)
     stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name="ticks")
 
     # Price and volume for this tick
@@ -370,8 +794,13 @@ class StockTick(models.Model):
         ("sell", _("Sell")),
         ("market", _("Market")),
     ]
-    trade_type = models.CharField(
-        _("trade type"), max_length=10, choices=TRADE_TYPES, null=True, blank=True
+    TRADE_TYPE_CODES = {"buy": 1, "sell": 2, "market": 3}
+    trade_type = SmallIntCodeField(
+        _("trade type"),
+        codes=TRADE_TYPE_CODES,
+        choices=TRADE_TYPES,
+        null=True,
+        blank=True,
     )
 
     # Precise timestamp
@@ -389,14 +818,17 @@ class StockTick(models.Model):
     # Metadata
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
 
+    objects = BulkIngestManager.from_queryset(StockTickQuerySet)()
+
     class Meta:
         verbose_name = _("Stock Tick")
         verbose_name_plural = _("Stock Ticks")
         ordering = ["-timestamp"]
+        # Unscoped timestamp range scans use a BRIN index created in
+        # migration 0028 (PostgreSQL only).
         indexes = [
             models.Index(fields=["stock", "timestamp"]),
             models.Index(fields=["stock", "is_market_hours", "timestamp"]),
-            models.Index(fields=["timestamp"]),
         ]
 
     def __str__(self):
@@ -405,6 +837,8 @@ class StockTick(models.Model):
     @property
     def spread(self):
         """Calculate bid-ask spread."""
+        if hasattr(self, "_spread"):
+            return self._spread
         if self.bid_price and self.ask_price:
             return self.ask_price - self.bid_price
         return None
@@ -412,6 +846,8 @@ class StockTick(models.Model):
     @property
     def spread_percentage(self):
         """Calculate bid-ask spread as percentage."""
+        if hasattr(self, "_spread_percentage"):
+            return self._spread_percentage
         if self.bid_price and self.ask_price and self.bid_price > 0:
             spread = self.ask_price - self.bid_price
             return (spread / self.bid_price) * 100
@@ -424,7 +860,7 @@ class IntradayPrice(models.Model):
     This is optimized for high-frequency data storage and retrieval.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.BigAutoField(primary_key=True)
     stock = models.ForeignKey(
         Stock, on_delete=models.CASCADE, related_name="intraday_prices"
     )
@@ -487,30 +923,35 @@ class IntradayPrice(models.Model):
     )
 
     # Market session information
-    session_type = models.CharField(
+    SESSION_TYPES = [
+        ("pre_market", _("Pre-Market")),
+        ("regular", _("Regular Hours")),
+        ("after_hours", _("After Hours")),
+    ]
+    SESSION_TYPE_CODES = {"pre_market": 1, "regular": 2, "after_hours": 3}
+    session_type = SmallIntCodeField(
         _("session type"),
-        max_length=20,
-        choices=[
-            ("pre_market", _("Pre-Market")),
-            ("regular", _("Regular Hours")),
-            ("after_hours", _("After Hours")),
-        ],
+        codes=SESSION_TYPE_CODES,
+        choices=SESSION_TYPES,
         default="regular",
     )
 
     # Metadata
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
 
+    objects = BulkIngestManager.from_queryset(IntradayPriceQuerySet)()
+
     class Meta:
         verbose_name = _("Intraday Price")
         verbose_name_plural = _("Intraday Prices")
         ordering = ["-timestamp"]
         unique_together = ["stock", "timestamp", "interval"]
+        # (stock, timestamp) lookups use the unique_together index. Unscoped
+        # timestamp range scans use a BRIN index created in migration 0028
+        # (PostgreSQL only).
         indexes = [
-            models.Index(fields=["stock", "timestamp"]),
             models.Index(fields=["stock", "interval", "timestamp"]),
             models.Index(fields=["stock", "session_type", "timestamp"]),
-            models.Index(fields=["timestamp"]),
         ]
 
     def __str__(self):
@@ -519,6 +960,8 @@ class IntradayPrice(models.Model):
     @property
     def price_change(self):
         """Calculate price change from open to close."""
+        if hasattr(self, "_price_change"):
+            return self._price_change
         if self.close_price is None or self.open_price is None:
             return Decimal("0.00")
         return self.close_price - self.open_price
@@ -526,6 +969,8 @@ class IntradayPrice(models.Model):
     @property
     def price_change_percent(self):
         """Calculate percentage price change from open to close."""
+        if hasattr(self, "_price_change_percent"):
+            return self._price_change_percent
         if self.open_price > 0:
             return (self.price_change / self.open_price) * 100
         return Decimal("0.00")
@@ -533,9 +978,115 @@ class IntradayPrice(models.Model):
     @property
     def typical_price(self):
         """Calculate typical price (HLC/3)."""
+        if hasattr(self, "_typical_price"):
+            return self._typical_price
         return (self.high_price + self.low_price + self.close_price) / 3
 
 
+class OrderQuerySet(models.QuerySet):
+    """QuerySet helpers for Order."""
+
+    def lite(self):
+        """
+        Load orders with their stock, skipping both free-text columns.
+
+        Defers the order's ``notes`` and the stock's ``description``. Do not
+        use it for orders that will be executed, which copy ``notes`` onto
+        the holding.
+        """
+        return self.select_related("stock").defer("notes", "stock__description")
+
+    def with_executability(self):
+        """
+        Annotate whether each order could execute right now, in SQL.
+
+        Mirrors ``Order.can_execute`` with subqueries for the latest daily
+        close, the holding being sold and the cash available, so a sweep can
+        screen every waiting order in one query instead of loading each
+        order's context. ``execute()`` still re-checks under row locks.
+
+        Annotations:
+            execution_price: Latest daily close (None without prices)
+            held_quantity: Shares held in the user or bot position
+            available_cash: User profile cash or bot cash balance
+            is_executable: True when ``can_execute`` would return True
+
+        Returns:
+            Annotated QuerySet
+        """
+        from users.models import UserProfile
+
+        latest_close = (
+            StockPrice.objects.filter(stock=models.OuterRef("stock"), interval="1d")
+            .order_by("-date")
+            .values("close_price")[:1]
+        )
+        user_holding = Portfolio.objects.filter(
+            user=models.OuterRef("user"), stock=models.OuterRef("stock")
+        ).values("quantity")[:1]
+        bot_holding = BotPortfolio.objects.filter(
+            bot_config=models.OuterRef("bot_config"), stock=models.OuterRef("stock")
+        ).values("quantity")[:1]
+        user_cash = UserProfile.objects.filter(user=models.OuterRef("user")).values(
+            "cash"
+        )[:1]
+
+        is_user_order = models.Q(bot_config__isnull=True)
+        is_bot_order = models.Q(bot_config__isnull=False)
+        # Users need cash for the whole order, bots for at least one share
+        # (execute() trims bot orders to what they can afford)
+        has_funds = models.Q(transaction_type="buy") & (
+            (
+                is_user_order
+                & models.Q(
+                    available_cash__gte=models.F("quantity")
+                    * models.F("execution_price")
+                )
+            )
+            | (is_bot_order & models.Q(available_cash__gte=models.F("execution_price")))
+        )
+        has_shares = models.Q(transaction_type="sell") & (
+            (is_user_order & models.Q(held_quantity__gte=models.F("quantity")))
+            | (is_bot_order & models.Q(held_quantity__gte=Floor("quantity")))
+        )
+        price_reached = (
+            models.Q(order_type="market")
+            | models.Q(
+                order_type="target",
+                transaction_type="buy",
+                execution_price__lte=models.F("target_price"),
+            )
+            | models.Q(
+                order_type="target",
+                transaction_type="sell",
+                execution_price__gte=models.F("target_price"),
+            )
+        )
+
+        return self.annotate(
+            execution_price=models.Subquery(latest_close),
+            held_quantity=models.Case(
+                models.When(is_user_order, then=models.Subquery(user_holding)),
+                default=models.Subquery(bot_holding),
+            ),
+            available_cash=models.Case(
+                models.When(is_user_order, then=models.Subquery(user_cash)),
+                default=models.F("bot_config__cash_balance"),
+            ),
+        ).annotate(
+            is_executable=models.Case(
+                models.When(
+                    models.Q(status="waiting", execution_price__isnull=False)
+                    & (has_funds | has_shares)
+                    & price_reached,
+                    then=True,
+                ),
+                default=False,
+                output_field=models.BooleanField(),
+            )
+        )
+
+
 class Order(models.Model):
     """
     Model for stock buy/sell orders (order-based trading system).
@@ -644,6 +1195,8 @@ class Order(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Order")
         verbose_name_plural = _("Orders")
@@ -660,19 +1213,79 @@ class Order(models.Model):
         return f"{self.user.email} - {self.get_transaction_type_display()} {self.stock.symbol} ({self.quantity} shares) - {self.get_status_display()}"
 
     @property
-    def can_execute(self):  # noqa: PLR0911
+    def can_execute(self):
         """Check if order can be executed based on current market price and holdings."""
+        return self._can_execute_with(self._collect_execution_context())
+
+    def _collect_execution_context(self, lock=False):
+        """
+        Load everything needed to decide on and execute this order, once.
+
+        ``can_execute`` and ``execute()`` both work from this context, so an
+        execution does not fetch the holding and profile a second time.
+
+        Args:
+            lock: Lock the holding row with ``select_for_update`` (used by
+                ``execute()``, which also needs the profile for sells)
+
+        Returns:
+            Dict with ``latest_close``, ``holding`` (the BotPortfolio or
+            Portfolio row to sell from, None for buys or when there is none),
+            ``user_profile`` (None for bot orders or when not loaded) and
+            ``locked``
+        """
+        # Execution prices from the StockPrice row itself rather than the
+        # denormalized Stock.latest_close column
+        latest_price = self.stock.latest_price
+        context = {
+            "latest_close": latest_price.close_price if latest_price else None,
+            "holding": None,
+            "user_profile": None,
+            "locked": lock,
+        }
+
+        if self.transaction_type == "sell":
+            if self.bot_config is not None:
+                holdings = BotPortfolio.objects.filter(
+                    bot_config=self.bot_config, stock=self.stock
+                )
+            else:
+                holdings = Portfolio.objects.filter(user=self.user, stock=self.stock)
+            if lock:
+                holdings = holdings.select_for_update()
+            context["holding"] = holdings.first()
+
+        if self.bot_config is None and (lock or self.transaction_type == "buy"):
+            from users.models import UserProfile
+
+            with contextlib.suppress(UserProfile.DoesNotExist):
+                context["user_profile"] = self._get_user_profile()
+
+        return context
+
+    def _can_execute_with(self, context):  # noqa: PLR0911
+        """
+        Decide whether the order can execute, given its execution context.
+
+        Args:
+            context: Dict returned by ``_collect_execution_context``
+
+        Returns:
+            True if the order can be executed now
+        """
         if self.status != "waiting":
             logger.warning(
-                f"Order {self.id} cannot be executed - status is not waiting"
+                "Order %s cannot be executed - status is not waiting", self.id
             )
             return False
 
-        latest_price = self.stock.latest_price
-        if not latest_price:
-            logger.warning(f"Order {self.id} cannot be executed - no latest price")
+        latest_close = context["latest_close"]
+        if latest_close is None:
+            logger.warning("Order %s cannot be executed - no latest price", self.id)
             return False
 
+        holding = context["holding"]
+
         # Check if this is a bot order
         is_bot_order = self.bot_config is not None
 
@@ -682,112 +1295,113 @@ class Order(models.Model):
 
             # For sell orders, check if bot has enough shares
             if self.transaction_type == "sell":
-                try:
-                    bot_portfolio = BotPortfolio.objects.get(
-                        bot_config=bot_config, stock=self.stock
-                    )
-                    quantity_int = int(self.quantity)
-                    if bot_portfolio.quantity < quantity_int:
-                        logger.warning(
-                            f"Order {self.id} cannot be executed - insufficient bot shares"
-                        )
-                        return False  # Insufficient shares
-                except BotPortfolio.DoesNotExist:
+                if holding is None:
                     logger.warning(
-                        f"Order {self.id} cannot be executed - no bot portfolio entry"
+                        "Order %s cannot be executed - no bot portfolio entry", self.id
                     )
                     return False  # No shares to sell
+                quantity_int = int(self.quantity)
+                if holding.quantity < quantity_int:
+                    logger.warning(
+                        "Order %s cannot be executed - insufficient bot shares", self.id
+                    )
+                    return False  # Insufficient shares
 
             # For buy orders, check if bot has enough cash for at least 1 share
             # (execute() will reduce quantity if needed)
             if self.transaction_type == "buy":
                 # Check if bot has enough cash for at least 1 share
-                min_cost = latest_price.close_price
+                min_cost = latest_close
                 if bot_config.cash_balance < min_cost:
                     logger.warning(
-                        f"Order {self.id} cannot be executed - insufficient bot cash (need at least {min_cost} for 1 share)"
+                        "Order %s cannot be executed - insufficient bot cash (need at least %s for 1 share)",
+                        self.id,
+                        min_cost,
                     )
                     return False  # Insufficient funds for even 1 share
 
         else:
-            # User order validation (existing logic)
+            # User order validation
+            user_profile = context["user_profile"]
+            if user_profile is None and (
+                context["locked"] or self.transaction_type == "buy"
+            ):
+                logger.warning("Order %s cannot be executed - no user profile", self.id)
+                return False  # No user profile
+
             # For sell orders, check if user has enough shares
             if self.transaction_type == "sell":
-                try:
-                    portfolio_entry = Portfolio.objects.get(
-                        user=self.user, stock=self.stock
-                    )
-                    if portfolio_entry.quantity < self.quantity:
-                        logger.warning(
-                            f"Order {self.id} cannot be executed - insufficient shares"
-                        )
-                        return False  # Insufficient shares
-                except Portfolio.DoesNotExist:
+                if holding is None:
                     logger.warning(
-                        f"Order {self.id} cannot be executed - no portfolio entry"
+                        "Order %s cannot be executed - no portfolio entry", self.id
                     )
                     return False  # No shares to sell
+                if holding.quantity < self.quantity:
+                    logger.warning(
+                        "Order %s cannot be executed - insufficient shares", self.id
+                    )
+                    return False  # Insufficient shares
 
             # For buy orders, check if user has enough cash
             if self.transaction_type == "buy":
-                from users.models import UserProfile
-
-                try:
-                    user_profile = UserProfile.objects.get(user=self.user)
-                    total_cost = self.quantity * latest_price.close_price
-                    if user_profile.cash < total_cost:
-                        logger.warning(
-                            f"Order {self.id} cannot be executed - insufficient funds"
-                        )
-                        return False  # Insufficient funds
-                except UserProfile.DoesNotExist:
+                total_cost = self.quantity * latest_close
+                if user_profile.cash < total_cost:
                     logger.warning(
-                        f"Order {self.id} cannot be executed - no user profile"
+                        "Order %s cannot be executed - insufficient funds", self.id
                     )
-                    return False  # No user profile
+                    return False  # Insufficient funds
 
         if self.order_type == "market":
-            logger.info(f"Order {self.id} can be executed - market order")
+            logger.info("Order %s can be executed - market order", self.id)
             return True  # Market orders can always execute
 
         if self.order_type == "target" and self.target_price:
             # For buy orders: execute if price reaches or goes below target
             # For sell orders: execute if price reaches or goes above target
             if self.transaction_type == "buy":
-                return latest_price.close_price <= self.target_price
+                return latest_close <= self.target_price
             # sell
-            return latest_price.close_price >= self.target_price
+            return latest_close >= self.target_price
         logger.warning(
-            f"Order {self.id} cannot be executed - order type is not market or target"
+            "Order %s cannot be executed - order type is not market or target", self.id
         )
         return False
 
+    @transaction.atomic
     def execute(self):
-        """Execute the order and update portfolio/cash accordingly."""
-        if not self.can_execute:
-            logger.warning(f"Order {self.id} cannot be executed - can_execute is False")
-            return False
+        """
+        Execute the order and update portfolio/cash accordingly.
 
-        latest_price = self.stock.latest_price
-        if not latest_price:
-            logger.warning(f"Order {self.id} cannot be executed - no latest price")
+        Runs in one transaction. Holding rows are locked with
+        ``select_for_update`` before they are read, so concurrent orders for
+        the same user/bot and stock cannot both build on the same quantity.
+        The checks and the writes share one execution context, so the
+        holding and profile are fetched once.
+        """
+        context = self._collect_execution_context(lock=True)
+        if not self._can_execute_with(context):
+            logger.warning(
+                "Order %s cannot be executed - can_execute is False", self.id
+            )
             return False
+
+        latest_close = context["latest_close"]
         logger.info(
-            f"Order {self.id} can be executed - latest price: {latest_price.close_price}"
+            "Order %s can be executed - latest price: %s", self.id, latest_close
         )
         # Set execution price
-        execution_price = latest_price.close_price
+        execution_price = latest_close
 
         # Ensure quantity is integer (round down)
         quantity_int = int(self.quantity)
         if quantity_int <= 0:
-            logger.warning(f"Order {self.id} has invalid quantity: {self.quantity}")
+            logger.warning("Order %s has invalid quantity: %s", self.id, self.quantity)
             self.status = "cancelled"
-            self.save()
+            self.save(update_fields=["status", "updated_at"])
             return False
 
         total_cost = Decimal(str(quantity_int)) * execution_price
-        logger.info(f"Order {self.id} total cost: {total_cost}")
+        logger.info("Order %s total cost: %s", self.id, total_cost)
 
         # Check if this is a bot order
         is_bot_order = self.bot_config is not None
@@ -804,40 +1418,50 @@ class Order(models.Model):
                     max_affordable = int(bot_config.cash_balance / execution_price)
                     if max_affordable <= 0:
                         logger.warning(
-                            f"Order {self.id} cannot be executed - insufficient bot cash. Need: {total_cost}, Have: {bot_config.cash_balance}"
+                            "Order %s cannot be executed - insufficient bot cash. Need: %s, Have: %s",
+                            self.id,
+                            total_cost,
+                            bot_config.cash_balance,
                         )
                         self.status = "insufficient_funds"
-                        self.save()
+                        self.save(update_fields=["status", "updated_at"])
                         return False
                     quantity_int = max_affordable
                     total_cost = Decimal(str(quantity_int)) * execution_price
                     logger.warning(
-                        f"Order {self.id} quantity reduced to {quantity_int} due to cash constraints"
+                        "Order %s quantity reduced to %s due to cash constraints",
+                        self.id,
+                        quantity_int,
                     )
 
-                # Deduct from bot cash
-                bot_config.cash_balance -= total_cost
-                bot_config.save(update_fields=["cash_balance"])
-                logger.info(f"Order {self.id} bot cash deducted: {total_cost}")
-
-                # Get or create BotPortfolio entry
-                bot_portfolio, created = BotPortfolio.objects.get_or_create(
-                    bot_config=bot_config,
-                    stock=self.stock,
-                    defaults={
-                        "quantity": 0,
-                        "average_purchase_price": Decimal("0.00"),
-                        "total_cost_basis": Decimal("0.00"),
-                    },
-                )
+                # Deduct from bot cash; fails if a concurrent order spent it
+                if not bot_config.adjust_cash_balance(-total_cost):
+                    logger.warning(
+                        "Order %s cannot be executed - insufficient bot cash. Need: %s",
+                        self.id,
+                        total_cost,
+                    )
+                    self.status = "insufficient_funds"
+                    self.save(update_fields=["status", "updated_at"])
+                    return False
+                logger.info("Order %s bot cash deducted: %s", self.id, total_cost)
 
-                # Update BotPortfolio
-                if created:
-                    bot_portfolio.quantity = quantity_int
-                    bot_portfolio.average_purchase_price = execution_price
-                    bot_portfolio.total_cost_basis = total_cost
-                    bot_portfolio.first_purchase_date = timezone.now().date()
-                    bot_portfolio.last_purchase_date = timezone.now().date()
+                # Lock the BotPortfolio entry, or insert it in one statement
+                bot_portfolio = (
+                    BotPortfolio.objects.select_for_update()
+                    .filter(bot_config=bot_config, stock=self.stock)
+                    .first()
+                )
+                if bot_portfolio is None:
+                    bot_portfolio = BotPortfolio.objects.create(
+                        bot_config=bot_config,
+                        stock=self.stock,
+                        quantity=quantity_int,
+                        average_purchase_price=execution_price,
+                        total_cost_basis=total_cost,
+                        first_purchase_date=timezone.now().date(),
+                        last_purchase_date=timezone.now().date(),
+                    )
                 else:
                     # Calculate weighted average
                     total_quantity = bot_portfolio.quantity + quantity_int
@@ -852,7 +1476,16 @@ class Order(models.Model):
                     bot_portfolio.last_purchase_date = timezone.now().date()
                     if not bot_portfolio.first_purchase_date:
                         bot_portfolio.first_purchase_date = timezone.now().date()
-                bot_portfolio.save()
+                    bot_portfolio.save(
+                        update_fields=[
+                            "quantity",
+                            "average_purchase_price",
+                            "total_cost_basis",
+                            "first_purchase_date",
+                            "last_purchase_date",
+                            "updated_at",
+                        ]
+                    )
 
                 # Create BotPortfolioLot entry
                 BotPortfolioLot.objects.create(
@@ -865,19 +1498,22 @@ class Order(models.Model):
                 )
 
                 # Also create/update user Portfolio entry (linked to bot) for shared view
-                portfolio_entry, created = Portfolio.objects.get_or_create(
-                    user=self.user,
-                    stock=self.stock,
-                    defaults={
-                        "quantity": 0,
-                        "purchase_price": execution_price,
-                        "purchase_date": timezone.now().date(),
-                    },
+                portfolio_entry = (
+                    Portfolio.objects.select_for_update()
+                    .filter(user=self.user, stock=self.stock)
+                    .first()
                 )
-
-                if created:
-                    portfolio_entry.quantity = quantity_int
-                    portfolio_entry.purchase_price = execution_price
+                if portfolio_entry is None:
+                    Portfolio.objects.create(
+                        user=self.user,
+                        stock=self.stock,
+                        quantity=quantity_int,
+                        purchase_price=execution_price,
+                        purchase_date=timezone.now().date(),
+                        notes=self.notes,
+                        order=self,
+                        bot_config=bot_config,
+                    )
                 else:
                     # Calculate weighted average purchase price
                     total_shares = portfolio_entry.quantity + quantity_int
@@ -889,28 +1525,24 @@ class Order(models.Model):
                         str(total_shares)
                     )
                     portfolio_entry.quantity = total_shares
-
-                portfolio_entry.notes = self.notes or portfolio_entry.notes
-                portfolio_entry.order = self
-                portfolio_entry.bot_config = bot_config
-                portfolio_entry.save()
+                    portfolio_entry.notes = self.notes or portfolio_entry.notes
+                    portfolio_entry.order = self
+                    portfolio_entry.bot_config = bot_config
+                    portfolio_entry.save(
+                        update_fields=[
+                            "quantity",
+                            "purchase_price",
+                            "notes",
+                            "order",
+                            "bot_config",
+                            "updated_at",
+                        ]
+                    )
 
             # Handle sell orders with HIFO (Highest-In-First-Out) logic
             elif self.transaction_type == "sell":
-                # Check if bot has position
-                try:
-                    bot_portfolio = BotPortfolio.objects.get(
-                        bot_config=bot_config, stock=self.stock
-                    )
-                except BotPortfolio.DoesNotExist:
-                    self.status = "insufficient_funds"  # No shares to sell
-                    self.save()
-                    return False
-
-                if bot_portfolio.quantity < quantity_int:
-                    self.status = "insufficient_funds"  # Insufficient shares
-                    self.save()
-                    return False
+                # Position locked and checked by the execution context
+                bot_portfolio = context["holding"]
 
                 # HIFO: Sell from highest-priced lots first
                 # Get all lots ordered by purchase_price DESC (highest first)
@@ -945,13 +1577,12 @@ class Order(models.Model):
 
                     # Update lot's remaining quantity
                     lot.remaining_quantity -= shares_to_sell_from_lot
-                    lot.save()
+                    lot.save(update_fields=["remaining_quantity", "updated_at"])
 
                     remaining_to_sell -= shares_to_sell_from_lot
 
                 # Add cash from sale
-                bot_config.cash_balance += total_proceeds
-                bot_config.save(update_fields=["cash_balance"])
+                bot_config.adjust_cash_balance(total_proceeds)
 
                 # Update BotPortfolio
                 bot_portfolio.quantity -= quantity_int
@@ -969,92 +1600,89 @@ class Order(models.Model):
                 if bot_portfolio.quantity <= 0:
                     bot_portfolio.delete()
                 else:
-                    bot_portfolio.save()
+                    bot_portfolio.save(
+                        update_fields=[
+                            "quantity",
+                            "total_cost_basis",
+                            "average_purchase_price",
+                            "updated_at",
+                        ]
+                    )
 
                 # Update user Portfolio entry
                 try:
-                    portfolio_entry = Portfolio.objects.get(
+                    portfolio_entry = Portfolio.objects.select_for_update().get(
                         user=self.user, stock=self.stock, bot_config=bot_config
                     )
                     portfolio_entry.quantity -= Decimal(str(quantity_int))
                     if portfolio_entry.quantity <= Decimal("0.00"):
                         portfolio_entry.delete()
                     else:
-                        portfolio_entry.save()
+                        portfolio_entry.save(update_fields=["quantity", "updated_at"])
                 except Portfolio.DoesNotExist:
                     pass
 
         else:
             # User order - use user cash and portfolio (existing logic)
-            from users.models import UserProfile
-
-            user_profile = UserProfile.objects.get(user=self.user)
-            logger.info(f"Order {self.id} user profile: {user_profile.cash}")
+            user_profile = context["user_profile"]
 
             # Handle buy orders
             if self.transaction_type == "buy":
-                # Check if user has enough cash
-                if user_profile.cash < total_cost:
+                # Deduct cash; the UPDATE only applies if the user can afford it
+                if not user_profile.adjust_cash(-total_cost):
                     logger.warning(
-                        f"Order {self.id} cannot be executed - insufficient funds. Need: {total_cost}, Have: {user_profile.cash}"
+                        "Order %s cannot be executed - insufficient funds. Need: %s",
+                        self.id,
+                        total_cost,
                     )
                     self.status = "insufficient_funds"
-                    self.save()
+                    self.save(update_fields=["status", "updated_at"])
                     return False  # Insufficient funds
+                logger.info("Order %s cash deducted: %s", self.id, total_cost)
 
-                # Deduct cash
-                user_profile.cash -= total_cost
-                user_profile.save()
-                logger.info(f"Order {self.id} cash deducted: {total_cost}")
-
-                # Get or create portfolio entry for this stock
-                portfolio_entry, created = Portfolio.objects.get_or_create(
-                    user=self.user,
-                    stock=self.stock,
-                    defaults={
-                        "quantity": Decimal("0.00"),
-                        "purchase_price": execution_price,
-                        "purchase_date": timezone.now().date(),
-                    },
+                # Lock the portfolio entry for this stock, or insert it
+                portfolio_entry = (
+                    Portfolio.objects.select_for_update()
+                    .filter(user=self.user, stock=self.stock)
+                    .first()
                 )
-
-                # Update portfolio: add quantity and recalculate average purchase price
-                if created:
-                    portfolio_entry.quantity = Decimal(str(quantity_int))
-                    portfolio_entry.purchase_price = execution_price
+                if portfolio_entry is None:
+                    Portfolio.objects.create(
+                        user=self.user,
+                        stock=self.stock,
+                        quantity=quantity_int,
+                        purchase_price=execution_price,
+                        purchase_date=timezone.now().date(),
+                        notes=self.notes,
+                        order=self,
+                    )
                 else:
-                    # Calculate weighted average purchase price
+                    # Add quantity and recalculate average purchase price
                     total_shares = portfolio_entry.quantity + Decimal(str(quantity_int))
                     total_value = (
                         portfolio_entry.quantity * portfolio_entry.purchase_price
                     ) + total_cost
                     portfolio_entry.purchase_price = total_value / total_shares
                     portfolio_entry.quantity = total_shares
-
-                portfolio_entry.notes = self.notes or portfolio_entry.notes
-                portfolio_entry.order = self
-                portfolio_entry.save()
+                    portfolio_entry.notes = self.notes or portfolio_entry.notes
+                    portfolio_entry.order = self
+                    portfolio_entry.save(
+                        update_fields=[
+                            "quantity",
+                            "purchase_price",
+                            "notes",
+                            "order",
+                            "updated_at",
+                        ]
+                    )
 
             # Handle sell orders
             elif self.transaction_type == "sell":
-                # Check if user has enough shares
-                try:
-                    portfolio_entry = Portfolio.objects.get(
-                        user=self.user, stock=self.stock
-                    )
-                except Portfolio.DoesNotExist:
-                    self.status = "insufficient_funds"  # No shares to sell
-                    self.save()
-                    return False
-
-                if portfolio_entry.quantity < Decimal(str(quantity_int)):
-                    self.status = "insufficient_funds"  # Insufficient shares
-                    self.save()
-                    return False
+                # Holding locked and checked by the execution context
+                portfolio_entry = context["holding"]
 
                 # Add cash from sale
-                user_profile.cash += total_cost
-                user_profile.save()
+                user_profile.adjust_cash(total_cost)
 
                 # Update portfolio: reduce quantity
                 portfolio_entry.quantity -= Decimal(str(quantity_int))
@@ -1063,20 +1691,97 @@ class Order(models.Model):
                 if portfolio_entry.quantity <= Decimal("0.00"):
                     portfolio_entry.delete()
                 else:
-                    portfolio_entry.save()
+                    portfolio_entry.save(update_fields=["quantity", "updated_at"])
 
         # Mark order as executed
         self.executed_price = execution_price
         self.executed_at = timezone.now()
-        self.status = "in_progress"
-        self.save()
-
-        # Mark order as done
         self.status = "done"
-        self.save()
+        self.save(
+            update_fields=["executed_price", "executed_at", "status", "updated_at"]
+        )
 
         return True
 
+    def _get_user_profile(self):
+        """
+        Get the ordering user's profile.
+
+        Uses the profile primed by ``execute_batch`` when present, otherwise
+        queries it.
+
+        Raises:
+            UserProfile.DoesNotExist: If the user has no profile
+        """
+        profile = getattr(self, "_user_profile_cache", None)
+        if profile is None:
+            from users.models import UserProfile
+
+            profile = UserProfile.objects.get(user=self.user)
+        return profile
+
+    @classmethod
+    def execute_batch(cls, queryset):
+        """
+        Execute waiting orders with their shared lookups loaded up front.
+
+        Latest daily prices and user profiles for the whole batch are fetched
+        with one query each and shared between orders, so ``can_execute`` and
+        ``execute`` no longer query them once per order. Orders touching the
+        same stock, user or bot share one instance, keeping cash balances
+        consistent as the batch runs.
+
+        Args:
+            queryset: Order queryset to sweep; orders not waiting are skipped
+
+        Returns:
+            List of (order, executed) tuples in queryset order
+        """
+        from users.models import UserProfile
+
+        orders = list(
+            queryset.filter(status="waiting").select_related(
+                "stock", "user", "bot_config"
+            )
+        )
+        if not orders:
+            return []
+
+        user_ids = {order.user_id for order in orders}
+        profiles = {
+            profile.user_id: profile
+            for profile in UserProfile.objects.filter(user_id__in=user_ids)
+        }
+
+        stocks = {order.stock_id: order.stock for order in orders}
+        Stock.prefetch_latest_prices(stocks.values())
+
+        users, bot_configs = {}, {}
+        results = []
+        for order in orders:
+            order.stock = stocks[order.stock_id]
+            order.user = users.setdefault(order.user_id, order.user)
+            order._user_profile_cache = profiles.get(order.user_id)
+            if order.bot_config_id:
+                order.bot_config = bot_configs.setdefault(
+                    order.bot_config_id, order.bot_config
+                )
+            results.append((order, order.execute()))
+        return results
+
+
+class PortfolioQuerySet(models.QuerySet):
+    """QuerySet helpers for Portfolio."""
+
+    def lite(self):
+        """
+        Load holdings with their stock, skipping both free-text columns.
+
+        Defers the holding's ``notes`` and the stock's ``description``, which
+        valuation and summary code never reads.
+        """
+        return self.select_related("stock").defer("notes", "stock__description")
+
 
 class Portfolio(models.Model):
     """
@@ -1084,8 +1789,12 @@ class Portfolio(models.Model):
     """
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # user is covered by the composite indexes in Meta, all of which lead with it
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="portfolio_holdings"
+        User,
+        on_delete=models.CASCADE,
+        related_name="portfolio_holdings",
+        db_index=False,
     )
     stock = models.ForeignKey(
         Stock, on_delete=models.CASCADE, related_name="portfolio_holders"
@@ -1125,6 +1834,13 @@ class Portfolio(models.Model):
     purchase_date = models.DateField(
         _("purchase date"), help_text=_("Date when the stock was purchased")
     )
+    total_cost = models.GeneratedField(
+        expression=models.F("quantity") * models.F("purchase_price"),
+        output_field=models.DecimalField(max_digits=20, decimal_places=4),
+        db_persist=True,
+        verbose_name=_("total cost"),
+        help_text=_("Quantity times purchase price, computed by the database"),
+    )
 
     # Notes
     notes = models.TextField(
@@ -1135,33 +1851,55 @@ class Portfolio(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = PortfolioQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Portfolio")
         verbose_name_plural = _("Portfolios")
         ordering = ["-purchase_date", "-created_at"]
         indexes = [
             models.Index(fields=["user", "purchase_date"]),
-            models.Index(fields=["stock"]),
             models.Index(fields=["user", "stock"]),
+            # portfolio_user_cover_idx on user INCLUDE (stock, quantity,
+            # purchase_price) lets the dashboard list read holdings with an
+            # index-only scan; it is created by migration 0034 (PostgreSQL
+            # only, unsupported on SQLite).
+            models.Index(fields=["user", "total_cost"]),
         ]
 
-    # History tracking
-    history = HistoricalRecords()
+    # History tracking (updated_at changes on every save and adds no audit
+    # value; total_cost is derived from tracked columns)
+    history = HistoricalRecords(excluded_fields=["updated_at", "total_cost"])
 
     def __str__(self):
         return f"{self.user.email} - {self.stock.symbol} ({self.quantity} shares)"
 
-    @property
-    def total_cost(self):
-        """Calculate total cost of purchase."""
-        return Decimal(str(self.quantity)) * self.purchase_price
+    # Database inputs of the generated total_cost column
+    TOTAL_COST_FIELDS = {"quantity", "purchase_price"}
+
+    def save(self, *args, **kwargs):
+        """
+        Save the holding and keep ``total_cost`` in step with the row.
+
+        Inserts get the generated value back with the row; an UPDATE does
+        not. When its inputs may have changed, ``total_cost`` is dropped from
+        the instance so it loads as a deferred field on next access, and
+        trade paths that never read it pay no extra query.
+        """
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if not adding and (
+            update_fields is None or self.TOTAL_COST_FIELDS.intersection(update_fields)
+        ):
+            vars(self).pop("total_cost", None)
 
     @property
     def current_value(self):
         """Calculate current value based on latest price."""
-        latest_price = self.stock.latest_price
-        if latest_price:
-            return Decimal(str(self.quantity)) * latest_price.close_price
+        latest_close = self.stock.latest_close_price
+        if latest_close is not None:
+            return Decimal(str(self.quantity)) * latest_close
         return Decimal("0.00")
 
     @property
@@ -1176,6 +1914,41 @@ class Portfolio(models.Model):
             return (self.gain_loss / self.total_cost) * 100
         return Decimal("0.00")
 
+    # Float variants for read-only display (list serialization). Anything that
+    # rounds, settles or stores money must use the Decimal properties above.
+
+    @cached_property
+    def _quantity_f(self):
+        return float(self.quantity)
+
+    @cached_property
+    def _latest_close_f(self):
+        latest_close = self.stock.latest_close_price
+        return float(latest_close) if latest_close is not None else 0.0
+
+    @property
+    def total_cost_f(self):
+        """Total cost of purchase as float, for display."""
+        return round(self._quantity_f * float(self.purchase_price), 4)
+
+    @property
+    def current_value_f(self):
+        """Current value as float, for display."""
+        return round(self._quantity_f * self._latest_close_f, 4)
+
+    @property
+    def gain_loss_f(self):
+        """Gain/loss amount as float, for display."""
+        return round(self.current_value_f - self.total_cost_f, 4)
+
+    @property
+    def gain_loss_percent_f(self):
+        """Gain/loss percentage as float, for display."""
+        total_cost = self.total_cost_f
+        if total_cost > 0:
+            return round(self.gain_loss_f / total_cost * 100, 4)
+        return 0.0
+
 
 class BotPortfolio(models.Model):
     """
@@ -1253,9 +2026,9 @@ class BotPortfolio(models.Model):
     @property
     def current_value(self):
         """Calculate current value based on latest price."""
-        latest_price = self.stock.latest_price
-        if latest_price:
-            return Decimal(str(self.quantity)) * latest_price.close_price
+        latest_close = self.stock.latest_close_price
+        if latest_close is not None:
+            return Decimal(str(self.quantity)) * latest_close
         return Decimal("0.00")
 
     @property
@@ -1354,6 +2127,30 @@ class BotPortfolioLot(models.Model):
         return Decimal("0.00")
 
 
+class TradingBotConfigQuerySet(models.QuerySet):
+    """QuerySet helpers for TradingBotConfig."""
+
+    def with_assignment_flags(self):
+        """
+        Annotate has_stocks/has_portfolio using EXISTS subqueries.
+
+        Returns:
+            QuerySet with boolean ``has_stocks`` and ``has_portfolio``
+        """
+        stocks_through = self.model.assigned_stocks.through
+        portfolio_through = self.model.budget_portfolio.through
+        return self.annotate(
+            has_stocks=models.Exists(
+                stocks_through.objects.filter(tradingbotconfig_id=models.OuterRef("pk"))
+            ),
+            has_portfolio=models.Exists(
+                portfolio_through.objects.filter(
+                    tradingbotconfig_id=models.OuterRef("pk")
+                )
+            ),
+        )
+
+
 class TradingBotConfig(models.Model):
     """
     Model for trading bot configuration.
@@ -1508,8 +2305,9 @@ class TradingBotConfig(models.Model):
     )
     ml_model_weights = models.JSONField(
         _("ml model weights"),
-        default=dict,
+        null=True,
         blank=True,
+        default=None,
         help_text=_("Weights for each ML model (model_id: weight)"),
     )
 
@@ -1548,8 +2346,9 @@ class TradingBotConfig(models.Model):
     )
     signal_thresholds = models.JSONField(
         _("signal thresholds"),
-        default=dict,
+        null=True,
         blank=True,
+        default=None,
         help_text=_("Minimum thresholds for signals (confidence, strength, count)"),
     )
     risk_score_threshold = models.DecimalField(
@@ -1587,8 +2386,9 @@ class TradingBotConfig(models.Model):
     )
     indicator_thresholds = models.JSONField(
         _("indicator thresholds"),
-        default=dict,
+        null=True,
         blank=True,
+        default=None,
         help_text=_(
             "Custom thresholds for indicator signals (overrides defaults). "
             "Format: {'rsi': {'oversold': 30, 'overbought': 70}, ...}"
@@ -1602,14 +2402,16 @@ class TradingBotConfig(models.Model):
     )
     buy_rules = models.JSONField(
         _("buy rules"),
-        default=dict,
+        null=True,
         blank=True,
+        default=None,
         help_text=_("Buy condition rules (JSON)"),
     )
     sell_rules = models.JSONField(
         _("sell rules"),
-        default=dict,
+        null=True,
         blank=True,
+        default=None,
         help_text=_("Sell condition rules (JSON)"),
     )
 
@@ -1643,6 +2445,8 @@ class TradingBotConfig(models.Model):
     created_at = models.DateTimeField(_("created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("updated at"), auto_now=True)
 
+    objects = TradingBotConfigQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Trading Bot Config")
         verbose_name_plural = _("Trading Bot Configs")
@@ -1651,13 +2455,105 @@ class TradingBotConfig(models.Model):
             models.Index(fields=["user", "is_active"]),
             models.Index(fields=["is_active", "created_at"]),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "name"], name="uq_bot_per_user_name"
+            ),
+        ]
 
-    # History tracking
-    history = HistoricalRecords()
+    # History tracking. Rows are written asynchronously, see save().
+    history = HistoricalRecords(excluded_fields=["updated_at"])
+
+    # Rarely configured JSON options. Empty values are stored as NULL to keep
+    # rows narrow; callers treat NULL as empty.
+    OPTIONAL_JSON_FIELDS = (
+        "ml_model_weights",
+        "signal_thresholds",
+        "indicator_thresholds",
+        "buy_rules",
+        "sell_rules",
+    )
 
     def __str__(self):
         return f"{self.user.email} - {self.name} ({'Active' if self.is_active else 'Inactive'})"
 
+    def save(self, *args, **kwargs):
+        """
+        Save the config and queue its history row instead of writing it inline.
+
+        Bots update ``cash_balance`` on every executed trade, so the historical
+        INSERT is handed to a Celery task that runs once the surrounding
+        transaction commits. Empty OPTIONAL_JSON_FIELDS are stored as NULL.
+        """
+        created = self._state.adding
+
+        for field_name in self.OPTIONAL_JSON_FIELDS:
+            if getattr(self, field_name) == {}:
+                setattr(self, field_name, None)
+
+        self.skip_history_when_saving = True
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            del self.skip_history_when_saving
+
+        self._queue_history(created=created)
+
+    def _queue_history(self, created=False):
+        """
+        Queue the historical record for this config once the transaction commits.
+
+        The field values and change time are captured now, so each queued
+        record describes this change even when the config is saved again
+        before the task runs.
+        """
+        from django.core import serializers
+
+        from users.models import history_request_user
+
+        from .tasks import create_bot_config_history
+
+        user = history_request_user()
+        history_user_id = user.pk if user else None
+
+        config_id = self.pk
+        config_state = serializers.serialize(
+            "json",
+            [self],
+            fields=[field.name for field in self._meta.concrete_fields],
+        )
+        history_date = timezone.now().isoformat()
+        transaction.on_commit(
+            lambda: create_bot_config_history.delay(
+                config_id,
+                config_state=config_state,
+                history_date=history_date,
+                created=created,
+                history_user_id=history_user_id,
+            ),
+            robust=True,
+        )
+
+    def adjust_cash_balance(self, amount):
+        """
+        Add ``amount`` to ``cash_balance`` in one conditional UPDATE.
+
+        See ``users.models.add_to_balance``. The history row is queued as
+        ``save()`` does.
+
+        Args:
+            amount: Amount to add (negative to deduct)
+
+        Returns:
+            True if the balance was updated, False if it would go negative
+        """
+        from users.models import add_to_balance
+
+        if not add_to_balance(self, "cash_balance", amount):
+            return False
+        self._queue_history()
+        return True
+
     def get_total_equity(self) -> Decimal:
         """
         Calculate total bot equity (cash + portfolio value).
@@ -1682,20 +2578,59 @@ class TradingBotConfig(models.Model):
             portfolio_value += holding.current_value
         return portfolio_value
 
+    @classmethod
+    def active_ids_iter(cls, stock=None):
+        """
+        Iterate over the active bots as lightweight ``id``/``user_id`` dicts.
+
+        Used by scheduler sweeps, which only hydrate a full config for the
+        bots they actually run.
+
+        Args:
+            stock: Optional Stock; limits the sweep to bots assigned to it
+
+        Returns:
+            Iterator of dicts with ``id`` and ``user_id`` keys
+        """
+        queryset = cls.objects.filter(is_active=True)
+        if stock is not None:
+            queryset = queryset.filter(assigned_stocks=stock)
+        return queryset.values("id", "user_id").iterator(chunk_size=500)
+
     def clean(self):
-        """Validate bot configuration."""
+        """
+        Validate bot configuration.
+
+        M2M relations can only be checked once the config is saved, so unsaved
+        instances skip the budget_portfolio/assigned_stocks checks. The UUID
+        primary key is set on instantiation, hence ``_state.adding`` rather
+        than ``pk``. Forms that create configs must validate the submitted
+        M2M data themselves after calling ``super().clean()``.
+        """
         from django.core.exceptions import ValidationError
 
         if self.budget_type == "cash" and not self.budget_cash:
             raise ValidationError(
                 _("Cash budget is required when budget_type is 'cash'")
             )
-        if self.budget_type == "portfolio" and not self.budget_portfolio.exists():
-            raise ValidationError(
-                _("Portfolio positions are required when budget_type is 'portfolio'")
+        if not self._state.adding:
+            flags = (
+                type(self)
+                .objects.filter(pk=self.pk)
+                .with_assignment_flags()
+                .values("has_stocks", "has_portfolio")
+                .get()
             )
-        if not self.assigned_stocks.exists():
-            raise ValidationError(_("At least one stock must be assigned to the bot"))
+            if self.budget_type == "portfolio" and not flags["has_portfolio"]:
+                raise ValidationError(
+                    _(
+                        "Portfolio positions are required when budget_type is 'portfolio'"
+                    )
+                )
+            if not flags["has_stocks"]:
+                raise ValidationError(
+                    _("At least one stock must be assigned to the bot")
+                )
         # Validate persistence configuration
         if self.signal_persistence_type and not self.signal_persistence_value:
             raise ValidationError(
@@ -1803,6 +2738,22 @@ class TradingBotExecution(models.Model):
     def __str__(self):
         return f"{self.bot_config.name} - {self.stock.symbol} - {self.get_action_display()} @ {self.timestamp}"
 
+    @classmethod
+    def record_batch(cls, items: list[dict]) -> list["TradingBotExecution"]:
+        """
+        Insert many execution records in one transaction.
+
+        Args:
+            items: List of field dictionaries, one per execution
+
+        Returns:
+            List of created TradingBotExecution instances
+        """
+        with transaction.atomic():
+            return cls.objects.bulk_create(
+                [cls(**item) for item in items], batch_size=500
+            )
+
 
 class MLModel(models.Model):
     """
@@ -1881,6 +2832,22 @@ class MLModel(models.Model):
         }
 
 
+class BotSignalHistoryManager(models.Manager):
+    """Manager that leaves the wide signal JSON columns out of SELECTs."""
+
+    DEFERRED_FIELDS = (
+        "ml_signals",
+        "social_signals",
+        "news_signals",
+        "indicator_signals",
+        "pattern_signals",
+        "aggregated_signal",
+    )
+
+    def get_queryset(self):
+        return super().get_queryset().defer(*self.DEFERRED_FIELDS)
+
+
 class BotSignalHistory(models.Model):
     """
     Model for tracking all signals and decisions for bot analysis.
@@ -1903,12 +2870,6 @@ class BotSignalHistory(models.Model):
     timestamp = models.DateTimeField(
         _("timestamp"), auto_now_add=True, help_text=_("When analysis was performed")
     )
-    price_data_snapshot = models.JSONField(
-        _("price data snapshot"),
-        default=dict,
-        blank=True,
-        help_text=_("Snapshot of price data at analysis time"),
-    )
     ml_signals = models.JSONField(
         _("ml signals"),
         default=dict,
@@ -1978,10 +2939,18 @@ class BotSignalHistory(models.Model):
         help_text=_("Related bot execution if trade was executed"),
     )
 
+    # ``objects`` defers the signal JSON columns for list/lookup queries;
+    # use ``full_objects`` when the signals themselves are rendered.
+    full_objects = models.Manager()
+    objects = BotSignalHistoryManager()
+
     class Meta:
         verbose_name = _("Bot Signal History")
         verbose_name_plural = _("Bot Signal Histories")
         ordering = ["-timestamp"]
+        default_manager_name = "objects"
+        # jsonb_path_ops GIN indexes on aggregated_signal/indicator_signals are
+        # created by migration 0018 (PostgreSQL only, unsupported on SQLite).
         indexes = [
             models.Index(fields=["bot_config", "timestamp"]),
             models.Index(fields=["stock", "timestamp"]),
@@ -1991,6 +2960,112 @@ class BotSignalHistory(models.Model):
     def __str__(self):
         return f"{self.bot_config.name} - {self.stock.symbol} - {self.final_decision} @ {self.timestamp}"
 
+    def save(self, *args, **kwargs):
+        """Save the row, then the compressed price snapshot if it changed."""
+        super().save(*args, **kwargs)
+        if getattr(self, "_price_data_snapshot_dirty", False):
+            BotSignalHistoryPayload.objects.update_or_create(
+                history=self,
+                defaults={"data": compress_json(self._price_data_snapshot)},
+            )
+            self._price_data_snapshot_dirty = False
+
+    @property
+    def price_data_snapshot(self) -> dict:
+        """
+        Snapshot of price data at analysis time.
+
+        Stored compressed in BotSignalHistoryPayload and only loaded on access,
+        so list queries over signal history never read it. Use
+        ``select_related("payload")`` when reading it for many rows.
+        """
+        if not hasattr(self, "_price_data_snapshot"):
+            try:
+                self._price_data_snapshot = self.payload.price_data_snapshot
+            except BotSignalHistoryPayload.DoesNotExist:
+                self._price_data_snapshot = {}
+        return self._price_data_snapshot
+
+    @price_data_snapshot.setter
+    def price_data_snapshot(self, value: dict | None):
+        self._price_data_snapshot = value or {}
+        self._price_data_snapshot_dirty = True
+
+    @classmethod
+    def record_batch(cls, items: list[dict]) -> list["BotSignalHistory"]:
+        """
+        Insert many signal history rows (and their payloads) in one transaction.
+
+        Args:
+            items: List of field dictionaries, one per signal history row
+
+        Returns:
+            List of created BotSignalHistory instances
+        """
+        rows = [cls(**item) for item in items]
+        with transaction.atomic():
+            cls.objects.bulk_create(rows, batch_size=500)
+            BotSignalHistoryPayload.objects.bulk_create(
+                [
+                    BotSignalHistoryPayload(
+                        history=row, data=compress_json(row._price_data_snapshot)
+                    )
+                    for row in rows
+                    if getattr(row, "_price_data_snapshot_dirty", False)
+                ],
+                batch_size=500,
+            )
+        for row in rows:
+            row._price_data_snapshot_dirty = False
+        return rows
+
+
+def compress_json(value) -> bytes:
+    """Serialize a JSON-compatible value and zlib-compress it."""
+    return zlib.compress(
+        json.dumps(value, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+    )
+
+
+def decompress_json(data) -> dict:
+    """Inverse of compress_json."""
+    if not data:
+        return {}
+    return json.loads(zlib.decompress(bytes(data)))
+
+
+class BotSignalHistoryPayload(models.Model):
+    """
+    Wide, rarely-read payload of a BotSignalHistory row, stored compressed.
+
+    Kept out of the main table so scans over signal history (dashboards,
+    analytics) do not drag the full price data snapshot through the buffer
+    cache.
+    """
+
+    history = models.OneToOneField(
+        BotSignalHistory,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="payload",
+    )
+    data = models.BinaryField(
+        _("data"),
+        help_text=_("zlib-compressed JSON price data snapshot"),
+    )
+
+    class Meta:
+        verbose_name = _("Bot Signal History Payload")
+        verbose_name_plural = _("Bot Signal History Payloads")
+
+    def __str__(self):
+        return f"Payload for {self.history_id}"
+
+    @property
+    def price_data_snapshot(self) -> dict:
+        """Decompressed price data snapshot."""
+        return decompress_json(self.data)
+
 
 class NewsSource(models.Model):
     """
@@ -2074,6 +3149,10 @@ class SocialMediaSource(models.Model):
         return f"{self.name} ({self.get_platform_display()})"
 
 
+TRADING_BOT_SETTINGS_CACHE_KEY = "tbs:v1"
+TRADING_BOT_SETTINGS_CACHE_TIMEOUT = 3600
+
+
 class TradingBotSettings(models.Model):
     """
     Singleton model for Trading Bot global settings.
@@ -2106,6 +3185,7 @@ class TradingBotSettings(models.Model):
         """
         self.pk = 1
         super().save(*args, **kwargs)
+        cache.delete(TRADING_BOT_SETTINGS_CACHE_KEY)
 
     def delete(self, *args, **kwargs):
         """
@@ -2116,6 +3196,16 @@ class TradingBotSettings(models.Model):
     def load(cls):
         """
         Get or create the singleton instance.
+
+        The instance is cached for an hour and invalidated whenever it is
+        saved, so most callers never touch the database.
         """
-        obj, _created = cls.objects.get_or_create(pk=1)
+        obj = cache.get(TRADING_BOT_SETTINGS_CACHE_KEY)
+        if obj is None:
+            obj, _created = cls.objects.get_or_create(pk=1)
+            cache.set(
+                TRADING_BOT_SETTINGS_CACHE_KEY,
+                obj,
+                TRADING_BOT_SETTINGS_CACHE_TIMEOUT,
+            )
         return obj
@@ -3,78 +3,176 @@ Chart Pattern Detection Utilities
 Backend implementation of candlestick pattern detection for trading bot analysis.
 """
 
+import functools
 import logging
 import math
+import operator
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import Any
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Prediction parameters per pattern; patterns not listed use the defaults
+_PATTERN_PARAMS: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+    {
+        "three_white_soldiers": MappingProxyType(
+            {
+                "bullish_gain": (5.0, 15.0),
+                "bullish_loss": (2.0, 5.0),
+                "timeframe": ("3d", "7d", "5d"),
+                "success_rate": 0.70,
+            }
+        ),
+        "morning_doji_star": MappingProxyType(
+            {
+                "bullish_gain": (4.0, 12.0),
+                "bullish_loss": (1.5, 4.0),
+                "timeframe": ("3d", "7d", "5d"),
+                "success_rate": 0.68,
+            }
+        ),
+        "head_and_shoulders": MappingProxyType(
+            {
+                "bearish_gain": (3.0, 10.0),
+                "bearish_loss": (2.0, 6.0),
+                "timeframe": ("5d", "14d", "10d"),
+                "success_rate": 0.65,
+            }
+        ),
+        "double_top": MappingProxyType(
+            {
+                "bearish_gain": (3.0, 10.0),
+                "bearish_loss": (2.0, 6.0),
+                "timeframe": ("5d", "14d", "10d"),
+                "success_rate": 0.63,
+            }
+        ),
+        "double_bottom": MappingProxyType(
+            {
+                "bullish_gain": (4.0, 12.0),
+                "bullish_loss": (1.5, 4.0),
+                "timeframe": ("3d", "10d", "7d"),
+                "success_rate": 0.66,
+            }
+        ),
+        "trending_regime": MappingProxyType(
+            {
+                "bullish_gain": (5.0, 20.0),
+                "bullish_loss": (2.0, 6.0),
+                "bearish_gain": (5.0, 20.0),
+                "bearish_loss": (2.0, 6.0),
+                "timeframe": ("5d", "21d", "14d"),
+                "success_rate": 0.68,
+            }
+        ),
+        "ranging_regime": MappingProxyType(
+            {
+                "bullish_gain": (2.0, 8.0),
+                "bullish_loss": (1.0, 3.0),
+                "bearish_gain": (2.0, 8.0),
+                "bearish_loss": (1.0, 3.0),
+                "timeframe": ("3d", "14d", "7d"),
+                "success_rate": 0.55,
+            }
+        ),
+        "volatile_regime": MappingProxyType(
+            {
+                "bullish_gain": (3.0, 15.0),
+                "bullish_loss": (2.0, 8.0),
+                "bearish_gain": (3.0, 15.0),
+                "bearish_loss": (2.0, 8.0),
+                "timeframe": ("1d", "7d", "3d"),
+                "success_rate": 0.50,
+            }
+        ),
+        "regime_transition": MappingProxyType(
+            {
+                "bullish_gain": (4.0, 15.0),
+                "bullish_loss": (2.0, 6.0),
+                "bearish_gain": (4.0, 15.0),
+                "bearish_loss": (2.0, 6.0),
+                "timeframe": ("3d", "14d", "7d"),
+                "success_rate": 0.60,
+            }
+        ),
+    }
+)
+
+_DEFAULT_PARAMS: Mapping[str, Any] = MappingProxyType(
+    {
+        "bullish_gain": (3.0, 10.0),
+        "bullish_loss": (1.5, 4.0),
+        "bearish_gain": (3.0, 10.0),
+        "bearish_loss": (2.0, 6.0),
+        "timeframe": ("3d", "7d", "5d"),
+        "success_rate": 0.60,
+    }
+)
+
 
-def to_number(value: Any) -> float | None:
+def to_number(value: Any, _isinf=math.isinf) -> float | None:
     """Convert a value to a number."""
     if value is None:
         return None
-    if isinstance(value, int | float):
+    # float() handles int, float, str and Decimal; NaN is the only value != itself
+    try:
         num = float(value)
-        return num if not (math.isnan(num) or math.isinf(num)) else None
-    if isinstance(value, str):
-        try:
-            num = float(value)
-        except (ValueError, TypeError):
-            return None
-        else:
-            return num if not (math.isnan(num) or math.isinf(num)) else None
-    # Handle Decimal type
-    if hasattr(value, "__float__"):
-        try:
-            num = float(value)
-            return num if not (math.isnan(num) or math.isinf(num)) else None
-        except (ValueError, TypeError):
-            return None
-    return None
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return None if num != num or _isinf(num) else num  # noqa: PLR0124
 
 
+@dataclass(slots=True, frozen=True)
 class Candlestick:
     """Represents a single candlestick."""
 
-    def __init__(
-        self, open_price: float, high: float, low: float, close: float, index: int
-    ):
-        self.open = open_price
-        self.high = high
-        self.low = low
-        self.close = close
-        self.index = index
-
-    @property
-    def is_bullish(self) -> bool:
-        """Check if candle is bullish (close > open)."""
-        return self.close > self.open
-
-    @property
-    def body_size(self) -> float:
-        """Get body size."""
-        return abs(self.close - self.open)
-
-    @property
-    def upper_wick(self) -> float:
-        """Get upper wick size."""
-        return self.high - max(self.open, self.close)
-
-    @property
-    def lower_wick(self) -> float:
-        """Get lower wick size."""
-        return min(self.open, self.close) - self.low
-
-    @property
-    def total_range(self) -> float:
-        """Get total range (high - low)."""
-        return self.high - self.low if self.high > self.low else 0.0
+    open: float
+    high: float
+    low: float
+    close: float
+    index: int
+    # Derived from the prices once, at construction
+    is_bullish: bool = field(init=False)  # close > open
+    body_size: float = field(init=False)
+    upper_wick: float = field(init=False)
+    lower_wick: float = field(init=False)
+    total_range: float = field(init=False)  # high - low, or 0.0 if inverted
+
+    def __post_init__(self):
+        object.__setattr__(self, "is_bullish", self.close > self.open)
+        object.__setattr__(self, "body_size", abs(self.close - self.open))
+        object.__setattr__(self, "upper_wick", self.high - max(self.open, self.close))
+        object.__setattr__(self, "lower_wick", min(self.open, self.close) - self.low)
+        object.__setattr__(
+            self,
+            "total_range",
+            self.high - self.low if self.high > self.low else 0.0,
+        )
 
 
 class PatternMatch:
     """Represents a detected pattern match."""
 
+    __slots__ = (
+        "_description",
+        "candles",
+        "confidence",
+        "consequences",
+        "gain_probability",
+        "index",
+        "loss_probability",
+        "pattern",
+        "pattern_name",
+        "possible_gain",
+        "possible_loss",
+        "signal",
+        "timeframe_prediction",
+    )
+
     def __init__(
         self,
         pattern: str,
@@ -90,6 +188,7 @@ class PatternMatch:
         loss_probability: float | None = None,
         timeframe_prediction: dict | None = None,
         consequences: dict | None = None,
+        description_args: tuple | None = None,
     ):
         self.pattern = pattern
         self.pattern_name = pattern_name
@@ -97,7 +196,11 @@ class PatternMatch:
         self.candles = candles
         self.signal = signal  # "bullish", "bearish", or "neutral"
         self.confidence = confidence  # 0.0 to 1.0
-        self.description = description
+        # With description_args the description is a str.format template,
+        # filled in the first time it is read
+        self._description = (
+            description if description_args is None else (description, description_args)
+        )
         self.possible_gain = possible_gain
         self.possible_loss = possible_loss
         self.gain_probability = gain_probability
@@ -105,26 +208,32 @@ class PatternMatch:
         self.timeframe_prediction = timeframe_prediction or {}
         self.consequences = consequences or {}
 
+    @property
+    def description(self) -> str:
+        """Human-readable description of the match."""
+        description = self._description
+        if type(description) is tuple:
+            template, args = description
+            description = self._description = template.format(*args)
+        return description
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._description = value
+
     def to_dict(self) -> dict:
         """Convert to dictionary."""
-        result = {
-            "pattern": self.pattern,
-            "pattern_name": self.pattern_name,
-            "index": self.index,
-            "candles": self.candles,
-            "signal": self.signal,
-            "confidence": self.confidence,
-            "description": self.description,
-        }
+        result = dict(zip(_MATCH_FIELDS, _get_match_fields(self), strict=True))
         # Add prediction fields if they exist
-        if self.possible_gain is not None:
-            result["possible_gain"] = self.possible_gain
-        if self.possible_loss is not None:
-            result["possible_loss"] = self.possible_loss
-        if self.gain_probability is not None:
-            result["gain_probability"] = self.gain_probability
-        if self.loss_probability is not None:
-            result["loss_probability"] = self.loss_probability
+        result.update(
+            {
+                field: value
+                for field, value in zip(
+                    _PREDICTION_FIELDS, _get_prediction_fields(self), strict=True
+                )
+                if value is not None
+            }
+        )
         if self.timeframe_prediction:
             result["timeframe_prediction"] = self.timeframe_prediction
         if self.consequences:
@@ -132,165 +241,154 @@ class PatternMatch:
         return result
 
 
-def _calculate_pattern_predictions(
-    pattern_type: str,
-    signal: str,
-    confidence: float,
-    price_data: list[dict] | None = None,
-) -> dict:
+# Field order of PatternMatch.to_dict, read in one call per match
+_MATCH_FIELDS = (
+    "pattern",
+    "pattern_name",
+    "index",
+    "candles",
+    "signal",
+    "confidence",
+    "description",
+)
+_PREDICTION_FIELDS = (
+    "possible_gain",
+    "possible_loss",
+    "gain_probability",
+    "loss_probability",
+)
+_get_match_fields = operator.attrgetter(*_MATCH_FIELDS)
+_get_prediction_fields = operator.attrgetter(*_PREDICTION_FIELDS)
+
+# Signal names and description labels indexed by signal code: 1 is bullish,
+# -1 is bearish (the last entry) and 0 is neutral. Detectors work with the
+# codes and only look up the strings when building a PatternMatch.
+_SIGNALS = ("neutral", "bullish", "bearish")
+_SIGNAL_LABELS = ("Neutral", "Bullish", "Bearish")
+
+
+@functools.lru_cache(maxsize=256)
+def _calculate_pattern_predictions_core(
+    pattern_type: str, signal: str, confidence: float
+) -> tuple:
     """
-    Calculate predictions for pattern signals.
+    Calculate the rounded prediction values for a pattern signal.
+
+    Cached because detectors emit the same pattern, signal and confidence for
+    many matches.
 
     Args:
         pattern_type: Type of pattern (e.g., 'three_white_soldiers')
         signal: Signal type ('bullish', 'bearish', 'neutral')
         confidence: Pattern confidence (0-1)
-        price_data: Optional price data for calculating targets
 
     Returns:
-        Dictionary with prediction fields
+        Tuple of (possible_gain, possible_loss, gain_probability,
+        loss_probability, timeframe, best_case, base_case, worst_case), where
+        timeframe is (min, max, expected, confidence) and each case is
+        (amount, probability, timeframe); empty for neutral signals
     """
-    predictions: dict = {}
-
-    # Pattern-specific parameters
-    pattern_params: dict[str, dict] = {
-        "three_white_soldiers": {
-            "bullish_gain": (5.0, 15.0),
-            "bullish_loss": (2.0, 5.0),
-            "timeframe": ("3d", "7d", "5d"),
-            "success_rate": 0.70,
-        },
-        "morning_doji_star": {
-            "bullish_gain": (4.0, 12.0),
-            "bullish_loss": (1.5, 4.0),
-            "timeframe": ("3d", "7d", "5d"),
-            "success_rate": 0.68,
-        },
-        "head_and_shoulders": {
-            "bearish_gain": (3.0, 10.0),
-            "bearish_loss": (2.0, 6.0),
-            "timeframe": ("5d", "14d", "10d"),
-            "success_rate": 0.65,
-        },
-        "double_top": {
-            "bearish_gain": (3.0, 10.0),
-            "bearish_loss": (2.0, 6.0),
-            "timeframe": ("5d", "14d", "10d"),
-            "success_rate": 0.63,
-        },
-        "double_bottom": {
-            "bullish_gain": (4.0, 12.0),
-            "bullish_loss": (1.5, 4.0),
-            "timeframe": ("3d", "10d", "7d"),
-            "success_rate": 0.66,
-        },
-        "trending_regime": {
-            "bullish_gain": (5.0, 20.0),
-            "bullish_loss": (2.0, 6.0),
-            "bearish_gain": (5.0, 20.0),
-            "bearish_loss": (2.0, 6.0),
-            "timeframe": ("5d", "21d", "14d"),
-            "success_rate": 0.68,
-        },
-        "ranging_regime": {
-            "bullish_gain": (2.0, 8.0),
-            "bullish_loss": (1.0, 3.0),
-            "bearish_gain": (2.0, 8.0),
-            "bearish_loss": (1.0, 3.0),
-            "timeframe": ("3d", "14d", "7d"),
-            "success_rate": 0.55,
-        },
-        "volatile_regime": {
-            "bullish_gain": (3.0, 15.0),
-            "bullish_loss": (2.0, 8.0),
-            "bearish_gain": (3.0, 15.0),
-            "bearish_loss": (2.0, 8.0),
-            "timeframe": ("1d", "7d", "3d"),
-            "success_rate": 0.50,
-        },
-        "regime_transition": {
-            "bullish_gain": (4.0, 15.0),
-            "bullish_loss": (2.0, 6.0),
-            "bearish_gain": (4.0, 15.0),
-            "bearish_loss": (2.0, 6.0),
-            "timeframe": ("3d", "14d", "7d"),
-            "success_rate": 0.60,
-        },
-    }
-
-    # Get default parameters
-    default_params = {
-        "bullish_gain": (3.0, 10.0),
-        "bullish_loss": (1.5, 4.0),
-        "bearish_gain": (3.0, 10.0),
-        "bearish_loss": (2.0, 6.0),
-        "timeframe": ("3d", "7d", "5d"),
-        "success_rate": 0.60,
-    }
-
-    params = pattern_params.get(pattern_type, default_params)
+    if signal not in {"bullish", "bearish"}:
+        return ()
 
-    if signal in ["bullish", "bearish"]:
-        # Determine gain/loss ranges
-        if signal == "bullish":
-            gain_range = params.get("bullish_gain", default_params["bullish_gain"])
-            loss_range = params.get("bullish_loss", default_params["bullish_loss"])
-        else:
-            gain_range = params.get("bearish_gain", default_params["bearish_gain"])
-            loss_range = params.get("bearish_loss", default_params["bearish_loss"])
+    params = _PATTERN_PARAMS.get(pattern_type, _DEFAULT_PARAMS)
 
-        # Calculate possible gain/loss scaled by confidence
-        possible_gain = gain_range[0] + (gain_range[1] - gain_range[0]) * confidence
-        possible_loss = loss_range[0] + (loss_range[1] - loss_range[0]) * (
-            1.0 - confidence
-        )
-
-        predictions["possible_gain"] = round(possible_gain, 2)
-        predictions["possible_loss"] = round(possible_loss, 2)
-
-        # Calculate probabilities
-        success_rate = params.get("success_rate", default_params["success_rate"])
-        gain_probability = success_rate * confidence
-        loss_probability = (1.0 - success_rate) * (1.0 - confidence)
+    # Determine gain/loss ranges
+    if signal == "bullish":
+        gain_range = params.get("bullish_gain", _DEFAULT_PARAMS["bullish_gain"])
+        loss_range = params.get("bullish_loss", _DEFAULT_PARAMS["bullish_loss"])
+    else:
+        gain_range = params.get("bearish_gain", _DEFAULT_PARAMS["bearish_gain"])
+        loss_range = params.get("bearish_loss", _DEFAULT_PARAMS["bearish_loss"])
+
+    # Calculate possible gain/loss scaled by confidence
+    possible_gain = gain_range[0] + (gain_range[1] - gain_range[0]) * confidence
+    possible_loss = loss_range[0] + (loss_range[1] - loss_range[0]) * (1.0 - confidence)
+
+    # Calculate probabilities
+    success_rate = params.get("success_rate", _DEFAULT_PARAMS["success_rate"])
+    gain_probability = success_rate * confidence
+    loss_probability = (1.0 - success_rate) * (1.0 - confidence)
+
+    # Timeframe prediction
+    tf_min, tf_max, tf_expected = params.get("timeframe", _DEFAULT_PARAMS["timeframe"])
+
+    # Scenario analysis
+    best_gain = gain_range[1] * confidence
+    base_gain = possible_gain
+    worst_loss = -loss_range[1] * (1.0 - confidence)
+
+    return (
+        round(possible_gain, 2),
+        round(possible_loss, 2),
+        round(min(0.95, gain_probability), 4),
+        round(min(0.95, loss_probability), 4),
+        (tf_min, tf_max, tf_expected, round(confidence, 4)),
+        (round(best_gain, 2), round(gain_probability * 0.8, 4), tf_min),
+        (round(base_gain, 2), round(gain_probability, 4), tf_expected),
+        (round(abs(worst_loss), 2), round(loss_probability, 4), tf_max),
+    )
 
-        predictions["gain_probability"] = round(min(0.95, gain_probability), 4)
-        predictions["loss_probability"] = round(min(0.95, loss_probability), 4)
 
-        # Timeframe prediction
-        tf_min, tf_max, tf_expected = params.get(
-            "timeframe", default_params["timeframe"]
-        )
-        predictions["timeframe_prediction"] = {
-            "min_timeframe": tf_min,
-            "max_timeframe": tf_max,
-            "expected_timeframe": tf_expected,
-            "timeframe_confidence": round(confidence, 4),
-        }
+def _calculate_pattern_predictions(
+    pattern_type: str, signal: str, confidence: float
+) -> dict:
+    """
+    Calculate predictions for pattern signals.
 
-        # Scenario analysis
-        best_gain = gain_range[1] * confidence
-        base_gain = possible_gain
-        worst_loss = -loss_range[1] * (1.0 - confidence)
+    Args:
+        pattern_type: Type of pattern (e.g., 'three_white_soldiers')
+        signal: Signal type ('bullish', 'bearish', 'neutral')
+        confidence: Pattern confidence (0-1)
 
-        predictions["consequences"] = {
+    Returns:
+        Dictionary with prediction fields
+    """
+    values = _calculate_pattern_predictions_core(pattern_type, signal, confidence)
+    if not values:
+        return {}
+
+    (
+        possible_gain,
+        possible_loss,
+        gain_probability,
+        loss_probability,
+        timeframe,
+        best_case,
+        base_case,
+        worst_case,
+    ) = values
+
+    # Build fresh dicts so callers never share the cached values
+    return {
+        "possible_gain": possible_gain,
+        "possible_loss": possible_loss,
+        "gain_probability": gain_probability,
+        "loss_probability": loss_probability,
+        "timeframe_prediction": {
+            "min_timeframe": timeframe[0],
+            "max_timeframe": timeframe[1],
+            "expected_timeframe": timeframe[2],
+            "timeframe_confidence": timeframe[3],
+        },
+        "consequences": {
             "best_case": {
-                "gain": round(best_gain, 2),
-                "probability": round(gain_probability * 0.8, 4),
-                "timeframe": tf_min,
+                "gain": best_case[0],
+                "probability": best_case[1],
+                "timeframe": best_case[2],
             },
             "base_case": {
-                "gain": round(base_gain, 2),
-                "probability": round(gain_probability, 4),
-                "timeframe": tf_expected,
+                "gain": base_case[0],
+                "probability": base_case[1],
+                "timeframe": base_case[2],
             },
             "worst_case": {
-                "loss": round(abs(worst_loss), 2),
-                "probability": round(loss_probability, 4),
-                "timeframe": tf_max,
+                "loss": worst_case[0],
+                "probability": worst_case[1],
+                "timeframe": worst_case[2],
             },
-        }
-
-    return predictions
+        },
+    }
 
 
 def to_candlestick(data: dict, index: int) -> Candlestick | None:
@@ -306,48 +404,328 @@ def to_candlestick(data: dict, index: int) -> Candlestick | None:
     return Candlestick(open_price, high, low, close, index)
 
 
-def detect_three_white_soldiers(data: list[dict]) -> list[PatternMatch]:
+def _fast_num(value: Any, default: float = math.nan) -> float:
+    """Cast a value to float, returning ``default`` if it is missing or not finite."""
+    try:
+        num = float(value)
+    except (TypeError, ValueError, OverflowError):
+        return default
+    return num if math.isfinite(num) else default
+
+
+def _to_ohlc_arrays(data: list[dict]):
     """
-    Detect Three White Soldiers pattern (bullish reversal).
+    Convert price data to open, high, low and close arrays in a single pass.
 
-    Three consecutive bullish candles, each closing higher than the previous.
+    Missing, zero or invalid open/high/low values fall back to the close, as in
+    ``to_candlestick``; bars without a valid close are NaN in every array.
+
+    Args:
+        data: List of price data dictionaries
+
+    Returns:
+        Tuple of (open, high, low, close) float64 arrays
     """
-    matches: list[PatternMatch] = []
 
-    for i in range(2, len(data)):
-        c1 = to_candlestick(data[i - 2], i - 2)
-        c2 = to_candlestick(data[i - 1], i - 1)
-        c3 = to_candlestick(data[i], i)
+    def parse_rows():
+        for row in data:
+            close = _fast_num(row.get("close_price"))
+            if math.isnan(close):
+                yield close, close, close, close
+            else:
+                yield (
+                    _fast_num(row.get("open_price"), close) or close,
+                    _fast_num(row.get("high_price"), close) or close,
+                    _fast_num(row.get("low_price"), close) or close,
+                    close,
+                )
 
-        if not (c1 and c2 and c3):
-            continue
+    # One (n, 4) buffer filled straight from the parsed tuples, then split
+    # into contiguous columns
+    rows = np.fromiter(parse_rows(), dtype=(np.float64, 4), count=len(data))
+    opens, highs, lows, closes = rows.T.copy()
+    return opens, highs, lows, closes
 
-        # All three candles should be bullish
-        if not (c1.is_bullish and c2.is_bullish and c3.is_bullish):
-            continue
 
-        # Each candle should close higher than the previous
-        if not (c2.close > c1.close and c3.close > c2.close):
-            continue
+def _find_pivots(highs, lows):
+    """
+    Find local peaks in the highs and local troughs in the lows.
 
-        # Each candle should open within the previous candle's body
-        if not (c2.open > c1.open and c3.open > c2.open):
-            continue
+    A bar is a peak when its high is above both neighbours' highs, and a trough
+    when its low is below both neighbours' lows; the first and last bars are
+    never pivots.
+
+    Args:
+        highs: Float array of high prices
+        lows: Float array of low prices
+
+    Returns:
+        Tuple of (peak_idx, trough_idx, peak_val, trough_val) arrays, with the
+        indices in ascending order
+    """
+
+    is_peak = np.zeros(len(highs), dtype=bool)
+    is_trough = np.zeros(len(lows), dtype=bool)
+    is_peak[1:-1] = (highs[1:-1] > highs[:-2]) & (highs[1:-1] > highs[2:])
+    is_trough[1:-1] = (lows[1:-1] < lows[:-2]) & (lows[1:-1] < lows[2:])
+
+    peak_idx = np.flatnonzero(is_peak)
+    trough_idx = np.flatnonzero(is_trough)
+    return peak_idx, trough_idx, highs[peak_idx], lows[trough_idx]
+
+
+def _pivot_pair_diffs(values, gap: int):
+    """
+    Compute the relative difference between pivots `gap` positions apart.
+
+    Args:
+        values: Float array of pivot prices in index order
+        gap: Distance between the compared pivots (1 for neighbouring pivots)
+
+    Returns:
+        List where element k is |values[k] - values[k + gap]| divided by the
+        larger of the two
+    """
+
+    first, second = values[:-gap], values[gap:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (np.abs(first - second) / np.maximum(first, second)).tolist()
+
+
+def _pivot_windows(pivot_idx, n: int, width: int):
+    """
+    Locate the pivots falling in the `width` bars before each bar.
+
+    Args:
+        pivot_idx: Ascending array of pivot bar indices
+        n: Number of bars in the series
+        width: Number of bars looked back from each bar
+
+    Returns:
+        Tuple of (starts, ends) lists where pivot_idx[starts[k]:ends[k]] are
+        the pivots in bars [i - width, i) for i = width + k
+    """
+
+    bars = np.arange(width, n)
+    return (
+        np.searchsorted(pivot_idx, bars - width).tolist(),
+        np.searchsorted(pivot_idx, bars).tolist(),
+    )
+
+
+def _bar_features(opens, highs, lows, closes):
+    """
+    Compute the candle properties of every bar as arrays.
 
+    Args:
+        opens: Float array of open prices
+        highs: Float array of high prices
+        lows: Float array of low prices
+        closes: Float array of close prices
+
+    Returns:
+        Tuple of (valid, bullish, body, total_range, upper_wick, lower_wick,
+        marubozu) arrays matching the Candlestick properties for each bar with
+        a valid close; marubozu marks valid bars with no wick beyond 0.01 on
+        either side
+    """
+
+    valid = ~np.isnan(closes)
+    bullish = closes > opens
+    body = np.abs(closes - opens)
+    total_range = np.where(highs > lows, highs - lows, 0.0)
+    upper_wick = highs - np.maximum(opens, closes)
+    lower_wick = np.minimum(opens, closes) - lows
+    marubozu = _all_of(valid, upper_wick <= 0.01, lower_wick <= 0.01)
+    return valid, bullish, body, total_range, upper_wick, lower_wick, marubozu
+
+
+def _all_of(first, *masks):
+    """
+    AND equally long boolean arrays together into a new array.
+
+    Chaining ``&`` allocates a temporary array per operator; this fills a
+    single result buffer in place instead.
+    """
+
+    result = np.array(first, dtype=bool)
+    for mask in masks:
+        np.logical_and(result, mask, out=result)
+    return result
+
+
+def _valid_anchors(closes, width: int) -> list[int]:
+    """
+    Find the bars that close a window of `width` consecutive valid candles.
+
+    Args:
+        closes: Float array of close prices (NaN marks an unusable bar)
+        width: Number of candles the pattern spans
+
+    Returns:
+        Indices i for which bars i - width + 1 through i all have a close
+    """
+
+    n = len(closes)
+    if n < width:
+        return []
+
+    # open/high/low fall back to the close, so a finite close means a usable bar
+    valid = ~np.isnan(closes)
+    anchors = valid[width - 1 :].copy()
+    for offset in range(1, width):
+        anchors &= valid[width - 1 - offset : n - offset]
+    return (np.flatnonzero(anchors) + width - 1).tolist()
+
+
+def _scan_three_bar(opens, highs, lows, closes, features=None) -> dict[str, list[int]]:
+    """
+    Find every three-bar candlestick pattern in a single pass over the series.
+
+    The candle features are computed once and shared by all the patterns, so
+    the three-bar detectors only have to turn the anchors into matches.
+
+    Args:
+        opens: Float array of open prices
+        highs: Float array of high prices
+        lows: Float array of low prices
+        closes: Float array of close prices
+        features: Precomputed result of _bar_features for these prices
+
+    Returns:
+        Dict mapping "three_white_soldiers", "morning_doji_star",
+        "morning_star", "abandoned_baby", "tri_star", "advance_block" and
+        "stick_sandwich" to the indices of the last candle of each match
+    """
+
+    if features is None:
+        features = _bar_features(opens, highs, lows, closes)
+    valid, bullish, body, total_range, upper_wick, lower_wick, _ = features
+
+    # Share of each candle's range taken by its wicks; bars without a range
+    # get 1.0 so they never pass the wick filter
+    wicks = upper_wick + lower_wick
+    wick_ratio = np.divide(
+        wicks, total_range, out=np.ones_like(wicks), where=total_range > 0
+    )
+    small_wicks = wick_ratio <= 0.4
+    # A doji's body is at most 10% of its range
+    is_doji = body <= total_range * 0.1
+    # Body as a share of the range; bars without a range get 1.0 and never
+    # count as a star
+    body_ratio = np.divide(
+        body, total_range, out=np.ones_like(body), where=total_range > 0
+    )
+
+    # Candles i - 2, i - 1 and i for every anchor i >= 2
+    o1, o2, o3 = opens[:-2], opens[1:-1], opens[2:]
+    c1, c2, c3 = closes[:-2], closes[1:-1], closes[2:]
+    # The masks are combined with _all_of to keep the number of temporary
+    # arrays down on long histories
+    valid3 = _all_of(valid[:-2], valid[1:-1], valid[2:])
+    # Bearish candle, any middle candle, then bullish candle
+    bear_then_bull = _all_of(valid3, ~bullish[:-2], bullish[2:])
+    # Third candle closes above the first candle's midpoint
+    recovers_half = c3 > (o1 + c1) / 2.0
+    # Bearish candle, doji, then bullish candle
+    star = _all_of(bear_then_bull, is_doji[1:-1])
+
+    # All three candles bullish, each closing higher than the previous
+    rising_bulls = _all_of(
+        valid3, bullish[:-2], bullish[1:-1], bullish[2:], c2 > c1, c3 > c2
+    )
+
+    three_white_soldiers = _all_of(
+        rising_bulls,
+        # Each candle should open within the previous candle's body
+        o2 > o1,
+        o3 > o2,
         # All candles should have relatively small wicks
-        if c1.total_range == 0 or c2.total_range == 0 or c3.total_range == 0:
-            continue
+        small_wicks[:-2],
+        small_wicks[1:-1],
+        small_wicks[2:],
+    )
+    morning_doji_star = _all_of(star, recovers_half)
+    morning_star = _all_of(
+        bear_then_bull,
+        recovers_half,
+        # Second candle should have a small body (can be bullish or bearish)
+        body_ratio[1:-1] <= 0.3,
+        # There should be a gap between first and second candle
+        lows[1:-1] < c1,
+    )
+    # The doji should gap away from both of its neighbours
+    abandoned_baby = _all_of(star, highs[1:-1] < lows[:-2], lows[2:] > highs[1:-1])
+    # Three dojis with a real range, each gapping above the previous one
+    ranged_doji = _all_of(is_doji, total_range > 0)
+    tri_star = _all_of(
+        valid3,
+        ranged_doji[:-2],
+        ranged_doji[1:-1],
+        ranged_doji[2:],
+        lows[1:-1] > highs[:-2],
+        lows[2:] > highs[1:-1],
+    )
+
+    advance_block = _all_of(
+        rising_bulls,
+        # But the bodies should be getting smaller (weakening momentum)
+        body[1:-1] < body[:-2],
+        body[2:] < body[1:-1],
+        # Upper wicks should be getting longer
+        upper_wick[1:-1] > upper_wick[:-2],
+        upper_wick[2:] > upper_wick[1:-1],
+    )
+
+    # Relative gap between the outer closes; 1.0 when it cannot be measured
+    outer_high = np.maximum(c1, c3)
+    close_diff = np.divide(
+        np.abs(c1 - c3), outer_high, out=np.ones_like(c1), where=outer_high > 0
+    )
+    stick_sandwich = _all_of(
+        valid3,
+        # First and third candles should be bearish with similar closes
+        ~bullish[:-2],
+        ~bullish[2:],
+        close_diff <= 0.02,  # Closes should be within 2%
+        # Second candle should be bullish and close above both first and third
+        bullish[1:-1],
+        c2 > c1,
+        c2 > c3,
+    )
+
+    return {
+        "three_white_soldiers": (np.flatnonzero(three_white_soldiers) + 2).tolist(),
+        "morning_doji_star": (np.flatnonzero(morning_doji_star) + 2).tolist(),
+        "morning_star": (np.flatnonzero(morning_star) + 2).tolist(),
+        "abandoned_baby": (np.flatnonzero(abandoned_baby) + 2).tolist(),
+        "tri_star": (np.flatnonzero(tri_star) + 2).tolist(),
+        "advance_block": (np.flatnonzero(advance_block) + 2).tolist(),
+        "stick_sandwich": (np.flatnonzero(stick_sandwich) + 2).tolist(),
+    }
 
-        wick_ratio1 = (c1.upper_wick + c1.lower_wick) / c1.total_range
-        wick_ratio2 = (c2.upper_wick + c2.lower_wick) / c2.total_range
-        wick_ratio3 = (c3.upper_wick + c3.lower_wick) / c3.total_range
 
-        if wick_ratio1 > 0.4 or wick_ratio2 > 0.4 or wick_ratio3 > 0.4:
-            continue
+def detect_three_white_soldiers(
+    data: list[dict], ohlc=None, three_bar=None
+) -> list[PatternMatch]:
+    """
+    Detect Three White Soldiers pattern (bullish reversal).
+
+    Three consecutive bullish candles, each closing higher than the previous.
+    """
+    matches: list[PatternMatch] = []
 
+    if len(data) < 3:
+        return matches
+
+    if three_bar is None:
+        ohlc = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+        three_bar = _scan_three_bar(*ohlc)
+
+    for i in three_bar["three_white_soldiers"]:
         # Calculate predictions for this pattern
         predictions = _calculate_pattern_predictions(
-            "three_white_soldiers", "bullish", 0.8, data[max(0, i - 10) : i + 1]
+            "three_white_soldiers", "bullish", 0.8
         )
 
         matches.append(
@@ -371,7 +749,9 @@ def detect_three_white_soldiers(data: list[dict]) -> list[PatternMatch]:
     return matches
 
 
-def detect_morning_doji_star(data: list[dict]) -> list[PatternMatch]:
+def detect_morning_doji_star(
+    data: list[dict], ohlc=None, three_bar=None
+) -> list[PatternMatch]:
     """
     Detect Morning Doji Star pattern (bullish reversal).
 
@@ -379,47 +759,30 @@ def detect_morning_doji_star(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(2, len(data)):
-        c1 = to_candlestick(data[i - 2], i - 2)
-        c2 = to_candlestick(data[i - 1], i - 1)
-        c3 = to_candlestick(data[i], i)
-
-        if not (c1 and c2 and c3):
-            continue
-
-        # First candle should be bearish
-        if c1.is_bullish:
-            continue
-
-        # Second candle should be a doji (small body)
-        doji_threshold = c2.total_range * 0.1
-        if c2.body_size > doji_threshold:
-            continue
-
-        # Third candle should be bullish and close above first candle's midpoint
-        if not c3.is_bullish:
-            continue
-
-        midpoint = (c1.open + c1.close) / 2.0
-        if c3.close <= midpoint:
-            continue
+    if len(data) < 3:
+        return matches
 
-        matches.append(
-            PatternMatch(
-                pattern="morning_doji_star",
-                pattern_name="Morning Doji Star",
-                index=i,
-                candles=3,
-                signal="bullish",
-                confidence=0.75,
-                description="Bullish reversal pattern with a bearish candle, doji, and bullish candle.",
-            )
+    if three_bar is None:
+        ohlc = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+        three_bar = _scan_three_bar(*ohlc)
+
+    matches.extend(
+        PatternMatch(
+            pattern="morning_doji_star",
+            pattern_name="Morning Doji Star",
+            index=i,
+            candles=3,
+            signal="bullish",
+            confidence=0.75,
+            description="Bullish reversal pattern with a bearish candle, doji, and bullish candle.",
         )
+        for i in three_bar["morning_doji_star"]
+    )
 
     return matches
 
 
-def detect_engulfing(data: list[dict]) -> list[PatternMatch]:
+def detect_engulfing(data: list[dict], ohlc=None, features=None) -> list[PatternMatch]:
     """
     Detect Engulfing pattern (bullish or bearish).
 
@@ -428,46 +791,53 @@ def detect_engulfing(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(1, len(data)):
-        c1 = to_candlestick(data[i - 1], i - 1)
-        c2 = to_candlestick(data[i], i)
-
-        if not (c1 and c2):
-            continue
+    if len(data) < 2:
+        return matches
 
-        # Bullish engulfing
-        if (
-            not c1.is_bullish
-            and c2.is_bullish
-            and c2.open < c1.close
-            and c2.close > c1.open
-            and c2.body_size > c1.body_size
-        ):
+    opens, highs, lows, closes = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    if features is None:
+        features = _bar_features(opens, highs, lows, closes)
+    valid, bullish, body, _, _, _, _ = features
+
+    # Candles i - 1 and i for every anchor i >= 1
+    both_valid = valid[:-1] & valid[1:]
+    larger_body = body[1:] > body[:-1]
+    bullish_engulfing = _all_of(
+        both_valid,
+        ~bullish[:-1],
+        bullish[1:],
+        opens[1:] < closes[:-1],
+        closes[1:] > opens[:-1],
+        larger_body,
+    )
+    bearish_engulfing = _all_of(
+        both_valid,
+        bullish[:-1],
+        ~bullish[1:],
+        opens[1:] > closes[:-1],
+        closes[1:] < opens[:-1],
+        larger_body,
+    )
+
+    for k in np.flatnonzero(bullish_engulfing | bearish_engulfing).tolist():
+        if bullish_engulfing[k]:
             matches.append(
                 PatternMatch(
                     pattern="bullish_engulfing",
                     pattern_name="Bullish Engulfing",
-                    index=i,
+                    index=k + 1,
                     candles=2,
                     signal="bullish",
                     confidence=0.7,
                     description="Bullish reversal pattern. Bearish candle followed by larger bullish candle that engulfs it.",
                 )
             )
-
-        # Bearish engulfing
-        elif (
-            c1.is_bullish
-            and not c2.is_bullish
-            and c2.open > c1.close
-            and c2.close < c1.open
-            and c2.body_size > c1.body_size
-        ):
+        else:
             matches.append(
                 PatternMatch(
                     pattern="bearish_engulfing",
                     pattern_name="Bearish Engulfing",
-                    index=i,
+                    index=k + 1,
                     candles=2,
                     signal="bearish",
                     confidence=0.7,
@@ -478,7 +848,9 @@ def detect_engulfing(data: list[dict]) -> list[PatternMatch]:
     return matches
 
 
-def detect_abandoned_baby(data: list[dict]) -> list[PatternMatch]:
+def detect_abandoned_baby(
+    data: list[dict], ohlc=None, three_bar=None
+) -> list[PatternMatch]:
     """
     Detect Abandoned Baby pattern (bullish reversal).
 
@@ -486,50 +858,32 @@ def detect_abandoned_baby(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(2, len(data)):
-        c1 = to_candlestick(data[i - 2], i - 2)
-        c2 = to_candlestick(data[i - 1], i - 1)
-        c3 = to_candlestick(data[i], i)
-
-        if not (c1 and c2 and c3):
-            continue
-
-        # First candle should be bearish
-        if c1.is_bullish:
-            continue
-
-        # Second candle should be a doji with gaps
-        doji_threshold = c2.total_range * 0.1
-        if c2.body_size > doji_threshold:
-            continue
-
-        # Check for gaps
-        gap_down = c2.high < c1.low
-        gap_up = c3.low > c2.high
-
-        if not (gap_down and gap_up):
-            continue
-
-        # Third candle should be bullish
-        if not c3.is_bullish:
-            continue
+    if len(data) < 3:
+        return matches
 
-        matches.append(
-            PatternMatch(
-                pattern="abandoned_baby",
-                pattern_name="Abandoned Baby",
-                index=i,
-                candles=3,
-                signal="bullish",
-                confidence=0.85,
-                description="Strong bullish reversal pattern with gaps on both sides of a doji.",
-            )
+    if three_bar is None:
+        ohlc = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+        three_bar = _scan_three_bar(*ohlc)
+
+    matches.extend(
+        PatternMatch(
+            pattern="abandoned_baby",
+            pattern_name="Abandoned Baby",
+            index=i,
+            candles=3,
+            signal="bullish",
+            confidence=0.85,
+            description="Strong bullish reversal pattern with gaps on both sides of a doji.",
         )
+        for i in three_bar["abandoned_baby"]
+    )
 
     return matches
 
 
-def detect_head_and_shoulders(data: list[dict]) -> list[PatternMatch]:
+def detect_head_and_shoulders(
+    data: list[dict], ohlc=None, pivots=None
+) -> list[PatternMatch]:
     """
     Detect Head and Shoulders pattern (bearish reversal).
 
@@ -540,59 +894,69 @@ def detect_head_and_shoulders(data: list[dict]) -> list[PatternMatch]:
     if len(data) < 20:
         return matches
 
-    for i in range(20, len(data)):
+    if pivots is None:
+        _, highs, lows, _ = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+        pivots = _find_pivots(highs, lows)
+    peak_idx, _, peak_val, _ = pivots
+    # Shoulders are two peaks apart, so compare every peak with the one after next
+    shoulder_diffs = _pivot_pair_diffs(peak_val, 2)
+    window_starts, window_ends = _pivot_windows(peak_idx, len(data), 20)
+    peak_bars = peak_idx.tolist()
+    peak_highs = peak_val.tolist()
+
+    # Bars with at least three peaks in their window, with the position of the
+    # left shoulder among the peaks; the matches are built afterwards
+    candidates = [
+        (i, end - 3)
+        for i, start, end in zip(
+            range(20, len(data)), window_starts, window_ends, strict=True
+        )
         # Look for three peaks
-        peaks = []
-        for j in range(i - 20, i):
-            if j > 0 and j < len(data) - 1:
-                high = to_number(data[j].get("high_price"))
-                prev_high = to_number(data[j - 1].get("high_price"))
-                next_high = to_number(data[j + 1].get("high_price"))
-
-                if (
-                    high
-                    and prev_high
-                    and next_high
-                    and high > prev_high
-                    and high > next_high
-                ):
-                    peaks.append((j, high))
-
-        if len(peaks) >= 3:
-            # Check if peaks form head and shoulders pattern
-            peaks = sorted(peaks, key=lambda x: x[0])[-3:]  # Last 3 peaks
-            left_shoulder_idx, left_shoulder_high = peaks[0]
-            _, head_high = peaks[1]
-            _, right_shoulder_high = peaks[2]
-
-            # Head should be higher than both shoulders
-            # Shoulders should be at similar levels
-            shoulder_diff = abs(left_shoulder_high - right_shoulder_high) / max(
-                left_shoulder_high, right_shoulder_high
-            )
-            head_above = (
-                head_high > left_shoulder_high and head_high > right_shoulder_high
+        if end - start >= 3
+    ]
+
+    # Consecutive bars mostly see the same last three peaks, so check them
+    # and format the description once per left shoulder
+    shoulders = {}
+    for left_shoulder in dict.fromkeys(left for _, left in candidates):
+        left_shoulder_high, head_high, right_shoulder_high = peak_highs[
+            left_shoulder : left_shoulder + 3
+        ]
+
+        # Head should be higher than both shoulders
+        # Shoulders should be at similar levels
+        shoulder_diff = shoulder_diffs[left_shoulder]
+        head_above = head_high > left_shoulder_high and head_high > right_shoulder_high
+
+        if head_above and shoulder_diff < 0.05:  # Shoulders within 5% of each other
+            # Check for neckline (troughs between peaks)
+            shoulders[left_shoulder] = (
+                peak_bars[left_shoulder],
+                0.75 if shoulder_diff < 0.02 else 0.65,
+                f"Bearish reversal pattern. Head at {head_high:.2f}, shoulders at ~{left_shoulder_high:.2f}",
             )
 
-            if head_above and shoulder_diff < 0.05:  # Shoulders within 5% of each other
-                # Check for neckline (troughs between peaks)
-                confidence = 0.75 if shoulder_diff < 0.02 else 0.65
-                matches.append(
-                    PatternMatch(
-                        pattern="head_and_shoulders",
-                        pattern_name="Head and Shoulders",
-                        index=i,
-                        candles=i - left_shoulder_idx,
-                        signal="bearish",
-                        confidence=confidence,
-                        description=f"Bearish reversal pattern. Head at {head_high:.2f}, shoulders at ~{left_shoulder_high:.2f}",
-                    )
-                )
+    matches.extend(
+        PatternMatch(
+            pattern="head_and_shoulders",
+            pattern_name="Head and Shoulders",
+            index=i,
+            candles=i - left_shoulder_idx,
+            signal="bearish",
+            confidence=confidence,
+            description=description,
+        )
+        for i, (left_shoulder_idx, confidence, description) in (
+            (i, shoulders[left_shoulder])
+            for i, left_shoulder in candidates
+            if left_shoulder in shoulders
+        )
+    )
 
     return matches
 
 
-def detect_double_top(data: list[dict]) -> list[PatternMatch]:
+def detect_double_top(data: list[dict], ohlc=None, pivots=None) -> list[PatternMatch]:
     """
     Detect Double Top pattern (bearish reversal).
 
@@ -603,55 +967,60 @@ def detect_double_top(data: list[dict]) -> list[PatternMatch]:
     if len(data) < 15:
         return matches
 
-    for i in range(15, len(data)):
-        # Look for two peaks
-        peaks = []
-        for j in range(i - 15, i):
-            if j > 0 and j < len(data) - 1:
-                high = to_number(data[j].get("high_price"))
-                prev_high = to_number(data[j - 1].get("high_price"))
-                next_high = to_number(data[j + 1].get("high_price"))
-
-                if (
-                    high
-                    and prev_high
-                    and next_high
-                    and high > prev_high
-                    and high > next_high
-                ):
-                    peaks.append((j, high))
-
-        if len(peaks) >= 2:
-            peaks = sorted(peaks, key=lambda x: x[0])[-2:]  # Last 2 peaks
-            peak1_idx, peak1_high = peaks[0]
-            peak2_idx, peak2_high = peaks[1]
-
-            # Peaks should be at similar levels
-            peak_diff = abs(peak1_high - peak2_high) / max(peak1_high, peak2_high)
-            if peak_diff < 0.03:  # Within 3%
-                # Check for trough between peaks
-                trough = min(
-                    to_number(data[j].get("low_price")) or float("inf")
-                    for j in range(peak1_idx, peak2_idx)
-                )
-                if trough < float("inf"):
-                    confidence = 0.7 if peak_diff < 0.01 else 0.6
-                    matches.append(
-                        PatternMatch(
-                            pattern="double_top",
-                            pattern_name="Double Top",
-                            index=i,
-                            candles=i - peak1_idx,
-                            signal="bearish",
-                            confidence=confidence,
-                            description=f"Bearish reversal pattern. Two peaks at ~{peak1_high:.2f}",
-                        )
-                    )
+    _, highs, lows, _ = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    if pivots is None:
+        pivots = _find_pivots(highs, lows)
+    peak_idx, _, peak_val, _ = pivots
+    peak_diffs = _pivot_pair_diffs(peak_val, 1)
+    window_starts, window_ends = _pivot_windows(peak_idx, len(data), 15)
+    peak_bars = peak_idx.tolist()
+    peak_highs = peak_val.tolist()
+
+    # Bars whose last two peaks are at similar levels, with the position of
+    # the first of those peaks; the matches are built afterwards
+    candidates = [
+        (i, end - 2)
+        for i, start, end in zip(
+            range(15, len(data)), window_starts, window_ends, strict=True
+        )
+        # Look for two peaks, using the last 2 in the window
+        if end - start >= 2 and peak_diffs[end - 2] < 0.03  # Within 3%
+    ]
+
+    # Consecutive bars mostly see the same pair of peaks, so check the trough
+    # and format the description once per pair
+    pairs = {}
+    for first in dict.fromkeys(first for _, first in candidates):
+        peak1_idx, peak2_idx = peak_bars[first : first + 2]
+        # Check for trough between peaks
+        if not math.isnan(np.fmin.reduce(lows[peak1_idx:peak2_idx])):
+            pairs[first] = (
+                peak1_idx,
+                0.7 if peak_diffs[first] < 0.01 else 0.6,
+                f"Bearish reversal pattern. Two peaks at ~{peak_highs[first]:.2f}",
+            )
+
+    matches.extend(
+        PatternMatch(
+            pattern="double_top",
+            pattern_name="Double Top",
+            index=i,
+            candles=i - peak1_idx,
+            signal="bearish",
+            confidence=confidence,
+            description=description,
+        )
+        for i, (peak1_idx, confidence, description) in (
+            (i, pairs[first]) for i, first in candidates if first in pairs
+        )
+    )
 
     return matches
 
 
-def detect_double_bottom(data: list[dict]) -> list[PatternMatch]:
+def detect_double_bottom(
+    data: list[dict], ohlc=None, pivots=None
+) -> list[PatternMatch]:
     """
     Detect Double Bottom pattern (bullish reversal).
 
@@ -662,49 +1031,81 @@ def detect_double_bottom(data: list[dict]) -> list[PatternMatch]:
     if len(data) < 15:
         return matches
 
-    for i in range(15, len(data)):
-        # Look for two troughs
-        troughs = []
-        for j in range(i - 15, i):
-            if j > 0 and j < len(data) - 1:
-                low = to_number(data[j].get("low_price"))
-                prev_low = to_number(data[j - 1].get("low_price"))
-                next_low = to_number(data[j + 1].get("low_price"))
-
-                if low and prev_low and next_low and low < prev_low and low < next_low:
-                    troughs.append((j, low))
-
-        if len(troughs) >= 2:
-            troughs = sorted(troughs, key=lambda x: x[0])[-2:]  # Last 2 troughs
-            trough1_idx, trough1_low = troughs[0]
-            trough2_idx, trough2_low = troughs[1]
-
-            # Troughs should be at similar levels
-            trough_diff = abs(trough1_low - trough2_low) / max(trough1_low, trough2_low)
-            if trough_diff < 0.03:  # Within 3%
-                # Check for peak between troughs
-                peak = max(
-                    to_number(data[j].get("high_price")) or 0.0
-                    for j in range(trough1_idx, trough2_idx)
-                )
-                if peak > 0:
-                    confidence = 0.7 if trough_diff < 0.01 else 0.6
-                    matches.append(
-                        PatternMatch(
-                            pattern="double_bottom",
-                            pattern_name="Double Bottom",
-                            index=i,
-                            candles=i - trough1_idx,
-                            signal="bullish",
-                            confidence=confidence,
-                            description=f"Bullish reversal pattern. Two troughs at ~{trough1_low:.2f}",
-                        )
-                    )
+    _, highs, lows, _ = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    if pivots is None:
+        pivots = _find_pivots(highs, lows)
+    _, trough_idx, _, trough_val = pivots
+    trough_diffs = _pivot_pair_diffs(trough_val, 1)
+    window_starts, window_ends = _pivot_windows(trough_idx, len(data), 15)
+    trough_bars = trough_idx.tolist()
+    trough_lows = trough_val.tolist()
+
+    # Bars whose last two troughs are at similar levels, with the position of
+    # the first of those troughs; the matches are built afterwards
+    candidates = [
+        (i, end - 2)
+        for i, start, end in zip(
+            range(15, len(data)), window_starts, window_ends, strict=True
+        )
+        # Look for two troughs, using the last 2 in the window
+        if end - start >= 2 and trough_diffs[end - 2] < 0.03  # Within 3%
+    ]
+
+    # Consecutive bars mostly see the same pair of troughs, so check the peak
+    # and format the description once per pair
+    pairs = {}
+    for first in dict.fromkeys(first for _, first in candidates):
+        trough1_idx, trough2_idx = trough_bars[first : first + 2]
+        # Check for peak between troughs
+        if not math.isnan(np.fmax.reduce(highs[trough1_idx:trough2_idx])):
+            pairs[first] = (
+                trough1_idx,
+                0.7 if trough_diffs[first] < 0.01 else 0.6,
+                f"Bullish reversal pattern. Two troughs at ~{trough_lows[first]:.2f}",
+            )
+
+    matches.extend(
+        PatternMatch(
+            pattern="double_bottom",
+            pattern_name="Double Bottom",
+            index=i,
+            candles=i - trough1_idx,
+            signal="bullish",
+            confidence=confidence,
+            description=description,
+        )
+        for i, (trough1_idx, confidence, description) in (
+            (i, pairs[first]) for i, first in candidates if first in pairs
+        )
+    )
 
     return matches
 
 
-def detect_flag(data: list[dict]) -> list[PatternMatch]:
+def _rolling_envelope(highs, lows, width: int):
+    """
+    Compute the highest high and lowest low of every `width`-bar window.
+
+    NaN prices are skipped; a window without any valid bar gives NaN.
+
+    Args:
+        highs: Float array of high prices
+        lows: Float array of low prices
+        width: Number of bars in each window
+
+    Returns:
+        Tuple of (window_max, window_min) lists where element k covers bars
+        k through k + width - 1
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    return (
+        np.fmax.reduce(sliding_window_view(highs, width), axis=1).tolist(),
+        np.fmin.reduce(sliding_window_view(lows, width), axis=1).tolist(),
+    )
+
+
+def detect_flag(data: list[dict], ohlc=None) -> list[PatternMatch]:
     """
     Detect Flag pattern (continuation).
 
@@ -715,65 +1116,66 @@ def detect_flag(data: list[dict]) -> list[PatternMatch]:
     if len(data) < 10:
         return matches
 
-    for i in range(10, len(data)):
-        # Look for flagpole (sharp move)
-        flagpole_start = i - 10
-        flagpole_end = i - 5
-        flag_start = i - 5
-        flag_end = i
-
-        flagpole_high = max(
-            to_number(data[j].get("high_price")) or 0.0
-            for j in range(flagpole_start, flagpole_end)
-        )
-        flagpole_low = min(
-            to_number(data[j].get("low_price")) or float("inf")
-            for j in range(flagpole_start, flagpole_end)
+    _, highs, lows, closes = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    # Bars without a valid close are ignored by the window max/min and count
+    # as zero when picking the direction
+    direction_closes = np.nan_to_num(closes, nan=0.0)
+    # The flagpole is the 5-bar window starting at i - 10 and the flag the
+    # 5-bar window starting at i - 5, for every i >= 10
+    n = len(data)
+    rolling_high, rolling_low = (
+        np.asarray(window) for window in _rolling_envelope(highs, lows, 5)
+    )
+    flagpole_high, flagpole_low = rolling_high[: n - 10], rolling_low[: n - 10]
+    flag_high, flag_low = rolling_high[5 : n - 5], rolling_low[5 : n - 5]
+
+    flagpole_size = flagpole_high - flagpole_low
+    flag_size = flag_high - flag_low
+    priced = flag_low > 0
+    flagpole_ratio = np.divide(
+        flagpole_size, flag_low, out=np.zeros_like(flagpole_size), where=priced
+    )
+    flag_ratio = np.divide(
+        flag_size, flag_low, out=np.zeros_like(flag_size), where=priced
+    )
+    significant = flagpole_ratio > 0.05
+    flag_share = np.divide(
+        flag_ratio, flagpole_ratio, out=np.zeros_like(flag_ratio), where=significant
+    )
+    hits = (
+        # Flagpole should be significant, flag smaller and consolidating;
+        # windows without a valid bar have NaN sizes and never match
+        (flagpole_size > 0)
+        & (flag_size > 0)
+        & significant
+        # Flag should be 20-50% of flagpole
+        & (flag_share >= 0.2)
+        & (flag_share <= 0.5)
+    )
+    # Determine direction
+    signal_codes = np.where(direction_closes[10:] > direction_closes[:-10], 1, -1)
+    hit_indices = np.flatnonzero(hits)
+
+    matches.extend(
+        PatternMatch(
+            pattern="flag",
+            pattern_name="Flag",
+            index=k + 10,
+            candles=10,
+            signal=_SIGNALS[code],
+            confidence=0.65,
+            description="{} continuation pattern. Flagpole: {:.2f}, Flag: {:.2f}",
+            description_args=(_SIGNAL_LABELS[code], flagpole_size[k], flag_size[k]),
         )
-        flag_high = max(
-            to_number(data[j].get("high_price")) or 0.0
-            for j in range(flag_start, flag_end)
+        for k, code in zip(
+            hit_indices.tolist(), signal_codes[hit_indices].tolist(), strict=True
         )
-        flag_low = min(
-            to_number(data[j].get("low_price")) or float("inf")
-            for j in range(flag_start, flag_end)
-        )
-
-        if flagpole_low < float("inf") and flag_low < float("inf"):
-            flagpole_size = flagpole_high - flagpole_low
-            flag_size = flag_high - flag_low
-
-            # Flagpole should be significant
-            # Flag should be smaller and consolidating
-            if flagpole_size > 0 and flag_size > 0:
-                flagpole_ratio = flagpole_size / flag_low if flag_low > 0 else 0
-                flag_ratio = flag_size / flag_low if flag_low > 0 else 0
-
-                # Flag should be 20-50% of flagpole
-                if 0.2 <= flag_ratio / flagpole_ratio <= 0.5 and flagpole_ratio > 0.05:
-                    # Determine direction
-                    start_price = (
-                        to_number(data[flagpole_start].get("close_price")) or 0.0
-                    )
-                    end_price = to_number(data[flag_end].get("close_price")) or 0.0
-                    direction = "bullish" if end_price > start_price else "bearish"
-
-                    matches.append(
-                        PatternMatch(
-                            pattern="flag",
-                            pattern_name="Flag",
-                            index=i,
-                            candles=10,
-                            signal=direction,
-                            confidence=0.65,
-                            description=f"{direction.capitalize()} continuation pattern. Flagpole: {flagpole_size:.2f}, Flag: {flag_size:.2f}",
-                        )
-                    )
+    )
 
     return matches
 
 
-def detect_pennant(data: list[dict]) -> list[PatternMatch]:
+def detect_pennant(data: list[dict], ohlc=None) -> list[PatternMatch]:
     """
     Detect Pennant pattern (continuation).
 
@@ -784,84 +1186,106 @@ def detect_pennant(data: list[dict]) -> list[PatternMatch]:
     if len(data) < 10:
         return matches
 
-    for i in range(10, len(data)):
-        # Look for pennant (similar to flag but with converging lines)
-        flagpole_start = i - 10
-        flagpole_end = i - 6
-        pennant_start = i - 6
-        pennant_end = i
+    _, highs, lows, closes = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    # Bars without a valid close are ignored by the window max/min and count
+    # as zero when picking the direction
+    direction_closes = np.nan_to_num(closes, nan=0.0)
+    # The flagpole is the 4-bar window starting at i - 10 and the pennant the
+    # 6-bar window starting at i - 6, for every i >= 10
+    n = len(data)
+    flagpole_high, flagpole_low = (
+        np.asarray(window)[: n - 10] for window in _rolling_envelope(highs, lows, 4)
+    )
+    pennant_high, pennant_low = (
+        np.asarray(window)[4 : n - 6] for window in _rolling_envelope(highs, lows, 6)
+    )
+    first, last, count = (
+        ends[4 : n - 6] for ends in _valid_window_ends(~np.isnan(closes), 6)
+    )
+
+    # Check if highs are decreasing and lows are increasing (converging)
+    converging = (
+        (count >= 3)
+        & ~np.isnan(flagpole_low)
+        & (highs[last] < highs[first])
+        & (lows[last] > lows[first])
+    )
+    flagpole_size = flagpole_high - flagpole_low
+    pennant_size = pennant_high - pennant_low
+    flagpole_ratio = np.divide(
+        flagpole_size,
+        flagpole_low,
+        out=np.zeros_like(flagpole_size),
+        where=flagpole_low > 0,
+    )
+    pennant_ratio = np.divide(
+        pennant_size,
+        pennant_low,
+        out=np.zeros_like(pennant_size),
+        where=pennant_low > 0,
+    )
+    hits = (
+        converging
+        & (flagpole_size > 0)
+        & (pennant_size > 0)
+        # Pennant should be smaller than flagpole
+        & (pennant_ratio < flagpole_ratio * 0.6)
+        & (flagpole_ratio > 0.05)
+    )
+    signal_codes = np.where(direction_closes[10:] > direction_closes[:-10], 1, -1)
+    hit_indices = np.flatnonzero(hits)
+
+    descriptions = {
+        code: f"{_SIGNAL_LABELS[code]} continuation pattern with converging trend lines"
+        for code in (1, -1)
+    }
 
-        flagpole_high = max(
-            to_number(data[j].get("high_price")) or 0.0
-            for j in range(flagpole_start, flagpole_end)
+    matches.extend(
+        PatternMatch(
+            pattern="pennant",
+            pattern_name="Pennant",
+            index=k + 10,
+            candles=10,
+            signal=_SIGNALS[code],
+            confidence=0.7,
+            description=descriptions[code],
         )
-        flagpole_low = min(
-            to_number(data[j].get("low_price")) or float("inf")
-            for j in range(flagpole_start, flagpole_end)
+        for k, code in zip(
+            hit_indices.tolist(), signal_codes[hit_indices].tolist(), strict=True
         )
+    )
 
-        # Check for converging trend in pennant
-        pennant_highs = [
-            to_number(data[j].get("high_price"))
-            for j in range(pennant_start, pennant_end)
-        ]
-        pennant_lows = [
-            to_number(data[j].get("low_price"))
-            for j in range(pennant_start, pennant_end)
-        ]
+    return matches
 
-        valid_highs = [h for h in pennant_highs if h is not None]
-        valid_lows = [
-            low for low in pennant_lows if low is not None and low < float("inf")
-        ]
 
-        if (
-            len(valid_highs) >= 3
-            and len(valid_lows) >= 3
-            and flagpole_low < float("inf")
-        ):
-            # Check if highs are decreasing and lows are increasing (converging)
-            high_trend = valid_highs[-1] < valid_highs[0]
-            low_trend = valid_lows[-1] > valid_lows[0]
-
-            if high_trend and low_trend:
-                flagpole_size = flagpole_high - flagpole_low
-                pennant_size = max(valid_highs) - min(valid_lows)
-
-                if flagpole_size > 0 and pennant_size > 0:
-                    flagpole_ratio = (
-                        flagpole_size / flagpole_low if flagpole_low > 0 else 0
-                    )
-                    pennant_ratio = (
-                        pennant_size / min(valid_lows) if min(valid_lows) > 0 else 0
-                    )
-
-                    # Pennant should be smaller than flagpole
-                    if pennant_ratio < flagpole_ratio * 0.6 and flagpole_ratio > 0.05:
-                        start_price = (
-                            to_number(data[flagpole_start].get("close_price")) or 0.0
-                        )
-                        end_price = (
-                            to_number(data[pennant_end].get("close_price")) or 0.0
-                        )
-                        direction = "bullish" if end_price > start_price else "bearish"
-
-                        matches.append(
-                            PatternMatch(
-                                pattern="pennant",
-                                pattern_name="Pennant",
-                                index=i,
-                                candles=10,
-                                signal=direction,
-                                confidence=0.7,
-                                description=f"{direction.capitalize()} continuation pattern with converging trend lines",
-                            )
-                        )
+def _valid_window_ends(valid, width: int):
+    """
+    Locate the first and last valid bar of every `width`-bar window.
 
-    return matches
+    Args:
+        valid: Boolean array marking the bars with a valid close
+        width: Number of bars in each window
 
+    Returns:
+        Tuple of (first, last, count) arrays where element k describes bars
+        k through k + width - 1; first and last are clipped into range for
+        windows without any valid bar, so check count before using them
+    """
+
+    n = len(valid)
+    positions = np.arange(n)
+    # Nearest valid bar at or before / at or after each position
+    prev_valid = np.maximum.accumulate(np.where(valid, positions, -1))
+    next_valid = np.minimum.accumulate(np.where(valid, positions, n)[::-1])[::-1]
+    valid_so_far = np.concatenate(([0], np.cumsum(valid)))
+
+    first = np.minimum(next_valid[: n - width + 1], n - 1)
+    last = np.maximum(prev_valid[width - 1 :], 0)
+    count = valid_so_far[width:] - valid_so_far[: n - width + 1]
+    return first, last, count
 
-def detect_wedge(data: list[dict]) -> list[PatternMatch]:
+
+def detect_wedge(data: list[dict], ohlc=None) -> list[PatternMatch]:
     """
     Detect Wedge pattern (reversal or continuation).
 
@@ -872,57 +1296,55 @@ def detect_wedge(data: list[dict]) -> list[PatternMatch]:
     if len(data) < 15:
         return matches
 
-    for i in range(15, len(data)):
-        # Look for wedge (converging lines over longer period)
-        wedge_start = i - 15
-        wedge_end = i
-
-        highs = [
-            to_number(data[j].get("high_price")) for j in range(wedge_start, wedge_end)
-        ]
-        lows = [
-            to_number(data[j].get("low_price")) for j in range(wedge_start, wedge_end)
-        ]
-
-        valid_highs = [h for h in highs if h is not None]
-        valid_lows = [low for low in lows if low is not None and low < float("inf")]
-
-        if len(valid_highs) >= 5 and len(valid_lows) >= 5:
-            # Check for converging trend
-            high_trend = valid_highs[-1] < valid_highs[0]
-            low_trend = valid_lows[-1] > valid_lows[0]
-
-            # Both should be converging
-            if high_trend and low_trend:
-                # Determine if rising or falling wedge
-                start_price = to_number(data[wedge_start].get("close_price")) or 0.0
-                end_price = to_number(data[wedge_end].get("close_price")) or 0.0
-
-                if end_price > start_price:
-                    pattern_type = "rising_wedge"
-                    signal = "bearish"  # Rising wedge is bearish
-                    confidence = 0.65
-                else:
-                    pattern_type = "falling_wedge"
-                    signal = "bullish"  # Falling wedge is bullish
-                    confidence = 0.65
-
-                matches.append(
-                    PatternMatch(
-                        pattern=pattern_type,
-                        pattern_name=pattern_type.replace("_", " ").title(),
-                        index=i,
-                        candles=15,
-                        signal=signal,
-                        confidence=confidence,
-                        description=f"{signal.capitalize()} {pattern_type.replace('_', ' ')} pattern with converging trend lines",
-                    )
-                )
+    _, highs, lows, closes = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    # Bars without a valid close count as zero when picking the direction
+    direction_closes = np.nan_to_num(closes, nan=0.0)
+
+    # Windows of bars i - 15 through i - 1 for every i >= 15
+    first, last, count = _valid_window_ends(~np.isnan(closes), 15)
+    first, last, count = first[:-1], last[:-1], count[:-1]
+    # Highs falling and lows rising between the first and last valid bar
+    converging = (
+        (count >= 5) & (highs[last] < highs[first]) & (lows[last] > lows[first])
+    )
+    # Compare the close at the start of the wedge with the current close
+    rising = direction_closes[15:] > direction_closes[:-15]
+
+    # (pattern, name, signal, description) for each kind of wedge
+    rising_wedge = (
+        "rising_wedge",
+        "Rising Wedge",
+        "bearish",  # Rising wedge is bearish
+        "Bearish rising wedge pattern with converging trend lines",
+    )
+    falling_wedge = (
+        "falling_wedge",
+        "Falling Wedge",
+        "bullish",  # Falling wedge is bullish
+        "Bullish falling wedge pattern with converging trend lines",
+    )
+
+    # Determine if rising or falling wedge
+    matches.extend(
+        PatternMatch(
+            pattern=pattern_type,
+            pattern_name=pattern_name,
+            index=k + 15,
+            candles=15,
+            signal=signal,
+            confidence=0.65,
+            description=description,
+        )
+        for k, (pattern_type, pattern_name, signal, description) in (
+            (k, rising_wedge if rising[k] else falling_wedge)
+            for k in np.flatnonzero(converging).tolist()
+        )
+    )
 
     return matches
 
 
-def detect_tri_star(data: list[dict]) -> list[PatternMatch]:
+def detect_tri_star(data: list[dict], ohlc=None, three_bar=None) -> list[PatternMatch]:
     """
     Detect Tri Star pattern (neutral reversal).
 
@@ -930,49 +1352,34 @@ def detect_tri_star(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(2, len(data)):
-        c1 = to_candlestick(data[i - 2], i - 2)
-        c2 = to_candlestick(data[i - 1], i - 1)
-        c3 = to_candlestick(data[i], i)
-
-        if not (c1 and c2 and c3):
-            continue
-
-        # All three candles should be dojis (small body)
-        doji_threshold = 0.1
-        if (
-            c1.total_range == 0
-            or c2.total_range == 0
-            or c3.total_range == 0
-            or c1.body_size / c1.total_range > doji_threshold
-            or c2.body_size / c2.total_range > doji_threshold
-            or c3.body_size / c3.total_range > doji_threshold
-        ):
-            continue
-
-        # There should be gaps between the candles
-        if c2.low <= c1.high or c3.low <= c2.high:
-            continue
-
-        # Determine signal based on position
-        signal = "bullish" if c3.close > c1.close else "bearish"
+    if len(data) < 3:
+        return matches
 
-        matches.append(
-            PatternMatch(
-                pattern="tri_star",
-                pattern_name="Tri Star",
-                index=i,
-                candles=3,
-                signal=signal,
-                confidence=0.75,
-                description="Reversal pattern. Three consecutive doji candles with gaps between them, indicating indecision and potential reversal.",
-            )
+    ohlc = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    if three_bar is None:
+        three_bar = _scan_three_bar(*ohlc)
+    closes = ohlc[3]
+
+    # Determine signal based on position
+    matches.extend(
+        PatternMatch(
+            pattern="tri_star",
+            pattern_name="Tri Star",
+            index=i,
+            candles=3,
+            signal=_SIGNALS[1 if closes[i] > closes[i - 2] else -1],
+            confidence=0.75,
+            description="Reversal pattern. Three consecutive doji candles with gaps between them, indicating indecision and potential reversal.",
         )
+        for i in three_bar["tri_star"]
+    )
 
     return matches
 
 
-def detect_advance_block(data: list[dict]) -> list[PatternMatch]:
+def detect_advance_block(
+    data: list[dict], ohlc=None, three_bar=None
+) -> list[PatternMatch]:
     """
     Detect Advance Block pattern (bearish reversal).
 
@@ -980,46 +1387,32 @@ def detect_advance_block(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(2, len(data)):
-        c1 = to_candlestick(data[i - 2], i - 2)
-        c2 = to_candlestick(data[i - 1], i - 1)
-        c3 = to_candlestick(data[i], i)
-
-        if not (c1 and c2 and c3):
-            continue
-
-        # All three candles should be bullish
-        if not (c1.is_bullish and c2.is_bullish and c3.is_bullish):
-            continue
-
-        # Each candle should close higher than the previous
-        if not (c2.close > c1.close and c3.close > c2.close):
-            continue
-
-        # But the bodies should be getting smaller (weakening momentum)
-        if not (c2.body_size < c1.body_size and c3.body_size < c2.body_size):
-            continue
-
-        # Upper wicks should be getting longer
-        if not (c2.upper_wick > c1.upper_wick and c3.upper_wick > c2.upper_wick):
-            continue
+    if len(data) < 3:
+        return matches
 
-        matches.append(
-            PatternMatch(
-                pattern="advance_block",
-                pattern_name="Advance Block",
-                index=i,
-                candles=3,
-                signal="bearish",
-                confidence=0.7,
-                description="Bearish reversal pattern. Three bullish candles with decreasing body sizes and increasing upper wicks, indicating weakening upward momentum.",
-            )
+    if three_bar is None:
+        ohlc = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+        three_bar = _scan_three_bar(*ohlc)
+
+    matches.extend(
+        PatternMatch(
+            pattern="advance_block",
+            pattern_name="Advance Block",
+            index=i,
+            candles=3,
+            signal="bearish",
+            confidence=0.7,
+            description="Bearish reversal pattern. Three bullish candles with decreasing body sizes and increasing upper wicks, indicating weakening upward momentum.",
         )
+        for i in three_bar["advance_block"]
+    )
 
     return matches
 
 
-def detect_conceal_baby_swallow(data: list[dict]) -> list[PatternMatch]:
+def detect_conceal_baby_swallow(
+    data: list[dict], ohlc=None, features=None
+) -> list[PatternMatch]:
     """
     Detect Conceal Baby Swallow pattern (bullish continuation).
 
@@ -1027,53 +1420,52 @@ def detect_conceal_baby_swallow(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(3, len(data)):
-        c1 = to_candlestick(data[i - 3], i - 3)
-        c2 = to_candlestick(data[i - 2], i - 2)
-        c3 = to_candlestick(data[i - 1], i - 1)
-        c4 = to_candlestick(data[i], i)
-
-        if not (c1 and c2 and c3 and c4):
-            continue
-
-        # First two candles should be bearish marubozu (no wicks)
-        if c1.is_bullish or c2.is_bullish:
-            continue
-        if c1.upper_wick > 0.01 or c1.lower_wick > 0.01:
-            continue
-        if c2.upper_wick > 0.01 or c2.lower_wick > 0.01:
-            continue
-
-        # Third candle should gap down and be bearish
-        if c3.low >= c2.close:  # No gap down
-            continue
-        if c3.is_bullish:
-            continue
-
-        # Fourth candle should be a small bearish candle within the third candle's range
-        if c4.is_bullish:
-            continue
-        if c4.high > c3.high or c4.low < c3.low:
-            continue
-        if c4.body_size >= c3.body_size:
-            continue
+    if len(data) < 4:
+        return matches
 
-        matches.append(
-            PatternMatch(
-                pattern="conceal_baby_swallow",
-                pattern_name="Conceal Baby Swallow",
-                index=i,
-                candles=4,
-                signal="bullish",
-                confidence=0.8,
-                description="Bullish continuation pattern. Two bearish marubozu candles, followed by a gap down bearish candle, then a smaller bearish candle, indicating potential reversal.",
-            )
+    opens, highs, lows, closes = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    if features is None:
+        features = _bar_features(opens, highs, lows, closes)
+    valid, bullish, body, _, _, _, marubozu = features
+
+    bearish = valid & ~bullish
+    bear_marubozu = marubozu & ~bullish
+
+    # Candles i - 3 through i for every anchor i >= 3
+    anchors = _all_of(
+        # First two candles should be bearish marubozu (no wicks)
+        bear_marubozu[:-3],
+        bear_marubozu[1:-2],
+        # Third candle should gap down and be bearish
+        bearish[2:-1],
+        lows[2:-1] < closes[1:-2],
+        # Fourth candle should be a small bearish candle within the third
+        # candle's range
+        bearish[3:],
+        highs[3:] <= highs[2:-1],
+        lows[3:] >= lows[2:-1],
+        body[3:] < body[2:-1],
+    )
+
+    matches.extend(
+        PatternMatch(
+            pattern="conceal_baby_swallow",
+            pattern_name="Conceal Baby Swallow",
+            index=i,
+            candles=4,
+            signal="bullish",
+            confidence=0.8,
+            description="Bullish continuation pattern. Two bearish marubozu candles, followed by a gap down bearish candle, then a smaller bearish candle, indicating potential reversal.",
         )
+        for i in (np.flatnonzero(anchors) + 3).tolist()
+    )
 
     return matches
 
 
-def detect_stick_sandwich(data: list[dict]) -> list[PatternMatch]:
+def detect_stick_sandwich(
+    data: list[dict], ohlc=None, three_bar=None
+) -> list[PatternMatch]:
     """
     Detect Stick Sandwich pattern (bullish reversal).
 
@@ -1081,47 +1473,32 @@ def detect_stick_sandwich(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(2, len(data)):
-        c1 = to_candlestick(data[i - 2], i - 2)
-        c2 = to_candlestick(data[i - 1], i - 1)
-        c3 = to_candlestick(data[i], i)
-
-        if not (c1 and c2 and c3):
-            continue
-
-        # First and third candles should be bearish with similar closes
-        if c1.is_bullish or c3.is_bullish:
-            continue
-        close_diff = (
-            abs(c1.close - c3.close) / max(c1.close, c3.close)
-            if max(c1.close, c3.close) > 0
-            else 1.0
-        )
-        if close_diff > 0.02:  # Closes should be within 2%
-            continue
-
-        # Second candle should be bullish and close above both first and third
-        if not c2.is_bullish:
-            continue
-        if c2.close <= c1.close or c2.close <= c3.close:
-            continue
+    if len(data) < 3:
+        return matches
 
-        matches.append(
-            PatternMatch(
-                pattern="stick_sandwich",
-                pattern_name="Stick Sandwich",
-                index=i,
-                candles=3,
-                signal="bullish",
-                confidence=0.75,
-                description="Bullish reversal pattern. Two bearish candles with similar closes sandwiching a bullish candle that closes above both.",
-            )
+    if three_bar is None:
+        ohlc = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+        three_bar = _scan_three_bar(*ohlc)
+
+    matches.extend(
+        PatternMatch(
+            pattern="stick_sandwich",
+            pattern_name="Stick Sandwich",
+            index=i,
+            candles=3,
+            signal="bullish",
+            confidence=0.75,
+            description="Bullish reversal pattern. Two bearish candles with similar closes sandwiching a bullish candle that closes above both.",
         )
+        for i in three_bar["stick_sandwich"]
+    )
 
     return matches
 
 
-def detect_morning_star(data: list[dict]) -> list[PatternMatch]:
+def detect_morning_star(
+    data: list[dict], ohlc=None, three_bar=None
+) -> list[PatternMatch]:
     """
     Detect Morning Star pattern (bullish reversal).
 
@@ -1129,52 +1506,30 @@ def detect_morning_star(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(2, len(data)):
-        c1 = to_candlestick(data[i - 2], i - 2)
-        c2 = to_candlestick(data[i - 1], i - 1)
-        c3 = to_candlestick(data[i], i)
-
-        if not (c1 and c2 and c3):
-            continue
-
-        # First candle should be bearish
-        if c1.is_bullish:
-            continue
-
-        # Second candle should have a small body (can be bullish or bearish)
-        if c2.total_range == 0:
-            continue
-        body_ratio = c2.body_size / c2.total_range
-        if body_ratio > 0.3:
-            continue
-
-        # There should be a gap between first and second candle
-        if c2.low >= c1.close:  # No gap down
-            continue
-
-        # Third candle should be bullish and close above the midpoint of first candle
-        if not c3.is_bullish:
-            continue
-        first_midpoint = (c1.open + c1.close) / 2.0
-        if c3.close <= first_midpoint:
-            continue
+    if len(data) < 3:
+        return matches
 
-        matches.append(
-            PatternMatch(
-                pattern="morning_star",
-                pattern_name="Morning Star",
-                index=i,
-                candles=3,
-                signal="bullish",
-                confidence=0.75,
-                description="Bullish reversal pattern. Bearish candle, small body (star), then bullish candle closing above the first candle's midpoint.",
-            )
+    if three_bar is None:
+        ohlc = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+        three_bar = _scan_three_bar(*ohlc)
+
+    matches.extend(
+        PatternMatch(
+            pattern="morning_star",
+            pattern_name="Morning Star",
+            index=i,
+            candles=3,
+            signal="bullish",
+            confidence=0.75,
+            description="Bullish reversal pattern. Bearish candle, small body (star), then bullish candle closing above the first candle's midpoint.",
         )
+        for i in three_bar["morning_star"]
+    )
 
     return matches
 
 
-def detect_kicking(data: list[dict]) -> list[PatternMatch]:
+def detect_kicking(data: list[dict], ohlc=None, features=None) -> list[PatternMatch]:
     """
     Detect Kicking pattern (bullish reversal).
 
@@ -1182,89 +1537,101 @@ def detect_kicking(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(1, len(data)):
-        c1 = to_candlestick(data[i - 1], i - 1)
-        c2 = to_candlestick(data[i], i)
+    if len(data) < 2:
+        return matches
 
-        if not (c1 and c2):
-            continue
+    opens, highs, lows, closes = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    if features is None:
+        features = _bar_features(opens, highs, lows, closes)
+    _, bullish, _, _, _, _, marubozu = features
 
+    # Candles i - 1 and i for every anchor i >= 1
+    anchors = _all_of(
         # First candle should be bearish marubozu (no wicks)
-        if c1.is_bullish:
-            continue
-        if c1.upper_wick > 0.01 or c1.lower_wick > 0.01:
-            continue
-
+        marubozu[:-1],
+        ~bullish[:-1],
         # Second candle should be bullish marubozu (no wicks)
-        if not c2.is_bullish:
-            continue
-        if c2.upper_wick > 0.01 or c2.lower_wick > 0.01:
-            continue
-
+        marubozu[1:],
+        bullish[1:],
         # There should be a gap between them
-        if c2.low <= c1.high:
-            continue
-
-        matches.append(
-            PatternMatch(
-                pattern="kicking",
-                pattern_name="Kicking",
-                index=i,
-                candles=2,
-                signal="bullish",
-                confidence=0.85,
-                description="Strong bullish reversal pattern. Two marubozu candles (bearish then bullish) with a gap between them, indicating a significant momentum shift.",
-            )
+        lows[1:] > highs[:-1],
+    )
+
+    matches.extend(
+        PatternMatch(
+            pattern="kicking",
+            pattern_name="Kicking",
+            index=i,
+            candles=2,
+            signal="bullish",
+            confidence=0.85,
+            description="Strong bullish reversal pattern. Two marubozu candles (bearish then bullish) with a gap between them, indicating a significant momentum shift.",
         )
+        for i in (np.flatnonzero(anchors) + 1).tolist()
+    )
 
     return matches
 
 
-def detect_spinning_top(data: list[dict]) -> list[PatternMatch]:
+def detect_spinning_top(
+    data: list[dict], ohlc=None, features=None
+) -> list[PatternMatch]:
     """
     Detect Spinning Top pattern (neutral/indecision).
 
     Small body with long wicks on both sides.
     """
-    matches: list[PatternMatch] = []
-
-    for i in range(len(data)):
-        c = to_candlestick(data[i], i)
-
-        if not c:
-            continue
-
-        if c.total_range == 0:
-            continue
 
+    matches: list[PatternMatch] = []
+    opens, highs, lows, closes = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    if features is None:
+        features = _bar_features(opens, highs, lows, closes)
+    valid, _, body, total_range, upper_wick, lower_wick, _ = features
+
+    # Body and wicks as shares of the range, only defined for bars with a range
+    has_range = total_range > 0
+    body_ratio = np.divide(body, total_range, out=np.ones_like(body), where=has_range)
+    upper_wick_ratio = np.divide(
+        upper_wick,
+        total_range,
+        out=np.zeros_like(body),
+        where=has_range,
+    )
+    lower_wick_ratio = np.divide(
+        lower_wick,
+        total_range,
+        out=np.zeros_like(body),
+        where=has_range,
+    )
+    anchors = _all_of(
+        valid,
+        has_range,
         # Small body relative to total range
-        body_ratio = c.body_size / c.total_range
-        if body_ratio > 0.3:
-            continue
-
+        body_ratio <= 0.3,
         # Long wicks on both sides
-        upper_wick_ratio = c.upper_wick / c.total_range if c.total_range > 0 else 0
-        lower_wick_ratio = c.lower_wick / c.total_range if c.total_range > 0 else 0
-
-        if upper_wick_ratio < 0.3 or lower_wick_ratio < 0.3:
-            continue
-
-        matches.append(
-            PatternMatch(
-                pattern="spinning_top",
-                pattern_name="Spinning Top",
-                index=i,
-                candles=1,
-                signal="neutral",
-                confidence=0.55,
-                description="Indecision pattern. Small body with long wicks on both sides, indicating market uncertainty.",
-            )
+        upper_wick_ratio >= 0.3,
+        lower_wick_ratio >= 0.3,
+    )
+
+    matches.extend(
+        PatternMatch(
+            pattern="spinning_top",
+            pattern_name="Spinning Top",
+            index=i,
+            candles=1,
+            signal="neutral",
+            confidence=0.55,
+            description="Indecision pattern. Small body with long wicks on both sides, indicating market uncertainty.",
         )
+        for i in np.flatnonzero(anchors).tolist()
+    )
 
     return matches
 
 
-def detect_homing_pigeon(data: list[dict]) -> list[PatternMatch]:
+def detect_homing_pigeon(
+    data: list[dict], ohlc=None, features=None
+) -> list[PatternMatch]:
     """
     Detect Homing Pigeon pattern (bullish reversal).
 
@@ -1272,155 +1639,269 @@ def detect_homing_pigeon(data: list[dict]) -> list[PatternMatch]:
     """
     matches: list[PatternMatch] = []
 
-    for i in range(1, len(data)):
-        c1 = to_candlestick(data[i - 1], i - 1)
-        c2 = to_candlestick(data[i], i)
+    if len(data) < 2:
+        return matches
 
-        if not (c1 and c2):
-            continue
+    opens, highs, lows, closes = ohlc if ohlc is not None else _to_ohlc_arrays(data)
+    if features is None:
+        features = _bar_features(opens, highs, lows, closes)
+    valid, bullish, body, _, _, _, _ = features
 
+    # Candles i - 1 and i for every anchor i >= 1
+    anchors = _all_of(
+        valid[:-1],
+        valid[1:],
         # Both candles should be bearish
-        if c1.is_bullish or c2.is_bullish:
-            continue
-
+        ~bullish[:-1],
+        ~bullish[1:],
         # Second candle should be contained within the first
-        if c2.high > c1.high or c2.low < c1.low:
-            continue
-
+        highs[1:] <= highs[:-1],
+        lows[1:] >= lows[:-1],
         # Second candle should be smaller
-        if c2.body_size >= c1.body_size:
-            continue
-
-        matches.append(
-            PatternMatch(
-                pattern="homing_pigeon",
-                pattern_name="Homing Pigeon",
-                index=i,
-                candles=2,
-                signal="bullish",
-                confidence=0.65,
-                description="Bullish reversal pattern. Two bearish candles where the second is smaller and contained within the first, suggesting weakening bearish momentum.",
-            )
+        body[1:] < body[:-1],
+    )
+
+    matches.extend(
+        PatternMatch(
+            pattern="homing_pigeon",
+            pattern_name="Homing Pigeon",
+            index=i,
+            candles=2,
+            signal="bullish",
+            confidence=0.65,
+            description="Bullish reversal pattern. Two bearish candles where the second is smaller and contained within the first, suggesting weakening bearish momentum.",
         )
+        for i in (np.flatnonzero(anchors) + 1).tolist()
+    )
 
     return matches
 
 
-def _determine_trending_signal(
-    current_plus_di: float | None,
-    current_minus_di: float | None,
-    price_above_sma: bool,
-    price_momentum: float,
-    current_adx: float,
-    is_strong_trend: bool,
-) -> tuple[str, float, str] | None:
-    """Determine signal, confidence, and trend strength for trending regime."""
-    # Determine signal based on DI and price position
-    if current_plus_di is not None and current_minus_di is not None:
-        if current_plus_di > current_minus_di and price_above_sma:
-            signal = "bullish"
-            confidence = min(0.95, 0.6 + (current_adx - 20) / 50.0)
-            trend_strength = "strong" if is_strong_trend else "moderate"
-            return signal, confidence, trend_strength
-        if current_minus_di > current_plus_di and not price_above_sma:
-            signal = "bearish"
-            confidence = min(0.95, 0.6 + (current_adx - 20) / 50.0)
-            trend_strength = "strong" if is_strong_trend else "moderate"
-            return signal, confidence, trend_strength
-        return None
+class IndicatorBundle:
+    """
+    Indicator series shared by the regime detectors.
+
+    Each series is computed the first time a detector reads it and then kept,
+    so running several regime detectors on the same data computes ADX and
+    Bollinger Bands once, and a detector that needs neither never pays for
+    them. Every series is a float array aligned with the price data, with NaN
+    where the indicator is undefined. The 20-bar SMA used by the trending
+    regime is the middle Bollinger band.
+    """
 
-    # Fallback to price momentum
-    if price_momentum > 0.02:  # 2% above SMA
-        return "bullish", 0.65, "moderate"
-    if price_momentum < -0.02:  # 2% below SMA
-        return "bearish", 0.65, "moderate"
-    return None
+    def __init__(self, data: list[dict], ohlc=None):
+        """
+        Args:
+            data: List of price data dictionaries
+            ohlc: Parsed price arrays from _to_ohlc_arrays, if already available
+        """
+        self._data = data
+        self._closes = (ohlc if ohlc is not None else _to_ohlc_arrays(data))[3]
+
+    @functools.cached_property
+    def _rows(self) -> list[dict]:
+        return _parsed_price_rows(self._data)
+
+    @functools.cached_property
+    def _adx(self) -> dict:
+        from stocks import indicators
+
+        adx_data = indicators.calculate_adx(self._rows, period=14)
+        return {
+            key: _indicator_array(adx_data.get(key, []), len(self._data))
+            for key in ("adx", "plus_di", "minus_di")
+        }
 
+    @functools.cached_property
+    def _bollinger(self) -> dict:
+        from stocks import indicators
 
-def detect_trending_regime(data: list[dict]) -> list[PatternMatch]:
-    """
-    Detect Trending Regime pattern.
+        bb_data = indicators.calculate_bollinger_bands(self._rows, period=20)
+        return {
+            key: _indicator_array(bb_data.get(key, []), len(self._data))
+            for key in ("upper", "middle", "lower")
+        }
 
-    Identifies strong directional trends using ADX, moving averages, and price momentum.
-    A trending regime indicates sustained directional movement (bullish or bearish).
-    """
-    matches: list[PatternMatch] = []
+    @functools.cached_property
+    def _rolling_closes(self) -> tuple:
 
-    if len(data) < 20:
-        return matches
+        closes = self._closes
+        n = len(closes)
+        rolling_max = np.full(n, np.nan)
+        rolling_min = np.full(n, np.nan)
+        rolling_count = np.zeros(n, dtype=int)
+        if n >= 11:
+            rolling_max[10:], rolling_min[10:] = _rolling_envelope(closes, closes, 11)
+            rolling_count[10:] = _valid_window_ends(~np.isnan(closes), 11)[2]
+        return rolling_max, rolling_min, rolling_count
 
-    # Import indicators module
-    from stocks import indicators
+    @property
+    def adx(self):
+        return self._adx["adx"]
 
-    # Calculate required indicators
-    adx_data = indicators.calculate_adx(data, period=14)
-    adx_values = adx_data.get("adx", [])
-    plus_di = adx_data.get("plus_di", [])
-    minus_di = adx_data.get("minus_di", [])
+    @property
+    def plus_di(self):
+        return self._adx["plus_di"]
 
-    sma_20 = indicators.calculate_sma(data, period=20)
+    @property
+    def minus_di(self):
+        return self._adx["minus_di"]
 
-    # Check for trending regime in recent periods
-    lookback = min(10, len(data) - 1)
-    for i in range(len(data) - lookback, len(data)):
-        if i < 20:  # Need at least 20 periods for ADX
-            continue
+    @property
+    def bb_upper(self):
+        return self._bollinger["upper"]
 
-        current_adx = adx_values[i] if i < len(adx_values) else None
-        current_plus_di = plus_di[i] if i < len(plus_di) else None
-        current_minus_di = minus_di[i] if i < len(minus_di) else None
+    @property
+    def bb_middle(self):
+        return self._bollinger["middle"]
 
-        if current_adx is None:
-            continue
+    @property
+    def bb_lower(self):
+        return self._bollinger["lower"]
 
-        # Strong trend: ADX > 25 indicates strong trend
-        # ADX > 20 indicates moderate trend
-        is_strong_trend = current_adx > 25
-        is_moderate_trend = current_adx > 20
+    @functools.cached_property
+    def atr(self):
+        from stocks import indicators
 
-        if not (is_strong_trend or is_moderate_trend):
-            continue
+        return _indicator_array(
+            indicators.calculate_atr(self._rows, period=14), len(self._data)
+        )
 
-        # Determine trend direction
-        current_price = to_number(data[i].get("close_price"))
-        sma_20_val = sma_20[i] if i < len(sma_20) and sma_20[i] is not None else None
+    # Highest / lowest valid close and valid close count over the 11 bars
+    # ending at each index
+    @property
+    def rolling_max_10(self):
+        return self._rolling_closes[0]
 
-        if current_price is None or sma_20_val is None:
-            continue
+    @property
+    def rolling_min_10(self):
+        return self._rolling_closes[1]
 
-        # Check price momentum
-        price_above_sma = current_price > sma_20_val
-        price_momentum = (
-            (current_price - sma_20_val) / sma_20_val if sma_20_val > 0 else 0
-        )
+    @property
+    def rolling_count_10(self):
+        return self._rolling_closes[2]
 
-        # Determine signal using helper function
-        signal_result = _determine_trending_signal(
-            current_plus_di,
-            current_minus_di,
-            price_above_sma,
-            price_momentum,
-            current_adx,
-            is_strong_trend,
-        )
-        if signal_result is None:
-            continue
-        signal, confidence, trend_strength = signal_result
+
+def _indicator_array(values: list[float | None], n: int):
+    """Convert an indicator list to a length-`n` float array, None as NaN."""
+
+    result = np.full(n, np.nan)
+    values = values[:n]
+    result[: len(values)] = np.array(values, dtype=float)
+    return result
+
+
+def _parsed_price_rows(data: list[dict]) -> list[dict]:
+    """
+    Parse the price fields read by the regime indicators, once per row.
+
+    The indicators parse every field they touch, Bollinger Bands once per bar
+    of each window, so they are given these rows instead of the raw ones.
+    Values are parsed with the indicators' own ``to_number``; non-finite
+    Decimals are kept as they are, since their NaN/inf result would read as
+    missing when parsed a second time.
+    """
+    from stocks.indicators import to_number as parse
+
+    rows = []
+    for row in data:
+        parsed = {}
+        for field_name in ("high_price", "low_price", "close_price"):
+            value = row.get(field_name)
+            num = parse(value)
+            parsed[field_name] = (
+                value if num is not None and not math.isfinite(num) else num
+            )
+        rows.append(parsed)
+    return rows
+
+
+def detect_trending_regime(
+    data: list[dict], ohlc=None, bundle=None
+) -> list[PatternMatch]:
+    """
+    Detect Trending Regime pattern.
+
+    Identifies strong directional trends using ADX, moving averages, and price momentum.
+    A trending regime indicates sustained directional movement (bullish or bearish).
+    """
+    matches: list[PatternMatch] = []
+
+    if len(data) < 20:
+        return matches
+
+    if ohlc is None:
+        ohlc = _to_ohlc_arrays(data)
+    closes = ohlc[3]
+
+    # Calculate required indicators
+    if bundle is None:
+        bundle = IndicatorBundle(data, ohlc)
+    adx_values = bundle.adx
+    plus_di = bundle.plus_di
+    minus_di = bundle.minus_di
+    sma_20 = bundle.bb_middle
+
+    # Check for trending regime in recent periods; need at least 20 periods
+    # for ADX
+    lookback = min(10, len(data) - 1)
+    start = max(len(data) - lookback, 20)
+    adx = adx_values[start:]
+    plus = plus_di[start:]
+    minus = minus_di[start:]
+    prices = closes[start:]
+    sma = sma_20[start:]
+
+    # Strong trend: ADX > 25 indicates strong trend
+    # ADX > 20 indicates moderate trend
+    is_strong_trend = adx > 25
+    is_moderate_trend = adx > 20
+
+    # Check price momentum
+    price_above_sma = prices > sma
+    price_momentum = np.divide(prices - sma, sma, out=np.zeros_like(sma), where=sma > 0)
+
+    # Determine signal based on DI and price position, falling back to price
+    # momentum (2% above / below the SMA) where DI is undefined
+    has_di = ~np.isnan(plus) & ~np.isnan(minus)
+    is_bullish = np.where(
+        has_di, (plus > minus) & price_above_sma, price_momentum > 0.02
+    )
+    is_bearish = np.where(
+        has_di, (minus > plus) & ~price_above_sma, price_momentum < -0.02
+    )
+    signal_codes = np.select([is_bullish, is_bearish], [1, -1], 0)
+    confidences = np.where(
+        has_di, np.minimum(0.95, 0.6 + (adx - 20) / 50.0), 0.65
+    ).tolist()
+    trend_strengths = np.where(has_di & is_strong_trend, "Strong", "Moderate").tolist()
+
+    hits = is_moderate_trend & ~np.isnan(prices) & ~np.isnan(sma) & (signal_codes != 0)
+
+    for k in np.flatnonzero(hits).tolist():
+        signal = _SIGNALS[signal_codes[k]]
+        confidence = confidences[k]
 
         # Calculate predictions
         predictions = _calculate_pattern_predictions(
-            "trending_regime", signal, confidence, data[max(0, i - 20) : i + 1]
+            "trending_regime", signal, confidence
         )
 
         matches.append(
             PatternMatch(
                 pattern="trending_regime",
                 pattern_name="Trending Regime",
-                index=i,
+                index=start + k,
                 candles=20,
                 signal=signal,
                 confidence=confidence,
-                description=f"{trend_strength.capitalize()} {signal} trending regime. ADX: {current_adx:.2f}, Price momentum: {price_momentum * 100:.2f}%",
+                description="{} {} trending regime. ADX: {:.2f}, Price momentum: {:.2f}%",
+                description_args=(
+                    trend_strengths[k],
+                    signal,
+                    adx[k],
+                    price_momentum[k] * 100,
+                ),
                 possible_gain=predictions.get("possible_gain"),
                 possible_loss=predictions.get("possible_loss"),
                 gain_probability=predictions.get("gain_probability"),
@@ -1433,7 +1914,9 @@ def detect_trending_regime(data: list[dict]) -> list[PatternMatch]:
     return matches
 
 
-def detect_ranging_regime(data: list[dict]) -> list[PatternMatch]:
+def detect_ranging_regime(
+    data: list[dict], ohlc=None, bundle=None
+) -> list[PatternMatch]:
     """
     Detect Ranging Regime pattern.
 
@@ -1445,100 +1928,96 @@ def detect_ranging_regime(data: list[dict]) -> list[PatternMatch]:
     if len(data) < 20:
         return matches
 
-    # Import indicators module
-    from stocks import indicators
+    if ohlc is None:
+        ohlc = _to_ohlc_arrays(data)
+    closes = ohlc[3]
 
     # Calculate required indicators
-    bb_data = indicators.calculate_bollinger_bands(data, period=20)
-    bb_upper = bb_data.get("upper", [])
-    bb_middle = bb_data.get("middle", [])
-    bb_lower = bb_data.get("lower", [])
-
-    atr_values = indicators.calculate_atr(data, period=14)
-
-    # Check for ranging regime in recent periods
+    if bundle is None:
+        bundle = IndicatorBundle(data, ohlc)
+    bb_upper = bundle.bb_upper
+    bb_middle = bundle.bb_middle
+    bb_lower = bundle.bb_lower
+    atr_values = bundle.atr
+
+    # Check for ranging regime in recent periods; need at least 20 periods
     lookback = min(10, len(data) - 1)
-    for i in range(len(data) - lookback, len(data)):
-        if i < 20:  # Need at least 20 periods
-            continue
-
-        current_price = to_number(data[i].get("close_price"))
-        bb_upper_val = bb_upper[i] if i < len(bb_upper) else None
-        bb_middle_val = bb_middle[i] if i < len(bb_middle) else None
-        bb_lower_val = bb_lower[i] if i < len(bb_lower) else None
-        atr_val = atr_values[i] if i < len(atr_values) else None
-
-        if (
-            current_price is None
-            or bb_upper_val is None
-            or bb_middle_val is None
-            or bb_lower_val is None
-            or atr_val is None
-        ):
-            continue
-
-        # Calculate Bollinger Band width (normalized)
-        bb_width = (
-            (bb_upper_val - bb_lower_val) / bb_middle_val if bb_middle_val > 0 else 0
+    start = max(len(data) - lookback, 20)
+    prices = closes[start:]
+    upper = bb_upper[start:]
+    middle = bb_middle[start:]
+    lower = bb_lower[start:]
+    priced = middle > 0
+
+    # Calculate Bollinger Band width (normalized)
+    bb_width = np.divide(upper - lower, middle, out=np.zeros_like(middle), where=priced)
+
+    # Check price oscillation over the 11 bars ending at each bar
+    price_range = bundle.rolling_max_10[start:] - bundle.rolling_min_10[start:]
+    price_oscillation = np.divide(
+        price_range, middle, out=np.zeros_like(middle), where=priced
+    )
+
+    # Ranging regime characteristics:
+    # 1. Narrow Bollinger Bands (low volatility)
+    # 2. Price oscillating within bands
+    # 3. Low ATR relative to price
+    is_narrow_bands = bb_width < 0.05  # Less than 5% width
+    is_low_oscillation = price_oscillation < 0.08  # Less than 8% oscillation
+    is_price_in_bands = (lower <= prices) & (prices <= upper)
+
+    # Check if price is near middle band (ranging); a zero middle band
+    # cannot be measured against
+    distance_from_middle = np.divide(
+        np.abs(prices - middle),
+        middle,
+        out=np.full_like(middle, np.inf),
+        where=middle != 0,
+    )
+    is_near_middle = distance_from_middle < 0.02  # Within 2% of middle
+
+    # Determine signal (neutral for ranging, but can be slightly bullish/bearish),
+    # with higher confidence if price is near middle
+    signal_codes = np.select([prices > middle, prices < middle], [1, -1], 0)
+    confidences = np.select(
+        [is_near_middle, signal_codes != 0], [0.7, 0.55], 0.6
+    ).tolist()
+
+    hits = (
+        ~np.isnan(prices)
+        & ~np.isnan(upper)
+        & ~np.isnan(middle)
+        & ~np.isnan(lower)
+        & ~np.isnan(atr_values[start:])
+        & (bundle.rolling_count_10[start:] >= 5)
+        & (is_narrow_bands | is_low_oscillation)
+        & is_price_in_bands
+    )
+
+    matches.extend(
+        PatternMatch(
+            pattern="ranging_regime",
+            pattern_name="Ranging Regime",
+            index=start + k,
+            candles=20,
+            signal=_SIGNALS[signal_codes[k]],
+            confidence=confidences[k],
+            description="Sideways consolidation regime. BB width: {:.2f}%, Price oscillation: {:.2f}%, Price near middle: {}",
+            description_args=(
+                bb_width[k] * 100,
+                price_oscillation[k] * 100,
+                bool(is_near_middle[k]),
+            ),
         )
-
-        # Check price oscillation in recent periods
-        recent_prices = [
-            to_number(data[j].get("close_price"))
-            for j in range(max(0, i - 10), i + 1)
-            if to_number(data[j].get("close_price")) is not None
-        ]
-
-        if len(recent_prices) < 5:
-            continue
-
-        price_range = max(recent_prices) - min(recent_prices)
-        price_oscillation = price_range / bb_middle_val if bb_middle_val > 0 else 0
-
-        # Ranging regime characteristics:
-        # 1. Narrow Bollinger Bands (low volatility)
-        # 2. Price oscillating within bands
-        # 3. Low ATR relative to price
-        is_narrow_bands = bb_width < 0.05  # Less than 5% width
-        is_low_oscillation = price_oscillation < 0.08  # Less than 8% oscillation
-        is_price_in_bands = bb_lower_val <= current_price <= bb_upper_val
-
-        # Check if price is near middle band (ranging)
-        distance_from_middle = abs(current_price - bb_middle_val) / bb_middle_val
-        is_near_middle = distance_from_middle < 0.02  # Within 2% of middle
-
-        if (is_narrow_bands or is_low_oscillation) and is_price_in_bands:
-            # Determine signal (neutral for ranging, but can be slightly bullish/bearish)
-            if current_price > bb_middle_val:
-                signal = "bullish"  # Slight bullish bias
-                confidence = 0.55
-            elif current_price < bb_middle_val:
-                signal = "bearish"  # Slight bearish bias
-                confidence = 0.55
-            else:
-                signal = "neutral"
-                confidence = 0.6
-
-            # Higher confidence if price is near middle
-            if is_near_middle:
-                confidence = 0.7
-
-            matches.append(
-                PatternMatch(
-                    pattern="ranging_regime",
-                    pattern_name="Ranging Regime",
-                    index=i,
-                    candles=20,
-                    signal=signal,
-                    confidence=confidence,
-                    description=f"Sideways consolidation regime. BB width: {bb_width * 100:.2f}%, Price oscillation: {price_oscillation * 100:.2f}%, Price near middle: {is_near_middle}",
-                )
-            )
+        for k in np.flatnonzero(hits).tolist()
+    )
 
     return matches
 
 
-def detect_volatile_regime(data: list[dict]) -> list[PatternMatch]:
+def detect_volatile_regime(
+    data: list[dict], ohlc=None, bundle=None
+) -> list[PatternMatch]:
     """
     Detect Volatile Regime pattern.
 
@@ -1550,97 +2029,97 @@ def detect_volatile_regime(data: list[dict]) -> list[PatternMatch]:
     if len(data) < 20:
         return matches
 
-    # Import indicators module
-    from stocks import indicators
+    if ohlc is None:
+        ohlc = _to_ohlc_arrays(data)
+    _, highs, lows, closes = ohlc
 
     # Calculate required indicators
-    bb_data = indicators.calculate_bollinger_bands(data, period=20)
-    bb_upper = bb_data.get("upper", [])
-    bb_middle = bb_data.get("middle", [])
-    bb_lower = bb_data.get("lower", [])
-
-    atr_values = indicators.calculate_atr(data, period=14)
-
-    # Calculate average ATR for comparison
-    recent_atr = [
-        atr_values[j]
-        for j in range(max(0, len(data) - 20), len(data))
-        if atr_values[j] is not None
-    ]
-    avg_atr = sum(recent_atr) / len(recent_atr) if recent_atr else None
+    if bundle is None:
+        bundle = IndicatorBundle(data, ohlc)
+    bb_upper = bundle.bb_upper
+    bb_middle = bundle.bb_middle
+    bb_lower = bundle.bb_lower
+    atr_values = bundle.atr
+
+    # Calculate average ATR over the last 20 bars for comparison
+    recent_atr = atr_values[-20:]
+    recent_atr = recent_atr[~np.isnan(recent_atr)]
+    avg_atr = float(recent_atr.mean()) if recent_atr.size else None
+
+    if avg_atr is None:
+        return matches
 
-    # Check for volatile regime in recent periods
+    # Check for volatile regime in recent periods; need at least 20 periods
     lookback = min(10, len(data) - 1)
-    for i in range(len(data) - lookback, len(data)):
-        if i < 20:  # Need at least 20 periods
-            continue
-
-        current_price = to_number(data[i].get("close_price"))
-        high_price = to_number(data[i].get("high_price"))
-        low_price = to_number(data[i].get("low_price"))
-        bb_upper_val = bb_upper[i] if i < len(bb_upper) else None
-        bb_middle_val = bb_middle[i] if i < len(bb_middle) else None
-        bb_lower_val = bb_lower[i] if i < len(bb_lower) else None
-        atr_val = atr_values[i] if i < len(atr_values) else None
-
-        if (
-            current_price is None
-            or high_price is None
-            or low_price is None
-            or bb_upper_val is None
-            or bb_middle_val is None
-            or bb_lower_val is None
-            or atr_val is None
-            or avg_atr is None
-        ):
-            continue
-
-        # Calculate Bollinger Band width (normalized)
-        bb_width = (
-            (bb_upper_val - bb_lower_val) / bb_middle_val if bb_middle_val > 0 else 0
+    start = max(len(data) - lookback, 20)
+    prices = closes[start:]
+    upper = bb_upper[start:]
+    middle = bb_middle[start:]
+    lower = bb_lower[start:]
+    atr = atr_values[start:]
+
+    # Calculate Bollinger Band width (normalized)
+    bb_width = np.divide(
+        upper - lower,
+        middle,
+        out=np.zeros_like(middle),
+        where=middle > 0,
+    )
+
+    # Calculate daily price range
+    range_ratio = np.divide(
+        highs[start:] - lows[start:],
+        prices,
+        out=np.zeros_like(prices),
+        where=prices > 0,
+    )
+
+    # Volatile regime characteristics:
+    # 1. Wide Bollinger Bands (high volatility)
+    # 2. High ATR relative to average
+    # 3. Large daily price range
+    is_wide_bands = bb_width > 0.10  # More than 10% width
+    is_high_atr = atr > avg_atr * 1.5  # 50% above average
+    is_large_range = range_ratio > 0.03  # More than 3% daily range
+
+    # Check if price is touching bands (high volatility)
+    is_touching_upper = prices >= upper * 0.98
+    is_touching_lower = prices <= lower * 1.02
+
+    # Determine signal based on price position: overbought or oversold in a
+    # volatile market, otherwise direction uncertain
+    signal_codes = np.select([is_touching_upper, is_touching_lower], [-1, 1], 0)
+    confidences = np.where(signal_codes != 0, 0.65, 0.6).tolist()
+    volatility_levels = np.where(bb_width > 0.15, "Extreme", "High").tolist()
+
+    hits = (
+        ~np.isnan(prices)
+        & ~np.isnan(upper)
+        & ~np.isnan(middle)
+        & ~np.isnan(lower)
+        & ~np.isnan(atr)
+        & (is_wide_bands | is_high_atr)
+        & is_large_range
+    )
+
+    matches.extend(
+        PatternMatch(
+            pattern="volatile_regime",
+            pattern_name="Volatile Regime",
+            index=start + k,
+            candles=20,
+            signal=_SIGNALS[signal_codes[k]],
+            confidence=confidences[k],
+            description="{} volatility regime. BB width: {:.2f}%, ATR: {:.2f}%, Daily range: {:.2f}%",
+            description_args=(
+                volatility_levels[k],
+                bb_width[k] * 100,
+                atr[k] / prices[k] * 100,
+                range_ratio[k] * 100,
+            ),
         )
-
-        # Calculate daily price range
-        daily_range = high_price - low_price
-        range_ratio = daily_range / current_price if current_price > 0 else 0
-
-        # Volatile regime characteristics:
-        # 1. Wide Bollinger Bands (high volatility)
-        # 2. High ATR relative to average
-        # 3. Large daily price range
-        is_wide_bands = bb_width > 0.10  # More than 10% width
-        is_high_atr = atr_val > avg_atr * 1.5  # 50% above average
-        is_large_range = range_ratio > 0.03  # More than 3% daily range
-
-        # Check if price is touching bands (high volatility)
-        is_touching_upper = current_price >= bb_upper_val * 0.98
-        is_touching_lower = current_price <= bb_lower_val * 1.02
-
-        if (is_wide_bands or is_high_atr) and is_large_range:
-            # Determine signal based on price position
-            if is_touching_upper:
-                signal = "bearish"  # Overbought in volatile market
-                confidence = 0.65
-            elif is_touching_lower:
-                signal = "bullish"  # Oversold in volatile market
-                confidence = 0.65
-            else:
-                signal = "neutral"  # High volatility, direction uncertain
-                confidence = 0.6
-
-            volatility_level = "extreme" if bb_width > 0.15 else "high"
-
-            matches.append(
-                PatternMatch(
-                    pattern="volatile_regime",
-                    pattern_name="Volatile Regime",
-                    index=i,
-                    candles=20,
-                    signal=signal,
-                    confidence=confidence,
-                    description=f"{volatility_level.capitalize()} volatility regime. BB width: {bb_width * 100:.2f}%, ATR: {atr_val / current_price * 100:.2f}%, Daily range: {range_ratio * 100:.2f}%",
-                )
-            )
+        for k in np.flatnonzero(hits).tolist()
+    )
 
     return matches
 
@@ -1651,24 +2130,23 @@ def _calculate_transition_indicators(
     current_bb_width: float,
     prev_bb_width: float,
     current_price: float,
-    prev_prices: list[float],
+    prev_closes,
 ) -> tuple[bool, bool, bool]:
     """Calculate transition indicators."""
+
     adx_change = abs(current_adx - prev_adx)
     is_adx_transition = adx_change > 5  # Significant change
 
     bb_width_change = abs(current_bb_width - prev_bb_width)
     is_bb_transition = bb_width_change > 0.02  # 2% change
 
-    if prev_prices:
-        prev_range_high = max(prev_prices)
-        prev_range_low = min(prev_prices)
-        is_breaking_out = (
-            current_price > prev_range_high * 1.02
-            or current_price < prev_range_low * 0.98
-        )
-    else:
-        is_breaking_out = False
+    # Breaking out when the price clears every earlier valid close by 2%;
+    # an empty range is no breakout
+    prev_closes = prev_closes[~np.isnan(prev_closes)]
+    is_breaking_out = prev_closes.size > 0 and bool(
+        np.all(current_price > prev_closes * 1.02)
+        or np.all(current_price < prev_closes * 0.98)
+    )
 
     return is_adx_transition, is_bb_transition, is_breaking_out
 
@@ -1695,7 +2173,9 @@ def _determine_transition_type(
     return transition_type, signal
 
 
-def detect_regime_transition(data: list[dict]) -> list[PatternMatch]:
+def detect_regime_transition(
+    data: list[dict], ohlc=None, bundle=None
+) -> list[PatternMatch]:
     """
     Detect Regime Transition pattern.
 
@@ -1707,18 +2187,17 @@ def detect_regime_transition(data: list[dict]) -> list[PatternMatch]:
     if len(data) < 30:
         return matches
 
-    # Import indicators module
-    from stocks import indicators
-
-    # Calculate ADX to detect trend changes
-    adx_data = indicators.calculate_adx(data, period=14)
-    adx_values = adx_data.get("adx", [])
+    if ohlc is None:
+        ohlc = _to_ohlc_arrays(data)
+    closes = ohlc[3]
 
-    # Calculate Bollinger Bands to detect volatility changes
-    bb_data = indicators.calculate_bollinger_bands(data, period=20)
-    bb_upper = bb_data.get("upper", [])
-    bb_middle = bb_data.get("middle", [])
-    bb_lower = bb_data.get("lower", [])
+    if bundle is None:
+        bundle = IndicatorBundle(data, ohlc)
+    # ADX detects trend changes, Bollinger Bands volatility changes
+    adx_values = bundle.adx
+    bb_upper = bundle.bb_upper
+    bb_middle = bundle.bb_middle
+    bb_lower = bundle.bb_lower
 
     # Check for regime transitions in recent periods
     lookback = min(10, len(data) - 1)
@@ -1726,21 +2205,21 @@ def detect_regime_transition(data: list[dict]) -> list[PatternMatch]:
         if i < 30:  # Need at least 30 periods to detect transitions
             continue
 
-        current_adx = adx_values[i] if i < len(adx_values) else None
-        prev_adx = adx_values[i - 5] if i >= 5 and i - 5 < len(adx_values) else None
+        current_adx = adx_values[i]
+        prev_adx = adx_values[i - 5]
 
-        current_price = to_number(data[i].get("close_price"))
-        bb_upper_val = bb_upper[i] if i < len(bb_upper) else None
-        bb_middle_val = bb_middle[i] if i < len(bb_middle) else None
-        bb_lower_val = bb_lower[i] if i < len(bb_lower) else None
+        current_price = closes[i]
+        bb_upper_val = bb_upper[i]
+        bb_middle_val = bb_middle[i]
+        bb_lower_val = bb_lower[i]
 
         if (
-            current_adx is None
-            or prev_adx is None
-            or current_price is None
-            or bb_upper_val is None
-            or bb_middle_val is None
-            or bb_lower_val is None
+            math.isnan(current_adx)
+            or math.isnan(prev_adx)
+            or math.isnan(current_price)
+            or math.isnan(bb_upper_val)
+            or math.isnan(bb_middle_val)
+            or math.isnan(bb_lower_val)
         ):
             continue
 
@@ -1750,11 +2229,15 @@ def detect_regime_transition(data: list[dict]) -> list[PatternMatch]:
         )
 
         # Get previous BB width
-        prev_bb_upper = bb_upper[i - 5] if i >= 5 and i - 5 < len(bb_upper) else None
-        prev_bb_middle = bb_middle[i - 5] if i >= 5 and i - 5 < len(bb_middle) else None
-        prev_bb_lower = bb_lower[i - 5] if i >= 5 and i - 5 < len(bb_lower) else None
+        prev_bb_upper = bb_upper[i - 5]
+        prev_bb_middle = bb_middle[i - 5]
+        prev_bb_lower = bb_lower[i - 5]
 
-        if prev_bb_upper is None or prev_bb_middle is None or prev_bb_lower is None:
+        if (
+            math.isnan(prev_bb_upper)
+            or math.isnan(prev_bb_middle)
+            or math.isnan(prev_bb_lower)
+        ):
             continue
 
         prev_bb_width = (
@@ -1764,11 +2247,7 @@ def detect_regime_transition(data: list[dict]) -> list[PatternMatch]:
         )
 
         # Get previous prices for breakout detection
-        prev_prices = [
-            to_number(data[j].get("close_price"))
-            for j in range(max(0, i - 10), i - 5)
-            if to_number(data[j].get("close_price")) is not None
-        ]
+        prev_closes = closes[max(0, i - 10) : i - 5]
 
         # Calculate transition indicators
         is_adx_transition, is_bb_transition, is_breaking_out = (
@@ -1778,7 +2257,7 @@ def detect_regime_transition(data: list[dict]) -> list[PatternMatch]:
                 current_bb_width,
                 prev_bb_width,
                 current_price,
-                prev_prices,
+                prev_closes,
             )
         )
 
@@ -1805,29 +2284,22 @@ def detect_regime_transition(data: list[dict]) -> list[PatternMatch]:
                     candles=30,
                     signal=signal,
                     confidence=confidence,
-                    description=f"Market transitioning to {transition_type} regime. ADX change: {adx_change:.2f}, BB width change: {bb_width_change * 100:.2f}%, Breaking out: {is_breaking_out}",
+                    description="Market transitioning to {} regime. ADX change: {:.2f}, BB width change: {:.2f}%, Breaking out: {}",
+                    description_args=(
+                        transition_type,
+                        adx_change,
+                        bb_width_change * 100,
+                        is_breaking_out,
+                    ),
                 )
             )
 
     return matches
 
 
-def detect_all_patterns(
-    data: list[dict], selected_patterns: list[str] | None = None
-) -> list[PatternMatch]:
-    """
-    Detect all patterns in the data.
-
-    Args:
-        data: List of price data dictionaries
-        selected_patterns: List of pattern IDs to detect (None = all patterns)
-
-    Returns:
-        List of PatternMatch objects
-    """
-    all_matches: list[PatternMatch] = []
-
-    pattern_detectors = {
+# Detector for every pattern ID detect_all_patterns accepts
+_PATTERN_DETECTORS: Mapping[str, Callable[..., list[PatternMatch]]] = MappingProxyType(
+    {
         # Candlestick Patterns
         "three_white_soldiers": detect_three_white_soldiers,
         "morning_doji_star": detect_morning_doji_star,
@@ -1858,35 +2330,190 @@ def detect_all_patterns(
         "volatile_regime": detect_volatile_regime,
         "regime_transition": detect_regime_transition,
     }
+)
+_ALL_PATTERN_IDS = tuple(_PATTERN_DETECTORS)
+
+# Shared input each detector accepts from detect_all_patterns: the candle
+# features, the pivots, the three-bar scan or the indicator bundle
+_DETECTOR_INPUTS: Mapping[Callable[..., list[PatternMatch]], str] = MappingProxyType(
+    {
+        detect_head_and_shoulders: "pivots",
+        detect_double_top: "pivots",
+        detect_double_bottom: "pivots",
+        detect_three_white_soldiers: "three_bar",
+        detect_morning_doji_star: "three_bar",
+        detect_morning_star: "three_bar",
+        detect_abandoned_baby: "three_bar",
+        detect_tri_star: "three_bar",
+        detect_advance_block: "three_bar",
+        detect_stick_sandwich: "three_bar",
+        detect_engulfing: "features",
+        detect_conceal_baby_swallow: "features",
+        detect_kicking: "features",
+        detect_spinning_top: "features",
+        detect_homing_pigeon: "features",
+        detect_trending_regime: "bundle",
+        detect_ranging_regime: "bundle",
+        detect_volatile_regime: "bundle",
+        detect_regime_transition: "bundle",
+    }
+)
+
+# Fewest bars each pattern's detector needs before it can report a match
+_MIN_BARS: Mapping[str, int] = MappingProxyType(
+    {
+        "three_white_soldiers": 3,
+        "morning_doji_star": 3,
+        "morning_star": 3,
+        "abandoned_baby": 3,
+        "conceal_baby_swallow": 4,
+        "stick_sandwich": 3,
+        "kicking": 2,
+        "engulfing": 2,
+        "bullish_engulfing": 2,
+        "bearish_engulfing": 2,
+        "homing_pigeon": 2,
+        "advance_block": 3,
+        "tri_star": 3,
+        "spinning_top": 1,
+        "head_and_shoulders": 20,
+        "double_top": 15,
+        "double_bottom": 15,
+        "flag": 10,
+        "pennant": 10,
+        "wedge": 15,
+        "rising_wedge": 15,
+        "falling_wedge": 15,
+        "trending_regime": 20,
+        "ranging_regime": 20,
+        "volatile_regime": 20,
+        "regime_transition": 30,
+    }
+)
+
+# Pattern IDs that select every pattern their detector reports
+_PATTERN_ALIASES: Mapping[str, tuple[str, ...]] = MappingProxyType(
+    {
+        "engulfing": ("bullish_engulfing", "bearish_engulfing"),
+        "wedge": ("rising_wedge", "falling_wedge"),
+    }
+)
+
+
+def _run_detector(
+    pattern_id: str, detector, data: list[dict], ohlc, inputs: dict
+) -> list[PatternMatch]:
+    """Run a single detector, logging and swallowing its errors."""
+    try:
+        matches = detector(data, ohlc=ohlc, **inputs)
+    except Exception as e:
+        logger.exception(f"Error detecting pattern {pattern_id}: {e}")
+        return []
+    if matches:
+        logger.debug(f"Pattern {pattern_id}: detected {len(matches)} matches")
+    return matches
+
+
+def detect_all_patterns(
+    data: list[dict],
+    selected_patterns: list[str] | None = None,
+    max_workers: int = 1,
+    executor=None,
+) -> list[PatternMatch]:
+    """
+    Detect all patterns in the data.
+
+    Args:
+        data: List of price data dictionaries
+        selected_patterns: List of pattern IDs to detect (None = all patterns);
+            "engulfing" and "wedge" select both of their directions
+        max_workers: Number of threads to run the detectors on (default: 1 for
+            sequential)
+        executor: Optional concurrent.futures executor to run the detectors on
+            instead, e.g. a ProcessPoolExecutor shared across symbols; takes
+            precedence over max_workers
+
+    Returns:
+        List of PatternMatch objects
+    """
+    all_matches: list[PatternMatch] = []
 
     # Only detect all patterns if selected_patterns is None (not provided)
     # If selected_patterns is an empty list, detect nothing
     if selected_patterns is None:
-        patterns_to_detect = list(pattern_detectors.keys())
+        patterns_to_detect = _ALL_PATTERN_IDS
     elif len(selected_patterns) == 0:
         patterns_to_detect = []
     else:
         patterns_to_detect = selected_patterns
 
+    # Aliases such as "engulfing" and "bullish_engulfing" share a detector,
+    # so each detector runs once and keeps the matches of every pattern
+    # selected for it. Patterns the data is too short for are skipped.
+    selected_by_detector: dict = {}
     for pattern_id in patterns_to_detect:
-        detector = pattern_detectors.get(pattern_id)
+        detector = _PATTERN_DETECTORS.get(pattern_id)
         if detector:
-            try:
-                matches = detector(data)
-                all_matches.extend(matches)
-                if matches:
-                    logger.debug(
-                        f"Pattern {pattern_id}: detected {len(matches)} matches"
-                    )
-            except Exception as e:
-                logger.exception(f"Error detecting pattern {pattern_id}: {e}")
+            if len(data) < _MIN_BARS[pattern_id]:
+                continue
+            selected_by_detector.setdefault(detector, (pattern_id, set()))[1].update(
+                _PATTERN_ALIASES.get(pattern_id, (pattern_id,))
+            )
         else:
             logger.warning(
                 f"Pattern detector not found for pattern_id: {pattern_id}. "
-                f"Available patterns: {list(pattern_detectors.keys())}"
+                f"Available patterns: {list(_ALL_PATTERN_IDS)}"
+            )
+
+    # Parse the price data, compute the candle features, find pivots, scan
+    # the three-bar patterns and create the regime indicators once, sharing
+    # them across the detectors that need them
+    ohlc = None
+    shared_inputs = {}
+    if selected_by_detector:
+        ohlc = _to_ohlc_arrays(data)
+        needed = {_DETECTOR_INPUTS.get(detector) for detector in selected_by_detector}
+        if "features" in needed or "three_bar" in needed:
+            shared_inputs["features"] = _bar_features(*ohlc)
+        if "pivots" in needed:
+            shared_inputs["pivots"] = _find_pivots(ohlc[1], ohlc[2])
+        if "three_bar" in needed:
+            shared_inputs["three_bar"] = _scan_three_bar(
+                *ohlc, features=shared_inputs["features"]
             )
+        if "bundle" in needed:
+            # The regime indicators are computed on first use, so only the
+            # ones the selected regime detectors read are ever calculated
+            shared_inputs["bundle"] = IndicatorBundle(data, ohlc)
+
+    jobs = []
+    for detector, (pattern_id, _) in selected_by_detector.items():
+        input_name = _DETECTOR_INPUTS.get(detector)
+        inputs = {input_name: shared_inputs[input_name]} if input_name else {}
+        jobs.append((pattern_id, detector, data, ohlc, inputs))
+
+    # The detectors only read the shared arrays, so they can run side by
+    # side; results are collected in submission order. Detectors and their
+    # inputs are picklable, so a process pool works as well as threads.
+    if executor is not None:
+        futures = [executor.submit(_run_detector, *job) for job in jobs]
+        results = [future.result() for future in futures]
+    elif max_workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_run_detector, *job) for job in jobs]
+            results = [future.result() for future in futures]
+    else:
+        results = [_run_detector(*job) for job in jobs]
+
+    for matches, (_, patterns) in zip(
+        results, selected_by_detector.values(), strict=True
+    ):
+        all_matches.extend(match for match in matches if match.pattern in patterns)
 
-    # Sort by index
-    all_matches.sort(key=lambda x: x.index)
+    # Sort by index; each detector reports its matches in index order, so
+    # the stable sort only has to merge those runs
+    all_matches.sort(key=operator.attrgetter("index"))
 
     return all_matches
@@ -1,5 +1,6 @@
 import logging
 
+from django.db import IntegrityError, transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
@@ -64,23 +65,13 @@ class StockSerializer(serializers.ModelSerializer):
         ]
 
     def get_market_cap_formatted(self, obj):
-        """Format market cap for display."""
-        if obj.market_cap:
-            if obj.market_cap >= 1_000_000_000:
-                return f"${obj.market_cap / 1_000_000_000:.1f}B"
-            if obj.market_cap >= 1_000_000:
-                return f"${obj.market_cap / 1_000_000:.1f}M"
-            return f"${obj.market_cap:,}"
-        return None
+        """Return the market cap display string stored on save."""
+        return obj.market_cap_formatted
 
     def get_latest_price(self, obj):
         """Get the latest stock price."""
         try:
-            latest_price = (
-                StockPrice.objects.filter(stock=obj, interval="1d")
-                .order_by("-date")
-                .first()
-            )
+            latest_price = obj.latest_price
             if latest_price:
                 return {
                     "close_price": latest_price.close_price,
@@ -613,17 +604,12 @@ class PortfolioSerializer(serializers.ModelSerializer):
 
     stock_details = StockSerializer(source="stock", read_only=True)
     stock_symbol = serializers.CharField(source="stock.symbol", read_only=True)
-    total_cost = serializers.DecimalField(
-        max_digits=12, decimal_places=4, read_only=True
-    )
-    current_value = serializers.DecimalField(
-        max_digits=12, decimal_places=4, read_only=True
-    )
-    gain_loss = serializers.DecimalField(
-        max_digits=12, decimal_places=4, read_only=True
-    )
-    gain_loss_percent = serializers.DecimalField(
-        max_digits=8, decimal_places=4, read_only=True
+    # Display-only valuations use the float properties; see Portfolio.total_cost_f
+    total_cost = serializers.FloatField(source="total_cost_f", read_only=True)
+    current_value = serializers.FloatField(source="current_value_f", read_only=True)
+    gain_loss = serializers.FloatField(source="gain_loss_f", read_only=True)
+    gain_loss_percent = serializers.FloatField(
+        source="gain_loss_percent_f", read_only=True
     )
     current_price = serializers.SerializerMethodField()
 
@@ -916,6 +902,8 @@ class TradingBotConfigSerializer(serializers.ModelSerializer):
     bot_portfolio_holdings = serializers.SerializerMethodField()
     total_equity = serializers.SerializerMethodField()
     portfolio_value = serializers.SerializerMethodField()
+    has_stocks = serializers.SerializerMethodField()
+    has_portfolio = serializers.SerializerMethodField()
 
     class Meta:
         model = TradingBotConfig
@@ -958,6 +946,8 @@ class TradingBotConfigSerializer(serializers.ModelSerializer):
             "bot_portfolio_holdings",
             "total_equity",
             "portfolio_value",
+            "has_stocks",
+            "has_portfolio",
             "created_at",
             "updated_at",
         ]
@@ -967,10 +957,20 @@ class TradingBotConfigSerializer(serializers.ModelSerializer):
             "bot_portfolio_holdings",
             "total_equity",
             "portfolio_value",
+            "has_stocks",
+            "has_portfolio",
             "created_at",
             "updated_at",
         ]
 
+    def to_representation(self, instance):
+        """Render NULL optional JSON settings as empty objects."""
+        data = super().to_representation(instance)
+        for field_name in TradingBotConfig.OPTIONAL_JSON_FIELDS:
+            if data.get(field_name) is None:
+                data[field_name] = {}
+        return data
+
     def get_bot_portfolio_holdings(self, obj):
         """Get bot portfolio holdings."""
         from .models import BotPortfolio
@@ -990,6 +990,18 @@ class TradingBotConfigSerializer(serializers.ModelSerializer):
         """Get current portfolio value."""
         return float(obj.get_portfolio_value())
 
+    def get_has_stocks(self, obj):
+        """Whether the bot has assigned stocks (annotated by with_assignment_flags)."""
+        if hasattr(obj, "has_stocks"):
+            return obj.has_stocks
+        return obj.assigned_stocks.exists()
+
+    def get_has_portfolio(self, obj):
+        """Whether the bot has portfolio budget positions."""
+        if hasattr(obj, "has_portfolio"):
+            return obj.has_portfolio
+        return obj.budget_portfolio.exists()
+
     def validate(self, data):
         """Validate bot configuration."""
         budget_type = data.get("budget_type", "cash")
@@ -1103,7 +1115,13 @@ class TradingBotConfigSerializer(serializers.ModelSerializer):
             validated_data["cash_balance"] = budget_cash
             validated_data["initial_cash"] = budget_cash
 
-        bot_config = TradingBotConfig.objects.create(**validated_data)
+        try:
+            with transaction.atomic():
+                bot_config = TradingBotConfig.objects.create(**validated_data)
+        except IntegrityError as exc:
+            raise serializers.ValidationError(
+                {"name": _("You already have a bot with this name.")}
+            ) from exc
 
         # Set many-to-many relationships
         bot_config.assigned_stocks.set(assigned_stocks)
@@ -1186,7 +1204,13 @@ class TradingBotConfigSerializer(serializers.ModelSerializer):
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        try:
+            with transaction.atomic():
+                instance.save()
+        except IntegrityError as exc:
+            raise serializers.ValidationError(
+                {"name": _("You already have a bot with this name.")}
+            ) from exc
 
         if assigned_stocks is not None:
             instance.assigned_stocks.set(assigned_stocks)
@@ -1358,11 +1382,12 @@ class TradingBotExecutionSerializer(serializers.ModelSerializer):
 
         # Try to find signal history linked to this execution
         signal_history = (
-            BotSignalHistory.objects.filter(
+            BotSignalHistory.full_objects.filter(
                 bot_config=obj.bot_config,
                 stock=obj.stock,
                 timestamp__lte=obj.timestamp,
             )
+            .select_related("payload")
             .order_by("-timestamp")
             .first()
         )
@@ -1373,12 +1398,13 @@ class TradingBotExecutionSerializer(serializers.ModelSerializer):
             time_window_end = obj.timestamp + timedelta(minutes=1)
 
             signal_history = (
-                BotSignalHistory.objects.filter(
+                BotSignalHistory.full_objects.filter(
                     bot_config=obj.bot_config,
                     stock=obj.stock,
                     timestamp__gte=time_window_start,
                     timestamp__lte=time_window_end,
                 )
+                .select_related("payload")
                 .order_by("-timestamp")
                 .first()
             )
@@ -1418,10 +1444,7 @@ class TradingBotExecutionSerializer(serializers.ModelSerializer):
                 "enabled_patterns": list(obj.bot_config.enabled_patterns.keys())
                 if obj.bot_config.enabled_patterns
                 else [],
-                "indicator_thresholds": obj.bot_config.indicator_thresholds
-                if hasattr(obj.bot_config, "indicator_thresholds")
-                and obj.bot_config.indicator_thresholds
-                else None,
+                "indicator_thresholds": obj.bot_config.indicator_thresholds or None,
             }
         return None
 
@@ -162,9 +162,7 @@ def execute_trading_bots(self, stock_symbol: str | None = None):
         logger.info("Starting trading bot execution task")
 
         # Get all active bots
-        active_bots = TradingBotConfig.objects.filter(is_active=True)
-
-        if not active_bots.exists():
+        if not TradingBotConfig.objects.filter(is_active=True).exists():
             logger.info("No active bots found")
             return {
                 "status": "success",
@@ -179,20 +177,24 @@ def execute_trading_bots(self, stock_symbol: str | None = None):
             "errors": [],
         }
 
-        # Process each active bot
-        for bot_config in active_bots:
+        # If stock_symbol is provided, only bots assigned to that stock run
+        stock = None
+        if stock_symbol:
+            stock = Stock.objects.filter(symbol=stock_symbol).first()
+            if stock is None:
+                return results
+
+        # Sweep over id/user_id rows; the full config is only loaded for
+        # bots that are actually run.
+        for bot_row in TradingBotConfig.active_ids_iter(stock=stock):
+            bot_label = bot_row["id"]
             try:
-                # If stock_symbol is provided, only process if stock is in bot's assigned stocks
-                if stock_symbol:
-                    stock = Stock.objects.filter(symbol=stock_symbol).first()
-                    if not stock or stock not in bot_config.assigned_stocks.all():
-                        continue
-
+                bot_config = TradingBotConfig.objects.get(pk=bot_row["id"])
+                bot_label = bot_config.name
                 bot = TradingBot(bot_config)
 
                 # Run analysis
-                if stock_symbol:
-                    stock = Stock.objects.get(symbol=stock_symbol)
+                if stock is not None:
                     analysis = bot.analyze_stock(stock)
 
                     # Execute trade if signal detected
@@ -207,10 +209,10 @@ def execute_trading_bots(self, stock_symbol: str | None = None):
                     # Execute trades for buy/sell signals
                     for buy_signal in bot_results.get("buy_signals", []):
                         try:
-                            stock = Stock.objects.get(symbol=buy_signal["stock"])
-                            analysis = bot.analyze_stock(stock)
+                            signal_stock = Stock.objects.get(symbol=buy_signal["stock"])
+                            analysis = bot.analyze_stock(signal_stock)
                             if analysis["action"] == "buy":
-                                order = bot.execute_trade(stock, "buy", analysis)
+                                order = bot.execute_trade(signal_stock, "buy", analysis)
                                 if order:
                                     results["trades_executed"] += 1
                         except Exception as e:
@@ -223,10 +225,14 @@ def execute_trading_bots(self, stock_symbol: str | None = None):
 
                     for sell_signal in bot_results.get("sell_signals", []):
                         try:
-                            stock = Stock.objects.get(symbol=sell_signal["stock"])
-                            analysis = bot.analyze_stock(stock)
+                            signal_stock = Stock.objects.get(
+                                symbol=sell_signal["stock"]
+                            )
+                            analysis = bot.analyze_stock(signal_stock)
                             if analysis["action"] == "sell":
-                                order = bot.execute_trade(stock, "sell", analysis)
+                                order = bot.execute_trade(
+                                    signal_stock, "sell", analysis
+                                )
                                 if order:
                                     results["trades_executed"] += 1
                         except Exception as e:
@@ -240,8 +246,8 @@ def execute_trading_bots(self, stock_symbol: str | None = None):
                 results["bots_processed"] += 1
 
             except Exception as exc:
-                logger.exception(f"Error processing bot {bot_config.name}")
-                results["errors"].append(f"Bot {bot_config.name}: {exc!s}")
+                logger.exception(f"Error processing bot {bot_label}")
+                results["errors"].append(f"Bot {bot_label}: {exc!s}")
                 continue
 
         logger.info(
@@ -266,6 +272,59 @@ def execute_trading_bots(self, stock_symbol: str | None = None):
         }
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def create_bot_config_history(
+    self,
+    config_id,
+    *,
+    config_state=None,
+    history_date=None,
+    created: bool = False,
+    history_user_id=None,
+):
+    """
+    Write the historical record for a saved TradingBotConfig.
+
+    Queued from TradingBotConfig.save() after commit so the historical INSERT
+    stays off the trading path. The record is built from the state captured
+    at save time, not from the row as it is when the task runs.
+
+    Args:
+        config_id: Primary key of the saved TradingBotConfig
+        config_state: The config serialized as JSON when it was saved
+        history_date: ISO timestamp of the change
+        created: Whether the save created the config
+        history_user_id: ID of the user that made the change, if known
+    """
+    from django.contrib.auth import get_user_model
+    from django.core import serializers
+    from django.utils.dateparse import parse_datetime
+
+    if config_state is not None:
+        config = next(serializers.deserialize("json", config_state)).object
+    else:
+        # Queued before the state was passed along; fall back to the row
+        config = TradingBotConfig.objects.filter(pk=config_id).first()
+        if config is None:
+            logger.warning(f"Bot config {config_id} no longer exists, skipping history")
+            return
+
+    history_user = None
+    if history_user_id is not None:
+        history_user = get_user_model().objects.filter(pk=history_user_id).first()
+
+    try:
+        TradingBotConfig.history.bulk_history_create(
+            [config],
+            update=not created,
+            default_user=history_user,
+            default_date=parse_datetime(history_date) if history_date else None,
+        )
+    except Exception as exc:
+        logger.exception(f"Failed to write history for bot config {config_id}")
+        raise self.retry(exc=exc) from exc
+
+
 def _save_intraday_data(stock, data, interval):
     """Helper function to save intraday data to the database."""
     try:
@@ -298,9 +357,9 @@ def _save_intraday_data(stock, data, interval):
                     )
                 )
 
-            # Bulk create for efficiency
+            # COPY-based ingest for efficiency
             if intraday_prices:
-                IntradayPrice.objects.bulk_create(intraday_prices, batch_size=1000)
+                IntradayPrice.objects.ingest(intraday_prices)
                 logger.info(
                     "Saved %s intraday price records for %s",
                     len(intraday_prices),
@@ -157,7 +157,7 @@ class TradingBotConfigFactory:
     @staticmethod
     def create(
         user: User | None = None,
-        name: str = "Test Bot",
+        name: str | None = None,
         is_active: bool = True,
         budget_type: str = "cash",
         budget_cash: Decimal = Decimal("10000.00"),
@@ -170,6 +170,9 @@ class TradingBotConfigFactory:
         """Create a TradingBotConfig instance."""
         if user is None:
             user = UserFactory.create()
+        if name is None:
+            # Bot names are unique per user
+            name = f"Test Bot {uuid.uuid4().hex[:8]}"
 
         defaults = {
             "user": user,
@@ -287,6 +287,44 @@ class TestBotExecutionWorkflow(TestCase):
             assert execution is not None
             assert execution.action == "buy"
 
+    def test_execute_trade_links_latest_signal_history(self):
+        """Test the latest signal history is linked to the execution."""
+        from stocks.models import StockTick
+        from users.models import UserProfile
+
+        profile, _ = UserProfile.objects.get_or_create(user=self.user)
+        profile.cash = Decimal("10000.00")
+        profile.save()
+        self.bot_config.cash_balance = Decimal("10000.00")
+        self.bot_config.save(update_fields=["cash_balance"])
+
+        StockTick.objects.create(
+            stock=self.stock,
+            timestamp=timezone.now(),
+            price=Decimal("100.00"),
+            volume=1000,
+        )
+        signal_history = BotSignalHistory.objects.create(
+            bot_config=self.bot_config, stock=self.stock, final_decision="buy"
+        )
+
+        analysis = {
+            "action": "buy",
+            "reason": "Test",
+            "risk_score": Decimal("50.00"),
+            "indicators": {},
+            "patterns": [],
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self.bot.execute_trade(self.stock, "buy", analysis)
+
+        assert order is not None
+        signal_history.refresh_from_db()
+        assert signal_history.execution == TradingBotExecution.objects.get(
+            executed_order=order
+        )
+
     def test_analyze_stock_no_price_data(self):
         """Test analyze_stock with no price data."""
         stock_no_data = StockFactory.create(symbol="NODATA")
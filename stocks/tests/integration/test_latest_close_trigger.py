@@ -0,0 +1,111 @@
+"""
+Integration tests for the Stock.latest_close triggers.
+
+The test settings disable migrations, so the triggers installed by the
+stocks migrations never exist in the regular test database. These tests
+migrate a throwaway SQLite database in a separate interpreter and check
+the column there.
+"""
+
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Migrates a fresh database file, then records Stock.latest_close (and the
+# latest_close_price property) after each change to the stock's prices
+TRIGGER_SCENARIO = textwrap.dedent(
+    """
+    import json
+    import os
+    import sys
+    from datetime import date
+    from decimal import Decimal
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = "config.settings.testing"
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connections
+    from django.test.utils import override_settings
+
+    connections.settings["default"]["NAME"] = sys.argv[1]
+    with override_settings(MIGRATION_MODULES={}):
+        call_command("migrate", verbosity=0)
+
+    from stocks.models import Stock, StockPrice
+    from stocks.tests.fixtures.factories import StockFactory, StockPriceFactory
+
+    stock = StockFactory.create(symbol="TRG", name="Trigger")
+    states = {}
+
+    def record(step):
+        stock.refresh_from_db()
+        states[step] = [
+            str(stock.latest_close) if stock.latest_close is not None else None,
+            str(stock.latest_close_date) if stock.latest_close_date else None,
+            str(stock.latest_close_price)
+            if stock.latest_close_price is not None
+            else None,
+        ]
+
+    older = StockPriceFactory.create(
+        stock=stock, date_obj=date(2024, 1, 2), close_price=Decimal("10")
+    )
+    newer = StockPriceFactory.create(
+        stock=stock, date_obj=date(2024, 1, 3), close_price=Decimal("12")
+    )
+    record("insert")
+
+    StockPrice.objects.filter(pk=newer.pk).update(close_price=Decimal("13"))
+    record("update_close")
+
+    StockPrice.objects.filter(pk=newer.pk).update(date=date(2024, 1, 1))
+    record("update_date")
+
+    StockPrice.objects.filter(pk=older.pk).update(interval="1h")
+    record("update_interval")
+
+    StockPrice.objects.filter(pk=newer.pk).delete()
+    record("delete")
+
+    print(json.dumps(states))
+    """
+)
+
+
+class TestLatestCloseTrigger:
+    """Test the latest_close triggers on a migrated database."""
+
+    def test_trigger_tracks_insert_update_and_delete(self, tmp_path):
+        """Test latest_close follows inserted, changed and deleted daily bars."""
+        result = subprocess.run(
+            [sys.executable, "-c", TRIGGER_SCENARIO, str(tmp_path / "db.sqlite3")],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=300,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+
+        states = json.loads(result.stdout.strip().splitlines()[-1])
+
+        assert states["insert"] == ["12.0000", "2024-01-03", "12.0000"]
+        assert states["update_close"] == ["13.0000", "2024-01-03", "13.0000"]
+        # Moving the newest bar back leaves the 2 January close newest
+        assert states["update_date"] == ["10.0000", "2024-01-02", "10.0000"]
+        # Once the 2 January bar is no longer daily, the moved bar is newest
+        assert states["update_interval"] == ["13.0000", "2024-01-01", "13.0000"]
+        # With no daily bar left the column is cleared
+        assert states["delete"] == [None, None, None]
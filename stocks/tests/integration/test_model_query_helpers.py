@@ -0,0 +1,1150 @@
+"""
+Integration tests for model-level batching and query helpers.
+"""
+
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+pytestmark = pytest.mark.integration
+
+from stocks.models import (
+    BotSignalHistory,
+    Order,
+    Portfolio,
+    Stock,
+    TradingBotConfig,
+    TradingBotExecution,
+    TradingBotSettings,
+)
+from stocks.tests.fixtures.factories import (
+    OrderFactory,
+    PortfolioFactory,
+    StockFactory,
+    StockPriceFactory,
+    TradingBotConfigFactory,
+    UserFactory,
+)
+
+
+class TestRecordBatch(TestCase):
+    """Test bulk creation of bot execution and signal history rows."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.user = UserFactory.create()
+        self.bot_config = TradingBotConfigFactory.create(user=self.user)
+        self.stocks = [
+            StockFactory.create(symbol=f"SYM{i}", name=f"Stock {i}") for i in range(3)
+        ]
+
+    def test_execution_record_batch(self):
+        """Test that record_batch inserts all executions in one go."""
+        rows = [
+            {
+                "bot_config": self.bot_config,
+                "stock": stock,
+                "action": "skip",
+                "reason": "No signal",
+            }
+            for stock in self.stocks
+        ]
+
+        with self.assertNumQueries(3):  # SAVEPOINT, INSERT, RELEASE
+            executions = TradingBotExecution.record_batch(rows)
+
+        assert len(executions) == 3
+        assert all(execution.timestamp is not None for execution in executions)
+        assert (
+            TradingBotExecution.objects.filter(bot_config=self.bot_config).count() == 3
+        )
+
+    def test_signal_history_record_batch_stores_payloads(self):
+        """Test that record_batch also stores the compressed price snapshots."""
+        rows = [
+            {
+                "bot_config": self.bot_config,
+                "stock": stock,
+                "final_decision": "hold",
+                "price_data_snapshot": {"count": idx, "data": [{"close": 1.5}]},
+            }
+            for idx, stock in enumerate(self.stocks)
+        ]
+
+        BotSignalHistory.record_batch(rows)
+
+        histories = BotSignalHistory.objects.filter(
+            bot_config=self.bot_config
+        ).select_related("payload", "stock")
+        snapshots = {h.stock.symbol: h.price_data_snapshot for h in histories}
+        assert snapshots == {
+            "SYM0": {"count": 0, "data": [{"close": 1.5}]},
+            "SYM1": {"count": 1, "data": [{"close": 1.5}]},
+            "SYM2": {"count": 2, "data": [{"close": 1.5}]},
+        }
+
+    def test_run_analysis_writes_signal_history_in_one_batch(self):
+        """Test that run_analysis() hands every signal history row to record_batch."""
+        from unittest.mock import patch
+
+        from stocks.bot_engine import TradingBot
+
+        self.bot_config.assigned_stocks.set(self.stocks)
+        for stock in self.stocks:
+            StockPriceFactory.create_series(stock, days=30)
+
+        with patch.object(
+            BotSignalHistory, "record_batch", wraps=BotSignalHistory.record_batch
+        ) as record_batch:
+            TradingBot(self.bot_config).run_analysis()
+
+        record_batch.assert_called_once()
+        assert (
+            BotSignalHistory.objects.filter(bot_config=self.bot_config).count() == 3
+        )
+
+
+class TestExecuteBotSkippedRecords(TestCase):
+    """Test the skipped-stock records written by the execute_bot view."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.user = UserFactory.create(role="admin")
+        self.bot_config = TradingBotConfigFactory.create(user=self.user)
+        self.stocks = [
+            StockFactory.create(symbol=f"SKP{i}", name=f"Skipped {i}")
+            for i in range(3)
+        ]
+        for stock in self.stocks:
+            BotSignalHistory.objects.create(
+                bot_config=self.bot_config, stock=stock, final_decision="hold"
+            )
+
+    def _execute(self, skipped):
+        from unittest.mock import patch
+
+        from rest_framework.test import APIRequestFactory, force_authenticate
+
+        from stocks.views import execute_bot
+
+        request = APIRequestFactory().post(f"/bots/{self.bot_config.pk}/execute/")
+        force_authenticate(request, user=self.user)
+        with patch(
+            "stocks.bot_engine.TradingBot.run_analysis",
+            return_value={"skipped": skipped},
+        ):
+            return execute_bot(request, pk=self.bot_config.pk)
+
+    def test_links_signal_history_with_one_query(self):
+        """Test that executions are linked to signal history in one lookup."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        skipped = [{"stock": stock.symbol, "reason": "Hold"} for stock in self.stocks]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._execute(skipped)
+
+        assert response.status_code == 200
+        history_selects = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if query["sql"].startswith('SELECT "stocks_botsignalhistory"')
+        ]
+        assert len(history_selects) == 1
+        assert all(
+            history.execution is not None
+            for history in BotSignalHistory.objects.filter(bot_config=self.bot_config)
+        )
+
+    def test_failing_record_does_not_drop_the_others(self):
+        """Test that one unstorable record leaves the rest in place."""
+        skipped = [{"stock": stock.symbol, "reason": "Hold"} for stock in self.stocks]
+        # Not JSON serializable, so inserting this record fails
+        skipped[1]["indicators"] = {"bad": object()}
+
+        response = self._execute(skipped)
+
+        assert response.status_code == 200
+        executions = TradingBotExecution.objects.filter(bot_config=self.bot_config)
+        assert sorted(executions.values_list("stock__symbol", flat=True)) == [
+            "SKP0",
+            "SKP2",
+        ]
+
+
+class TestBotConfigHistory(TestCase):
+    """Test that bot config history is written after commit."""
+
+    def test_history_written_on_commit(self):
+        """Test that saving a config queues its history row until commit."""
+        user = UserFactory.create()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            config = TradingBotConfigFactory.create(user=user)
+        assert config.history.count() == 0
+        assert len(callbacks) == 1
+
+        with self.captureOnCommitCallbacks(execute=True):
+            config.cash_balance = 500
+            config.save(update_fields=["cash_balance"])
+
+        history_types = list(
+            TradingBotConfig.history.filter(id=config.id).values_list(
+                "history_type", flat=True
+            )
+        )
+        assert history_types == ["~"]
+
+    def test_history_records_each_change(self):
+        """Test that queued records keep the balance and time of each change."""
+        config = TradingBotConfigFactory.create(cash_balance=Decimal("100.00"))
+        TradingBotConfig.history.filter(id=config.id).delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            before = timezone.now()
+            assert config.adjust_cash_balance(Decimal("-10"))
+            assert config.adjust_cash_balance(Decimal("-20"))
+            after = timezone.now()
+
+        records = TradingBotConfig.history.filter(id=config.id).order_by(
+            "history_date"
+        )
+        assert [record.cash_balance for record in records] == [
+            Decimal("90.00"),
+            Decimal("70.00"),
+        ]
+        assert all(before <= record.history_date <= after for record in records)
+
+
+class TestBotConfigClean(TestCase):
+    """Test TradingBotConfig.clean() query usage."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.user = UserFactory.create()
+        self.stock = StockFactory.create(symbol="CLN", name="Clean Stock")
+
+    def test_clean_unsaved_skips_queries(self):
+        """Test that an unsaved config is validated without touching the DB."""
+        config = TradingBotConfig(user=self.user, name="Draft", budget_cash=1000)
+
+        with self.assertNumQueries(0):
+            config.clean()
+
+    def test_clean_saved_uses_single_query(self):
+        """Test that M2M checks on a saved config run as one aggregate."""
+        config = TradingBotConfigFactory.create(user=self.user)
+        config.assigned_stocks.set([self.stock])
+
+        with self.assertNumQueries(1):
+            config.clean()
+
+    def test_clean_requires_assigned_stocks(self):
+        """Test that a saved config without stocks fails validation."""
+        from django.core.exceptions import ValidationError
+
+        config = TradingBotConfigFactory.create(user=self.user)
+
+        with pytest.raises(ValidationError):
+            config.clean()
+
+
+class TestStockLatestClose(TestCase):
+    """Test the denormalized Stock.latest_close column."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.stock = StockFactory.create(symbol="LTC", name="Latest Close")
+        StockPriceFactory.create(
+            stock=self.stock, date_obj=date(2024, 1, 2), close_price=Decimal("10")
+        )
+        StockPriceFactory.create(
+            stock=self.stock, date_obj=date(2024, 1, 3), close_price=Decimal("12")
+        )
+
+    def test_backfill_command(self):
+        """Test that the backfill command copies the newest daily close."""
+        call_command("backfill_latest_close")
+
+        self.stock.refresh_from_db()
+        assert self.stock.latest_close == Decimal("12")
+        assert self.stock.latest_close_date == date(2024, 1, 3)
+
+    def test_current_value_uses_latest_close(self):
+        """Test that portfolio valuation reads the column without a price query."""
+        Stock.objects.filter(pk=self.stock.pk).update(
+            latest_close=Decimal("20"), latest_close_date=date(2024, 1, 3)
+        )
+        portfolio = PortfolioFactory.create(stock=self.stock, quantity=5)
+        portfolio = type(portfolio).objects.select_related("stock").get(pk=portfolio.pk)
+
+        with self.assertNumQueries(0):
+            assert portfolio.current_value == Decimal("100")
+
+    def test_save_keeps_trigger_columns(self):
+        """Test that saving a stale Stock instance does not reset latest_close."""
+        stale = Stock.objects.get(pk=self.stock.pk)
+        Stock.objects.filter(pk=self.stock.pk).update(latest_close=Decimal("12"))
+
+        stale.name = "Renamed"
+        stale.save()
+
+        self.stock.refresh_from_db()
+        assert self.stock.name == "Renamed"
+        assert self.stock.latest_close == Decimal("12")
+
+    def test_save_deferred_instance_does_not_load_fields(self):
+        """Test that saving an .only() instance issues a single UPDATE."""
+        partial = Stock.objects.only("id", "name").get(pk=self.stock.pk)
+        partial.name = "Partial"
+        # The history row reads every tracked field; only the save is measured
+        partial.skip_history_when_saving = True
+
+        with self.assertNumQueries(1):
+            partial.save()
+
+        self.stock.refresh_from_db()
+        assert self.stock.name == "Partial"
+
+    def test_save_force_insert(self):
+        """Test that force_insert inserts a copy of a loaded stock."""
+        copy = Stock.objects.get(pk=self.stock.pk)
+        copy.pk = uuid.uuid4()
+        copy.symbol = "COPY"
+        copy.save(force_insert=True)
+
+        assert Stock.objects.filter(pk=copy.pk, symbol="COPY").exists()
+
+    def test_save_reinserts_deleted_row(self):
+        """Test that re-saving a deleted stock inserts it again."""
+        stock = StockFactory.create(symbol="GONE", name="Deleted")
+        pk = stock.pk
+        Stock.objects.filter(pk=pk).delete()
+
+        stock.save()
+
+        assert Stock.objects.filter(pk=pk, symbol="GONE").exists()
+
+
+class TestPortfolioFloatValuation(TestCase):
+    """Test the float display properties on Portfolio."""
+
+    def test_float_properties_match_decimal(self):
+        """Test that the *_f properties agree with the Decimal properties."""
+        stock = StockFactory.create(symbol="FLT", name="Float Stock")
+        StockPriceFactory.create(stock=stock, close_price=Decimal("175.25"))
+        portfolio = PortfolioFactory.create(
+            stock=stock, quantity=8, purchase_price=Decimal("150.10")
+        )
+
+        assert portfolio.total_cost_f == float(portfolio.total_cost)
+        assert portfolio.current_value_f == float(portfolio.current_value)
+        assert portfolio.gain_loss_f == float(portfolio.gain_loss)
+        assert portfolio.gain_loss_percent_f == round(
+            float(portfolio.gain_loss_percent), 4
+        )
+
+
+class TestBotConfigOptionalJson(TestCase):
+    """Test NULL storage of empty optional JSON settings."""
+
+    def test_empty_json_saved_as_null(self):
+        """Test that empty optional settings are stored as NULL."""
+        config = TradingBotConfigFactory.create(buy_rules={}, signal_thresholds={})
+
+        stored = TradingBotConfig.objects.filter(pk=config.pk).values(
+            "buy_rules", "signal_thresholds"
+        )[0]
+        assert stored == {"buy_rules": None, "signal_thresholds": None}
+
+    def test_serializer_renders_null_as_empty(self):
+        """Test that the API still returns empty objects for NULL settings."""
+        from stocks.serializers import TradingBotConfigSerializer
+
+        config = TradingBotConfigFactory.create()
+        data = TradingBotConfigSerializer(config).data
+
+        for field_name in TradingBotConfig.OPTIONAL_JSON_FIELDS:
+            assert data[field_name] == {}
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TestTradingBotSettingsCache(TestCase):
+    """Test caching of the TradingBotSettings singleton."""
+
+    def setUp(self):
+        """Start from an empty cache."""
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def test_load_is_cached(self):
+        """Test that repeated loads do not query the database."""
+        TradingBotSettings.load()
+
+        with self.assertNumQueries(0):
+            TradingBotSettings.load()
+
+    def test_save_invalidates_cache(self):
+        """Test that saving the settings drops the cached instance."""
+        settings = TradingBotSettings.load()
+        settings.default_indicator_thresholds = {"rsi": {"oversold": 25}}
+        settings.save()
+
+        loaded = TradingBotSettings.load()
+        assert loaded.default_indicator_thresholds == {"rsi": {"oversold": 25}}
+
+
+class TestBotSignalHistoryManagers(TestCase):
+    """Test the deferring default manager on BotSignalHistory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.bot_config = TradingBotConfigFactory.create()
+        self.stock = StockFactory.create(symbol="DEF", name="Deferred")
+        BotSignalHistory.objects.create(
+            bot_config=self.bot_config,
+            stock=self.stock,
+            final_decision="buy",
+            ml_signals={"score": 0.9},
+        )
+
+    def test_objects_defers_signal_columns(self):
+        """Test that the default manager leaves JSON columns unloaded."""
+        history = BotSignalHistory.objects.get(bot_config=self.bot_config)
+
+        assert set(BotSignalHistory.objects.DEFERRED_FIELDS) <= (
+            history.get_deferred_fields()
+        )
+
+    def test_full_objects_loads_signal_columns(self):
+        """Test that full_objects loads every column in one query."""
+        with self.assertNumQueries(1):
+            history = BotSignalHistory.full_objects.get(bot_config=self.bot_config)
+            assert history.ml_signals == {"score": 0.9}
+
+
+class TestBotConfigAssignmentFlags(TestCase):
+    """Test TradingBotConfig.objects.with_assignment_flags()."""
+
+    def test_flags_annotated_in_one_query(self):
+        """Test that the flags come back with the configs in a single query."""
+        user = UserFactory.create()
+        stock = StockFactory.create(symbol="FLG", name="Flag Stock")
+        with_stock = TradingBotConfigFactory.create(user=user, name="With stock")
+        with_stock.assigned_stocks.set([stock])
+        TradingBotConfigFactory.create(user=user, name="Empty")
+
+        with self.assertNumQueries(1):
+            flags = {
+                config.name: (config.has_stocks, config.has_portfolio)
+                for config in TradingBotConfig.objects.filter(
+                    user=user
+                ).with_assignment_flags()
+            }
+
+        assert flags == {"With stock": (True, False), "Empty": (False, False)}
+
+
+class TestPortfolioGeneratedTotalCost(TestCase):
+    """Test the database-generated Portfolio.total_cost column."""
+
+    def test_total_cost_computed_by_database(self):
+        """Test that total_cost follows quantity and purchase_price."""
+        portfolio = PortfolioFactory.create(quantity=3, purchase_price=Decimal("12.50"))
+        assert portfolio.total_cost == Decimal("37.5")
+
+        portfolio.quantity = 4
+        portfolio.save()
+        portfolio.refresh_from_db()
+        assert portfolio.total_cost == Decimal("50")
+
+    def test_total_cost_current_after_save(self):
+        """Test that a saved holding reports the new cost without a reload."""
+        stock = StockFactory.create(symbol="TCS", name="Total Cost Save")
+        StockPriceFactory.create(stock=stock, close_price=Decimal("20"))
+        portfolio = PortfolioFactory.create(
+            stock=stock, quantity=2, purchase_price=Decimal("10")
+        )
+
+        portfolio.quantity = 5
+        portfolio.save(update_fields=["quantity"])
+
+        assert portfolio.total_cost == Decimal("50")
+        assert portfolio.gain_loss == Decimal("50")
+        assert portfolio.gain_loss_percent == Decimal("100")
+
+    def test_total_cost_aggregates_in_sql(self):
+        """Test that per-user totals can be summed without Python arithmetic."""
+        from django.db.models import Sum
+
+        from stocks.models import Portfolio
+
+        user = UserFactory.create()
+        for symbol, quantity, price in [("TC1", 2, "10"), ("TC2", 1, "5")]:
+            PortfolioFactory.create(
+                user=user,
+                stock=StockFactory.create(symbol=symbol, name=symbol),
+                quantity=quantity,
+                purchase_price=Decimal(price),
+            )
+
+        total = Portfolio.objects.filter(user=user).aggregate(total=Sum("total_cost"))
+        assert total["total"] == Decimal("25")
+
+
+class TestActiveIdsIter(TestCase):
+    """Test TradingBotConfig.active_ids_iter()."""
+
+    def test_active_ids_iter_filters_by_stock(self):
+        """Test that only active bots (assigned to the stock) are returned."""
+        user = UserFactory.create()
+        stock = StockFactory.create(symbol="ACT", name="Active Stock")
+        assigned = TradingBotConfigFactory.create(user=user, name="Assigned")
+        assigned.assigned_stocks.set([stock])
+        unassigned = TradingBotConfigFactory.create(user=user, name="Unassigned")
+        TradingBotConfigFactory.create(user=user, name="Inactive", is_active=False)
+
+        all_rows = list(TradingBotConfig.active_ids_iter())
+        stock_rows = list(TradingBotConfig.active_ids_iter(stock=stock))
+
+        assert {row["id"] for row in all_rows} == {assigned.id, unassigned.id}
+        assert stock_rows == [{"id": assigned.id, "user_id": user.id}]
+
+
+class TestBotNameUniqueness(TestCase):
+    """Test the per-user unique bot name constraint."""
+
+    def test_duplicate_name_reported_as_validation_error(self):
+        """Test that the serializer turns the constraint into a name error."""
+        from rest_framework.exceptions import ValidationError
+
+        from stocks.serializers import TradingBotConfigSerializer
+
+        user = UserFactory.create()
+        stock = StockFactory.create(symbol="UNQ", name="Unique Stock")
+        TradingBotConfigFactory.create(user=user, name="Momentum")
+
+        serializer = TradingBotConfigSerializer(
+            data={
+                "name": "Momentum",
+                "budget_type": "cash",
+                "budget_cash": "1000.00",
+                "assigned_stocks": [str(stock.id)],
+            }
+        )
+        assert serializer.is_valid(), serializer.errors
+
+        with pytest.raises(ValidationError) as exc_info:
+            serializer.save(user=user)
+        assert "name" in exc_info.value.detail
+
+
+class TestOrderExecuteBatch(TestCase):
+    """Test executing waiting orders as one batch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        from users.models import UserProfile
+
+        self.user = UserFactory.create()
+        self.profile = UserProfile.objects.get(user=self.user)
+        self.profile.cash = Decimal("1000.00")
+        self.profile.save()
+        self.stock = StockFactory.create(symbol="BATCH", name="Batch Corp")
+        StockPriceFactory.create(
+            stock=self.stock, date_obj=date(2024, 1, 1), close_price=Decimal("90.00")
+        )
+        StockPriceFactory.create(
+            stock=self.stock, date_obj=date(2024, 1, 2), close_price=Decimal("100.00")
+        )
+
+    def test_executes_waiting_orders_at_latest_close(self):
+        """Test that waiting orders execute against the latest daily close."""
+        orders = [
+            OrderFactory.create(user=self.user, stock=self.stock, quantity=Decimal("3"))
+            for _ in range(2)
+        ]
+        OrderFactory.create(user=self.user, stock=self.stock, status="cancelled")
+
+        results = Order.execute_batch(Order.objects.all())
+
+        assert {order.pk for order, _ in results} == {order.pk for order in orders}
+        assert all(executed for _, executed in results)
+        assert all(order.executed_price == Decimal("100.00") for order, _ in results)
+        self.profile.refresh_from_db()
+        assert self.profile.cash == Decimal("400.00")
+
+    def test_shared_profile_stops_overspending(self):
+        """Test that later orders see cash spent by earlier orders."""
+        for _ in range(2):
+            OrderFactory.create(user=self.user, stock=self.stock, quantity=Decimal("6"))
+
+        results = Order.execute_batch(Order.objects.order_by("created_at"))
+
+        assert [executed for _, executed in results] == [True, False]
+        self.profile.refresh_from_db()
+        assert self.profile.cash == Decimal("400.00")
+
+    def test_with_executability_matches_can_execute(self):
+        """Test the SQL screen agrees with can_execute for each order shape."""
+        other = StockFactory.create(symbol="HELD", name="Held Corp")
+        StockPriceFactory.create(stock=other, close_price=Decimal("50.00"))
+        PortfolioFactory.create(user=self.user, stock=other, quantity=5)
+        bot_config = TradingBotConfigFactory.create(user=self.user)
+        TradingBotConfig.objects.filter(pk=bot_config.pk).update(
+            cash_balance=Decimal("150.00")
+        )
+
+        expected = {
+            OrderFactory.create(
+                user=self.user, stock=self.stock, quantity=Decimal("5")
+            ).pk: True,
+            OrderFactory.create(
+                user=self.user, stock=self.stock, quantity=Decimal("20")
+            ).pk: False,
+            OrderFactory.create(
+                user=self.user,
+                stock=self.stock,
+                quantity=Decimal("1"),
+                order_type="target",
+                target_price=Decimal("105.00"),
+            ).pk: True,
+            OrderFactory.create(
+                user=self.user,
+                stock=self.stock,
+                quantity=Decimal("1"),
+                order_type="target",
+                target_price=Decimal("95.00"),
+            ).pk: False,
+            OrderFactory.create(
+                user=self.user,
+                stock=self.stock,
+                transaction_type="sell",
+                quantity=Decimal("1"),
+            ).pk: False,
+            OrderFactory.create(
+                user=self.user,
+                stock=other,
+                transaction_type="sell",
+                quantity=Decimal("5"),
+            ).pk: True,
+            OrderFactory.create(
+                user=self.user,
+                stock=self.stock,
+                quantity=Decimal("50"),
+                bot_config=bot_config,
+            ).pk: True,
+        }
+
+        with self.assertNumQueries(1):
+            screened = dict(
+                Order.objects.with_executability().values_list("pk", "is_executable")
+            )
+
+        assert screened == expected
+        for order in Order.objects.filter(pk__in=expected):
+            assert order.can_execute == expected[order.pk]
+
+
+class TestStockLatestPriceCache(TestCase):
+    """Test bulk and primed latest price lookups."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.stocks = [
+            StockFactory.create(symbol=f"LP{i}", name=f"Latest {i}") for i in range(3)
+        ]
+        for i, stock in enumerate(self.stocks[:2]):
+            StockPriceFactory.create(
+                stock=stock, date_obj=date(2024, 1, 1), close_price=Decimal("10.00")
+            )
+            StockPriceFactory.create(
+                stock=stock,
+                date_obj=date(2024, 1, 2),
+                close_price=Decimal("20.00") + i,
+            )
+
+    def test_bulk_latest_prices(self):
+        """Test that one query returns the newest price per stock."""
+        with self.assertNumQueries(1):
+            prices = Stock.bulk_latest_prices(stock.pk for stock in self.stocks)
+
+        assert {pk: price.close_price for pk, price in prices.items()} == {
+            self.stocks[0].pk: Decimal("20.00"),
+            self.stocks[1].pk: Decimal("21.00"),
+        }
+
+    def test_prefetch_latest_prices_primes_instances(self):
+        """Test that primed stocks answer latest_price without queries."""
+        stocks = Stock.prefetch_latest_prices(
+            Stock.objects.filter(pk__in=[stock.pk for stock in self.stocks])
+        )
+
+        with self.assertNumQueries(0):
+            closes = {
+                stock.symbol: stock.latest_price and stock.latest_price.close_price
+                for stock in stocks
+            }
+
+        assert closes == {
+            "LP0": Decimal("20.00"),
+            "LP1": Decimal("21.00"),
+            "LP2": None,
+        }
+
+
+class TestOrderExecuteWrites(TestCase):
+    """Test the writes issued when an order executes."""
+
+    def test_execute_marks_order_done_in_one_update(self):
+        """Test that no intermediate in_progress row is written."""
+        from users.models import UserProfile
+
+        user = UserFactory.create()
+        UserProfile.objects.filter(user=user).update(cash=Decimal("1000.00"))
+        stock = StockFactory.create(symbol="ONCE", name="Once Corp")
+        StockPriceFactory.create(stock=stock, close_price=Decimal("50.00"))
+        order = OrderFactory.create(user=user, stock=stock, quantity=Decimal("2"))
+
+        assert order.execute()
+
+        assert [record.status for record in order.history.order_by("history_date")] == [
+            "waiting",
+            "done",
+        ]
+        order.refresh_from_db()
+        assert order.executed_price == Decimal("50.00")
+
+    def test_first_buy_inserts_holding_once(self):
+        """Test that a new holding is written by a single INSERT."""
+        from users.models import UserProfile
+
+        user = UserFactory.create()
+        UserProfile.objects.filter(user=user).update(cash=Decimal("1000.00"))
+        stock = StockFactory.create(symbol="UPS1", name="Upsert Corp")
+        StockPriceFactory.create(stock=stock, close_price=Decimal("50.00"))
+
+        OrderFactory.create(user=user, stock=stock, quantity=Decimal("2")).execute()
+        OrderFactory.create(user=user, stock=stock, quantity=Decimal("2")).execute()
+
+        holding = Portfolio.objects.get(user=user, stock=stock)
+        assert holding.quantity == 4
+        assert [record.history_type for record in holding.history.all()] == [
+            "~",
+            "+",
+        ]
+
+    def test_execute_prices_from_stock_price_row(self):
+        """Test that execution prices from StockPrice, not Stock.latest_close."""
+        from users.models import UserProfile
+
+        user = UserFactory.create()
+        UserProfile.objects.filter(user=user).update(cash=Decimal("1000.00"))
+        stock = StockFactory.create(symbol="DNRM", name="Denorm Corp")
+        StockPriceFactory.create(stock=stock, close_price=Decimal("50.00"))
+        Stock.objects.filter(pk=stock.pk).update(
+            latest_close=Decimal("42.00"), latest_close_date=date(2024, 1, 2)
+        )
+        order = OrderFactory.create(
+            user=user, stock=Stock.objects.get(pk=stock.pk), quantity=Decimal("2")
+        )
+
+        assert order.execute()
+        assert order.executed_price == Decimal("50.00")
+
+    def test_execute_rejects_buy_against_stale_cash(self):
+        """Test the cash check runs against the row, not the loaded profile."""
+        from users.models import UserProfile
+
+        user = UserFactory.create()
+        UserProfile.objects.filter(user=user).update(cash=Decimal("1000.00"))
+        stock = StockFactory.create(symbol="RACE", name="Race Corp")
+        StockPriceFactory.create(stock=stock, close_price=Decimal("50.00"))
+        order = OrderFactory.create(user=user, stock=stock, quantity=Decimal("4"))
+        order._user_profile_cache = UserProfile.objects.get(user=user)
+        # Another order spends the cash after the profile was loaded
+        UserProfile.objects.filter(user=user).update(cash=Decimal("100.00"))
+
+        assert not order.execute()
+
+        assert order.status == "insufficient_funds"
+        assert UserProfile.objects.get(user=user).cash == Decimal("100.00")
+
+    def test_sell_reads_holding_and_profile_once(self):
+        """Test the checks and the writes share one execution context."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        user = UserFactory.create()
+        stock = StockFactory.create(symbol="FUSE", name="Fuse Corp")
+        StockPriceFactory.create(stock=stock, close_price=Decimal("50.00"))
+        PortfolioFactory.create(user=user, stock=stock, quantity=5)
+        order = OrderFactory.create(
+            user=user, stock=stock, transaction_type="sell", quantity=Decimal("2")
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert order.execute()
+
+        selects = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        assert len([sql for sql in selects if 'FROM "stocks_portfolio"' in sql]) == 1
+        # adjust_cash() re-reads the locked row by pk; the lookup by user runs once
+        assert (
+            len([sql for sql in selects if '"users_userprofile"."user_id" =' in sql])
+            == 1
+        )
+        assert Portfolio.objects.get(user=user, stock=stock).quantity == 3
+
+    def test_execute_does_not_log_cash_balance(self):
+        """Test the user's cash balance is kept out of the execution logs."""
+        from users.models import UserProfile
+
+        user = UserFactory.create()
+        UserProfile.objects.filter(user=user).update(cash=Decimal("1234.56"))
+        stock = StockFactory.create(symbol="QUIET", name="Quiet Corp")
+        StockPriceFactory.create(stock=stock, close_price=Decimal("50.00"))
+        order = OrderFactory.create(user=user, stock=stock, quantity=Decimal("2"))
+
+        with self.assertLogs("stocks.models", level="INFO") as logs:
+            assert order.execute()
+
+        assert not [line for line in logs.output if "1234.56" in line]
+
+    def test_adjust_cash_writes_history(self):
+        """Test the F() cash update reloads the balance and records history."""
+        from users.models import UserProfile
+
+        profile = UserFactory.create().profile
+        UserProfile.objects.filter(pk=profile.pk).update(cash=Decimal("500.00"))
+        history_count = profile.history.count()
+
+        assert profile.adjust_cash(Decimal("-200.00"))
+        assert not profile.adjust_cash(Decimal("-400.00"))
+
+        assert profile.cash == Decimal("300.00")
+        assert profile.history.count() == history_count + 1
+        assert profile.history.first().cash == Decimal("300.00")
+
+    def test_adjust_cash_history_records_request_user(self):
+        """Test the history row names the user of the current request."""
+        from django.test import RequestFactory
+        from simple_history.models import HistoricalRecords
+
+        user = UserFactory.create()
+        profile = user.profile
+        request = RequestFactory().post("/orders/")
+        request.user = user
+
+        HistoricalRecords.context.request = request
+        try:
+            assert profile.adjust_cash(Decimal("10.00"))
+        finally:
+            del HistoricalRecords.context.request
+
+        assert profile.history.first().history_user == user
+
+    def test_adjust_bot_cash_balance(self):
+        """Test the bot cash update refuses to go negative."""
+        bot_config = TradingBotConfigFactory.create(user=UserFactory.create())
+        TradingBotConfig.objects.filter(pk=bot_config.pk).update(
+            cash_balance=Decimal("100.00")
+        )
+
+        assert bot_config.adjust_cash_balance(Decimal("-60.00"))
+        assert not bot_config.adjust_cash_balance(Decimal("-60.00"))
+        assert bot_config.cash_balance == Decimal("40.00")
+
+    def test_adjust_cash_returns_balance_without_select(self):
+        """Test the new balance comes back from the UPDATE itself."""
+        from users.models import UserProfile
+
+        profile = UserFactory.create().profile
+        # Another writer changes the balance behind this instance's back
+        UserProfile.objects.filter(pk=profile.pk).update(cash=Decimal("750.25"))
+
+        with self.assertNumQueries(2):  # UPDATE ... RETURNING + history INSERT
+            assert profile.adjust_cash(Decimal("-0.25"))
+
+        assert profile.cash == Decimal("750.00")
+
+
+class TestBulkIngest(TestCase):
+    """Test the COPY-based ingest manager and its fallback."""
+
+    def test_ingest_skips_conflicting_rows(self):
+        """Test that rows clashing with existing prices are skipped."""
+        from stocks.models import StockPrice
+
+        from datetime import UTC, datetime
+
+        stock = StockFactory.create(symbol="INGS", name="Ingest Corp")
+
+        def price(day):
+            return StockPrice(
+                stock=stock,
+                date=date(2024, 1, day),
+                timestamp=datetime(2024, 1, day, 21, tzinfo=UTC),
+                open_price=Decimal("10.00"),
+                high_price=Decimal("11.00"),
+                low_price=Decimal("9.00"),
+                close_price=Decimal("10.50"),
+                volume=100,
+                interval="1d",
+            )
+
+        StockPrice.objects.ingest([price(1)])
+        StockPrice.objects.ingest([price(1), price(2), price(3)])
+
+        assert sorted(
+            StockPrice.objects.filter(stock=stock).values_list("date__day", flat=True)
+        ) == [1, 2, 3]
+
+    def test_ingest_empty(self):
+        """Test that an empty batch does not touch the database."""
+        from stocks.models import StockTick
+
+        with self.assertNumQueries(0):
+            assert StockTick.objects.ingest([]) == 0
+
+    def test_copy_text_escapes_values(self):
+        """Test COPY text-format rendering of NULLs and control characters."""
+        from stocks.models import _copy_text
+
+        assert _copy_text(None) == "\\N"
+        assert _copy_text("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+        assert _copy_text(Decimal("1.50")) == "1.50"
+
+
+class TestEnableTimescale(TestCase):
+    """Test the hypertable conversion command outside PostgreSQL."""
+
+    def test_requires_postgresql(self):
+        """Test that non-PostgreSQL databases are rejected up front."""
+        from django.core.management.base import CommandError
+
+        with pytest.raises(CommandError, match="PostgreSQL"):
+            call_command("enable_timescale")
+
+
+class TestPriceMetricAnnotations(TestCase):
+    """Test the SQL-computed price metrics match the Python properties."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.stock = StockFactory.create(symbol="METR", name="Metrics Corp")
+
+    def test_stock_price_with_metrics(self):
+        """Test annotated price change matches the property fallback."""
+        from stocks.models import StockPrice
+
+        StockPriceFactory.create(
+            stock=self.stock,
+            date=date(2024, 1, 2),
+            open_price=Decimal("200.00"),
+            high_price=Decimal("210.00"),
+            low_price=Decimal("100.00"),
+            close_price=Decimal("103.00"),
+        )
+
+        annotated = StockPrice.objects.with_metrics().get(stock=self.stock)
+        plain = StockPrice.objects.get(stock=self.stock)
+
+        assert annotated.price_change == plain.price_change == Decimal("-97.00")
+        assert annotated.price_change_percent == Decimal("-48.5")
+        assert plain.price_change_percent == Decimal("-48.5")
+
+    def test_intraday_price_with_metrics(self):
+        """Test annotated intraday metrics including the typical price."""
+        from datetime import UTC, datetime
+
+        from stocks.models import IntradayPrice
+
+        IntradayPrice.objects.create(
+            stock=self.stock,
+            timestamp=datetime(2024, 1, 2, 15, tzinfo=UTC),
+            interval="1m",
+            open_price=Decimal("10.00"),
+            high_price=Decimal("12.00"),
+            low_price=Decimal("9.00"),
+            close_price=Decimal("11.00"),
+            volume=100,
+        )
+
+        annotated = IntradayPrice.objects.with_metrics().get(stock=self.stock)
+
+        assert annotated.price_change == Decimal("1.00")
+        assert annotated.price_change_percent == Decimal("10.00")
+        assert annotated.typical_price.quantize(Decimal("0.0001")) == Decimal("10.6667")
+
+    def test_stock_tick_with_metrics(self):
+        """Test the spread annotations, including ticks without a quote."""
+        from stocks.models import StockTick
+
+        StockTick.objects.create(
+            stock=self.stock,
+            timestamp=timezone.now(),
+            price=Decimal("100.00"),
+            volume=10,
+            bid_price=Decimal("99.50"),
+            ask_price=Decimal("100.50"),
+        )
+        StockTick.objects.create(
+            stock=self.stock,
+            timestamp=timezone.now(),
+            price=Decimal("100.00"),
+            volume=10,
+        )
+
+        quoted, unquoted = StockTick.objects.with_metrics().order_by("-bid_price")
+        if quoted.bid_price is None:
+            quoted, unquoted = unquoted, quoted
+
+        assert quoted.spread == Decimal("1.00")
+        assert quoted.spread_percentage.quantize(Decimal("0.0001")) == Decimal("1.0050")
+        assert unquoted.spread is None
+        assert unquoted.spread_percentage is None
+
+
+class TestSmallIntCodeField(TestCase):
+    """Test string codes stored as smallints on the tick/intraday tables."""
+
+    def test_codes_round_trip_through_smallint(self):
+        """Test the column holds the integer while Python sees the code."""
+        from django.db import connection
+
+        from stocks.models import StockTick
+
+        stock = StockFactory.create(symbol="CODE", name="Code Corp")
+        tick = StockTick.objects.create(
+            stock=stock,
+            timestamp=timezone.now(),
+            price=Decimal("10.00"),
+            volume=1,
+            trade_type="sell",
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT trade_type FROM stocks_stocktick WHERE id = %s",
+                [tick.pk],
+            )
+            assert cursor.fetchone()[0] == 2
+
+        tick.refresh_from_db()
+        assert tick.trade_type == "sell"
+        assert tick.get_trade_type_display() == "Sell"
+        assert StockTick.objects.filter(trade_type="sell").count() == 1
+        assert StockTick.objects.filter(trade_type__in=["buy", "market"]).count() == 0
+
+    def test_unknown_code_is_rejected(self):
+        """Test codes outside the mapping fail validation and lookups."""
+        from django.core.exceptions import ValidationError
+
+        from stocks.models import IntradayPrice
+
+        field = IntradayPrice._meta.get_field("session_type")
+
+        assert field.clean("regular", None) == "regular"
+        with pytest.raises(ValidationError):
+            field.clean("overnight", None)
+        with pytest.raises(ValueError, match="unknown code"):
+            IntradayPrice.objects.filter(session_type="overnight").count()
+
+
+class TestStockMarketCapFormatted(TestCase):
+    """Test the market cap display string is stored on save."""
+
+    def test_market_cap_formatted_follows_market_cap(self):
+        """Test full and update_fields saves refresh the stored string."""
+        from stocks.serializers import StockSerializer
+
+        stock = StockFactory.create(
+            symbol="MCAP", name="Cap Corp", market_cap=2_500_000_000
+        )
+        assert stock.market_cap_formatted == "$2.5B"
+
+        stock.market_cap = 750_000_000
+        stock.save(update_fields=["market_cap"])
+        assert Stock.objects.get(pk=stock.pk).market_cap_formatted == "$750.0M"
+
+        stock.market_cap = 2_500_000_000_000
+        stock.save()
+        stock.refresh_from_db()
+        assert stock.market_cap_formatted == "$2.5T"
+
+        stock.market_cap = None
+        stock.save()
+        stock.refresh_from_db()
+        assert stock.market_cap_formatted == "N/A"
+        assert StockSerializer(stock).data["market_cap_formatted"] == "N/A"
+
+
+class TestPriceTablePrimaryKeys(TestCase):
+    """Test the high-volume price tables use sequential bigint keys."""
+
+    def test_keys_increase_with_insert_order(self):
+        """Test each new row gets a larger integer id than the last."""
+        from stocks.models import IntradayPrice, StockPrice, StockTick
+
+        stock = StockFactory.create(symbol="SEQ", name="Sequence Corp")
+        now = timezone.now()
+        ticks = [
+            StockTick.objects.create(
+                stock=stock,
+                timestamp=now + timedelta(seconds=i),
+                price=Decimal("10.00"),
+                volume=1,
+            )
+            for i in range(3)
+        ]
+
+        ids = [tick.pk for tick in ticks]
+        assert all(isinstance(pk, int) for pk in ids)
+        assert ids == sorted(ids)
+        assert len(set(ids)) == 3
+        for model in (StockPrice, StockTick, IntradayPrice):
+            assert model._meta.pk.get_internal_type() == "BigAutoField"
+
+
+class TestLiteQuerySets(TestCase):
+    """Test the lite() helpers skip the free-text columns."""
+
+    def test_lite_defers_text_columns(self):
+        """Test notes and the stock description are left unloaded."""
+        user = UserFactory.create()
+        stock = StockFactory.create(symbol="LITE", name="Lite Corp")
+        PortfolioFactory.create(user=user, stock=stock, quantity=5)
+        OrderFactory.create(user=user, stock=stock)
+
+        assert Stock.objects.lite().get(pk=stock.pk).get_deferred_fields() == {
+            "description"
+        }
+        for model in (Portfolio, Order):
+            with self.assertNumQueries(1):
+                row = model.objects.filter(user=user).lite().get()
+                assert row.stock.symbol == "LITE"
+            assert row.get_deferred_fields() == {"notes"}
+            assert row.stock.get_deferred_fields() == {"description"}
+
+    def test_price_history_loads_ohlcv_only(self):
+        """Test get_price_history skips the audit timestamps."""
+        stock = StockFactory.create(symbol="OHLC", name="OHLC Corp")
+        StockPriceFactory.create(stock=stock, close_price=Decimal("10.00"))
+
+        bar = stock.get_price_history(days=5)[0]
+
+        assert {"created_at", "updated_at"} <= bar.get_deferred_fields()
+        assert bar.close_price == Decimal("10.00")
@@ -75,6 +75,52 @@ class TestBotEngineComponents(TestCase):
             if first_date and last_date:
                 assert first_date <= last_date
 
+    def test_get_price_data_aggregates_ticks(self):
+        """Test ticks are aggregated into daily OHLCV candles."""
+        from datetime import UTC, datetime, timedelta
+
+        from django.utils import timezone
+
+        from stocks.models import StockTick
+
+        yesterday = timezone.now().date() - timedelta(days=1)
+        day_start = datetime(
+            yesterday.year, yesterday.month, yesterday.day, 14, tzinfo=UTC
+        )
+        for minute, price, volume in [
+            (0, "10.00", 100),
+            (1, "12.00", 50),
+            (2, "9.00", 25),
+            (3, "11.00", 10),
+        ]:
+            StockTick.objects.create(
+                stock=self.stock,
+                timestamp=day_start + timedelta(minutes=minute),
+                price=Decimal(price),
+                volume=volume,
+            )
+        StockTick.objects.create(
+            stock=self.stock,
+            timestamp=day_start + timedelta(days=1),
+            price=Decimal("11.50"),
+            volume=5,
+        )
+
+        price_data = self.bot._get_price_data(self.stock)
+
+        assert [candle["date"] for candle in price_data] == [
+            yesterday.isoformat(),
+            (yesterday + timedelta(days=1)).isoformat(),
+        ]
+        first = price_data[0]
+        assert first["open_price"] == Decimal("10.00")
+        assert first["high_price"] == Decimal("12.00")
+        assert first["low_price"] == Decimal("9.00")
+        assert first["close_price"] == Decimal("11.00")
+        assert first["volume"] == 185
+        assert first["_data_source"] == "tick"
+        assert price_data[1]["close_price"] == Decimal("11.50")
+
     def test_calculate_indicators_enabled_indicators(self):
         """Test calculating enabled indicators."""
         price_data = [
@@ -2,8 +2,11 @@
 Unit tests for pattern detector.
 """
 
+import dataclasses
+import math
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
 pytestmark = pytest.mark.unit
@@ -16,6 +19,33 @@ from stocks.tests.fixtures.sample_data import (
 )
 
 
+class TestToNumber:
+    """Test to_number function."""
+
+    def test_to_number_converts_numeric_types(self):
+        """Test ints, floats, strings and Decimals become floats."""
+        assert pattern_detector.to_number(3) == 3.0
+        assert pattern_detector.to_number(1.5) == 1.5
+        assert pattern_detector.to_number(" 2.25 ") == 2.25
+        assert pattern_detector.to_number(Decimal("101.50")) == 101.5
+
+    def test_to_number_rejects_invalid_values(self):
+        """Test missing, unparsable and non-finite values return None."""
+        for value in (
+            None,
+            "abc",
+            "",
+            float("nan"),
+            float("inf"),
+            "nan",
+            Decimal("NaN"),
+            Decimal("sNaN"),
+            Decimal("-Infinity"),
+            object(),
+        ):
+            assert pattern_detector.to_number(value) is None
+
+
 class TestCandlestick:
     """Test Candlestick class."""
 
@@ -56,6 +86,15 @@ class TestCandlestick:
         candle = pattern_detector.Candlestick(100.0, 105.0, 98.0, 102.0, 0)
         assert candle.total_range == 7.0  # 105 - 98
 
+    def test_candlestick_is_immutable(self):
+        """Test prices cannot change under the precomputed properties."""
+        candle = pattern_detector.Candlestick(100.0, 105.0, 98.0, 102.0, 0)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            candle.close = 99.0
+        assert candle.is_bullish is True
+        assert candle.body_size == 2.0
+
 
 class TestToCandlestick:
     """Test to_candlestick function."""
@@ -98,6 +137,370 @@ class TestToCandlestick:
         assert candle is None
 
 
+class TestToOhlcArrays:
+    """Test _to_ohlc_arrays function."""
+
+    def test_to_ohlc_arrays_matches_to_candlestick(self):
+        """Test arrays use the same close fallback as to_candlestick."""
+        data = [
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": "105.00",
+                "low_price": 98,
+                "close_price": 102.0,
+            },
+            {"open_price": 0, "high_price": "bad", "close_price": Decimal("101.50")},
+            {"open_price": 100.0, "high_price": 101.0, "close_price": None},
+        ]
+        opens, highs, lows, closes = pattern_detector._to_ohlc_arrays(data)
+
+        for index in range(2):
+            candle = pattern_detector.to_candlestick(data[index], index)
+            assert opens[index] == candle.open
+            assert highs[index] == candle.high
+            assert lows[index] == candle.low
+            assert closes[index] == candle.close
+
+        # Bars without a valid close are NaN throughout
+        assert pattern_detector.to_candlestick(data[2], 2) is None
+        assert all(math.isnan(column[2]) for column in (opens, highs, lows, closes))
+
+    def test_detectors_accept_precomputed_ohlc(self):
+        """Test detectors give the same matches with shared arrays."""
+        data = generate_price_data(days=60)
+        ohlc = pattern_detector._to_ohlc_arrays(data)
+
+        for detector in (
+            pattern_detector.detect_three_white_soldiers,
+            pattern_detector.detect_engulfing,
+            pattern_detector.detect_double_top,
+            pattern_detector.detect_flag,
+        ):
+            expected = [m.to_dict() for m in detector(data)]
+            assert [m.to_dict() for m in detector(data, ohlc=ohlc)] == expected
+
+
+class TestBarFeatures:
+    """Test _bar_features function."""
+
+    def test_bar_features_match_candlestick_properties(self):
+        """Test the feature arrays agree with Candlestick for every valid bar."""
+        data = [
+            {
+                "open_price": 100.0,
+                "high_price": 105.0,
+                "low_price": 98.0,
+                "close_price": 102.0,
+            },
+            {
+                "open_price": 102.0,
+                "high_price": 102.0,
+                "low_price": 102.0,
+                "close_price": 100.0,
+            },
+            {"close_price": None},
+        ]
+        ohlc = pattern_detector._to_ohlc_arrays(data)
+
+        valid, bullish, body, total_range, upper_wick, lower_wick, marubozu = (
+            pattern_detector._bar_features(*ohlc)
+        )
+
+        assert valid.tolist() == [True, True, False]
+        assert marubozu.tolist() == [False, True, False]
+        for index in range(2):
+            candle = pattern_detector.to_candlestick(data[index], index)
+            assert bullish[index] == candle.is_bullish
+            assert body[index] == candle.body_size
+            assert total_range[index] == candle.total_range
+            assert upper_wick[index] == candle.upper_wick
+            assert lower_wick[index] == candle.lower_wick
+
+
+class TestAllOf:
+    """Test _all_of function."""
+
+    def test_all_of_ands_masks_without_touching_inputs(self):
+        """Test the masks are combined into a new array."""
+        first = np.array([True, True, False, True])
+        second = np.array([True, False, False, True])
+
+        result = pattern_detector._all_of(first, second, [True, True, True, False])
+
+        assert result.tolist() == [True, False, False, False]
+        assert first.tolist() == [True, True, False, True]
+
+
+class TestSignalCodes:
+    """Test the _SIGNALS lookup table."""
+
+    def test_signal_codes_map_to_signal_names(self):
+        """Test 1, -1 and 0 index the bullish, bearish and neutral signals."""
+        assert pattern_detector._SIGNALS[1] == "bullish"
+        assert pattern_detector._SIGNALS[-1] == "bearish"
+        assert pattern_detector._SIGNALS[0] == "neutral"
+        assert pattern_detector._SIGNAL_LABELS[-1] == "Bearish"
+
+
+class TestValidAnchors:
+    """Test _valid_anchors function."""
+
+    def test_valid_anchors_skip_windows_with_missing_closes(self):
+        """Test only windows made entirely of valid bars are returned."""
+        closes = pattern_detector._to_ohlc_arrays(
+            [
+                {"close_price": 100},
+                {"close_price": 101},
+                {"close_price": 102},
+                {"close_price": None},
+                {"close_price": 104},
+                {"close_price": 105},
+                {"close_price": 106},
+            ]
+        )[3]
+
+        assert pattern_detector._valid_anchors(closes, 1) == [0, 1, 2, 4, 5, 6]
+        assert pattern_detector._valid_anchors(closes, 3) == [2, 6]
+        assert pattern_detector._valid_anchors(closes, 4) == []
+        assert pattern_detector._valid_anchors(closes[:2], 3) == []
+
+
+class TestFindPivots:
+    """Test _find_pivots function."""
+
+    def test_find_pivots_marks_local_peaks_and_troughs(self):
+        """Test peaks and troughs are strict local extremes away from the edges."""
+        highs = [5.0, 3.0, 6.0, 4.0, 4.0, 7.0, 2.0, 8.0]
+        lows = [1.0, 3.0, 2.0, 4.0, 4.0, 1.0, 5.0, 0.5]
+        data = [
+            {"high_price": high, "low_price": low, "close_price": (high + low) / 2}
+            for high, low in zip(highs, lows, strict=True)
+        ]
+        _, high_arr, low_arr, _ = pattern_detector._to_ohlc_arrays(data)
+
+        peak_idx, trough_idx, peak_val, trough_val = pattern_detector._find_pivots(
+            high_arr, low_arr
+        )
+
+        assert peak_idx.tolist() == [2, 5]
+        assert peak_val.tolist() == [6.0, 7.0]
+        assert trough_idx.tolist() == [2, 5]
+        assert trough_val.tolist() == [2.0, 1.0]
+
+    def test_shared_pivots_match_standalone_detection(self):
+        """Test detect_all_patterns gives the same pivot patterns as the detectors."""
+        data = generate_price_data(days=90)
+        expected = [
+            m.to_dict()
+            for detector in (
+                pattern_detector.detect_head_and_shoulders,
+                pattern_detector.detect_double_top,
+                pattern_detector.detect_double_bottom,
+            )
+            for m in detector(data)
+        ]
+        matches = pattern_detector.detect_all_patterns(
+            data, ["head_and_shoulders", "double_top", "double_bottom"]
+        )
+
+        expected.sort(key=lambda m: m["index"])
+        assert [m.to_dict() for m in matches] == expected
+
+
+class TestPivotWindows:
+    """Test _pivot_windows function."""
+
+    def test_pivot_windows_bound_the_pivots_before_each_bar(self):
+        """Test each bound pair selects the pivots in the lookback window."""
+        highs = [1.0, 3.0, 1.0, 3.0, 2.0, 3.0, 1.0, 2.0]
+        data = [{"high_price": high, "close_price": high} for high in highs]
+        _, high_arr, low_arr, _ = pattern_detector._to_ohlc_arrays(data)
+        peak_idx = pattern_detector._find_pivots(high_arr, low_arr)[0]
+
+        starts, ends = pattern_detector._pivot_windows(peak_idx, len(data), 3)
+
+        windows = [
+            peak_idx[start:end].tolist()
+            for start, end in zip(starts, ends, strict=True)
+        ]
+        assert windows == [[1], [1, 3], [3], [3, 5], [5]]
+
+
+class TestPivotPairDiffs:
+    """Test _pivot_pair_diffs function."""
+
+    def test_pivot_pair_diffs_relative_to_larger_pivot(self):
+        """Test each pivot is compared with the one gap positions later."""
+        values = pattern_detector._to_ohlc_arrays(
+            [{"close_price": price} for price in (100, 98, 104, 99)]
+        )[3]
+
+        assert pattern_detector._pivot_pair_diffs(values, 1) == pytest.approx(
+            [0.02, 6 / 104, 5 / 104]
+        )
+        assert pattern_detector._pivot_pair_diffs(values, 2) == pytest.approx(
+            [4 / 104, 1 / 99]
+        )
+        assert pattern_detector._pivot_pair_diffs(values[:1], 1) == []
+
+
+class TestRollingEnvelope:
+    """Test _rolling_envelope function."""
+
+    def test_rolling_envelope_matches_window_slices(self):
+        """Test each element equals the max/min of its window slice."""
+        highs = [5.0, 7.0, 6.0, 9.0, 4.0, 8.0]
+        lows = [3.0, 2.0, 4.0, 1.0, 3.5, 5.0]
+        data = [
+            {"high_price": high, "low_price": low, "close_price": (high + low) / 2}
+            for high, low in zip(highs, lows, strict=True)
+        ]
+        _, high_arr, low_arr, _ = pattern_detector._to_ohlc_arrays(data)
+
+        window_max, window_min = pattern_detector._rolling_envelope(
+            high_arr, low_arr, 3
+        )
+
+        assert window_max == [max(highs[k : k + 3]) for k in range(4)]
+        assert window_min == [min(lows[k : k + 3]) for k in range(4)]
+
+    def test_rolling_envelope_skips_bars_without_close(self):
+        """Test invalid bars are ignored and all-invalid windows give NaN."""
+        data = [
+            {"high_price": 5.0, "low_price": 3.0, "close_price": 4.0},
+            {"high_price": 9.0, "low_price": 1.0, "close_price": None},
+            {"high_price": 6.0, "low_price": 2.0, "close_price": None},
+            {"high_price": 7.0, "low_price": 4.0, "close_price": 5.0},
+        ]
+        _, high_arr, low_arr, _ = pattern_detector._to_ohlc_arrays(data)
+
+        window_max, window_min = pattern_detector._rolling_envelope(
+            high_arr, low_arr, 2
+        )
+
+        assert window_max[0] == 5.0
+        assert window_min[0] == 3.0
+        assert math.isnan(window_max[1])
+        assert math.isnan(window_min[1])
+        assert window_max[2] == 7.0
+        assert window_min[2] == 4.0
+
+
+class TestScanThreeBar:
+    """Test _scan_three_bar function."""
+
+    def test_scan_three_bar_feeds_the_three_bar_detectors(self):
+        """Test detectors given a shared scan return the scanned anchors."""
+        data = generate_three_white_soldiers_data()
+        ohlc = pattern_detector._to_ohlc_arrays(data)
+        three_bar = pattern_detector._scan_three_bar(*ohlc)
+
+        assert set(three_bar) == {
+            "three_white_soldiers",
+            "morning_doji_star",
+            "morning_star",
+            "abandoned_baby",
+            "tri_star",
+            "advance_block",
+            "stick_sandwich",
+        }
+        assert three_bar["three_white_soldiers"]
+        for pattern, detector in (
+            ("three_white_soldiers", pattern_detector.detect_three_white_soldiers),
+            ("morning_doji_star", pattern_detector.detect_morning_doji_star),
+            ("morning_star", pattern_detector.detect_morning_star),
+            ("abandoned_baby", pattern_detector.detect_abandoned_baby),
+            ("tri_star", pattern_detector.detect_tri_star),
+            ("advance_block", pattern_detector.detect_advance_block),
+            ("stick_sandwich", pattern_detector.detect_stick_sandwich),
+        ):
+            shared = detector(data, ohlc=ohlc, three_bar=three_bar)
+            assert [m.index for m in shared] == three_bar[pattern]
+            assert [m.index for m in detector(data)] == three_bar[pattern]
+
+
+class TestValidWindowEnds:
+    """Test _valid_window_ends function."""
+
+    def test_valid_window_ends_skip_bars_without_close(self):
+        """Test windows report their first/last valid bar and valid count."""
+        valid = np.array([True, False, True, True, False, False, True])
+
+        first, last, count = pattern_detector._valid_window_ends(valid, 3)
+
+        assert first.tolist() == [0, 2, 2, 3, 6]
+        assert last.tolist() == [2, 3, 3, 3, 6]
+        assert count.tolist() == [2, 2, 2, 1, 1]
+
+
+class TestIndicatorBundle:
+    """Test IndicatorBundle class."""
+
+    def test_indicator_bundle_aligns_series_with_data(self):
+        """Test every series has one entry per bar, NaN where undefined."""
+        import math
+
+        data = generate_price_data(days=30)
+
+        bundle = pattern_detector.IndicatorBundle(data)
+
+        assert len(bundle.adx) == len(bundle.bb_middle) == len(bundle.atr) == 30
+        assert math.isnan(bundle.bb_middle[0])
+        assert not math.isnan(bundle.bb_middle[29])
+
+    def test_indicator_bundle_rolling_close_range(self):
+        """Test the rolling max/min cover the 11 closes ending at each bar."""
+        data = generate_price_data(days=30)
+        closes = [float(d["close_price"]) for d in data]
+
+        bundle = pattern_detector.IndicatorBundle(data)
+
+        assert bundle.rolling_max_10[20] == max(closes[10:21])
+        assert bundle.rolling_min_10[20] == min(closes[10:21])
+        assert bundle.rolling_count_10[20] == 11
+        assert bundle.rolling_count_10[5] == 0
+
+    def test_indicator_bundle_computes_series_on_first_use(self):
+        """Test only the indicators a detector reads are calculated, once."""
+        from unittest.mock import patch
+
+        from stocks import indicators
+
+        data = generate_price_data(days=40)
+        bundle = pattern_detector.IndicatorBundle(data)
+
+        with (
+            patch.object(
+                indicators, "calculate_adx", wraps=indicators.calculate_adx
+            ) as adx,
+            patch.object(
+                indicators,
+                "calculate_bollinger_bands",
+                wraps=indicators.calculate_bollinger_bands,
+            ) as bollinger,
+        ):
+            pattern_detector.detect_ranging_regime(data, bundle=bundle)
+            pattern_detector.detect_volatile_regime(data, bundle=bundle)
+
+        adx.assert_not_called()
+        assert bollinger.call_count == 1
+
+    def test_regime_detectors_accept_shared_bundle(self):
+        """Test passing a precomputed bundle gives the same matches."""
+        data = generate_price_data(days=40)
+        bundle = pattern_detector.IndicatorBundle(data)
+
+        for detector in (
+            pattern_detector.detect_trending_regime,
+            pattern_detector.detect_ranging_regime,
+            pattern_detector.detect_volatile_regime,
+            pattern_detector.detect_regime_transition,
+        ):
+            shared = detector(data, bundle=bundle)
+            own = detector(data)
+            assert [m.to_dict() for m in shared] == [m.to_dict() for m in own]
+
+
 class TestThreeWhiteSoldiers:
     """Test Three White Soldiers pattern detection."""
 
@@ -142,6 +545,37 @@ class TestThreeWhiteSoldiers:
             # Index should be at the last candle of the pattern
             assert matches[0].index >= 2
 
+    def test_detect_three_white_soldiers_rejects_long_wicks(self):
+        """Test a candle with wicks over 40% of its range breaks the pattern."""
+        data = [
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("103.20"),
+                "low_price": Decimal("99.80"),
+                "close_price": Decimal("103.00"),
+            },
+            {
+                "open_price": Decimal("101.00"),
+                "high_price": Decimal("106.00"),
+                "low_price": Decimal("98.00"),
+                "close_price": Decimal("104.00"),
+            },
+            {
+                "open_price": Decimal("102.00"),
+                "high_price": Decimal("105.20"),
+                "low_price": Decimal("101.80"),
+                "close_price": Decimal("105.00"),
+            },
+        ]
+
+        assert pattern_detector.detect_three_white_soldiers(data) == []
+
+        # Trimming the middle candle's wicks completes the pattern
+        data[1]["high_price"] = Decimal("104.20")
+        data[1]["low_price"] = Decimal("100.80")
+        matches = pattern_detector.detect_three_white_soldiers(data)
+        assert [m.index for m in matches] == [2]
+
 
 class TestEngulfing:
     """Test Engulfing pattern detection."""
@@ -424,6 +858,109 @@ class TestDetectAllPatterns:
         # Should not crash, return empty list or handle gracefully
         assert isinstance(matches, list)
 
+    def test_detect_all_patterns_with_threads_matches_sequential(self):
+        """Test running the detectors on a thread pool gives the same matches."""
+        data = generate_price_data(days=60)
+
+        sequential = pattern_detector.detect_all_patterns(data)
+        threaded = pattern_detector.detect_all_patterns(data, max_workers=4)
+
+        assert [m.to_dict() for m in threaded] == [m.to_dict() for m in sequential]
+
+    def test_detect_all_patterns_on_process_pool_matches_sequential(self):
+        """Test a caller-supplied process pool gives the same matches."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        data = generate_price_data(days=60)
+
+        sequential = pattern_detector.detect_all_patterns(data)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            pooled = pattern_detector.detect_all_patterns(data, executor=executor)
+
+        assert [m.to_dict() for m in pooled] == [m.to_dict() for m in sequential]
+
+    def test_detect_all_patterns_runs_aliased_detectors_once(self):
+        """Test engulfing aliases share one run and report each match once."""
+        from unittest.mock import patch
+
+        data = generate_engulfing_pattern_data(bullish=True)
+        expected = [m.to_dict() for m in pattern_detector.detect_engulfing(data)]
+
+        with patch.object(
+            pattern_detector,
+            "_run_detector",
+            wraps=pattern_detector._run_detector,
+        ) as run_detector:
+            matches = pattern_detector.detect_all_patterns(
+                data,
+                selected_patterns=[
+                    "engulfing",
+                    "bullish_engulfing",
+                    "bearish_engulfing",
+                ],
+            )
+
+        assert run_detector.call_count == 1
+        assert expected
+        assert [m.to_dict() for m in matches] == expected
+
+    def test_detect_all_patterns_filters_to_selected_alias(self):
+        """Test selecting one engulfing direction drops the other's matches."""
+        data = generate_engulfing_pattern_data(bullish=True)
+
+        bearish = pattern_detector.detect_all_patterns(
+            data, selected_patterns=["bearish_engulfing"]
+        )
+        bullish = pattern_detector.detect_all_patterns(
+            data, selected_patterns=["bullish_engulfing"]
+        )
+
+        assert all(m.pattern == "bearish_engulfing" for m in bearish)
+        assert bullish
+        assert all(m.pattern == "bullish_engulfing" for m in bullish)
+
+    def test_detect_all_patterns_skips_patterns_longer_than_data(self):
+        """Test detectors needing more bars than given are never run."""
+        from unittest.mock import patch
+
+        data = generate_engulfing_pattern_data(bullish=True)[:5]
+
+        with patch.object(
+            pattern_detector,
+            "_run_detector",
+            wraps=pattern_detector._run_detector,
+        ) as run_detector:
+            matches = pattern_detector.detect_all_patterns(
+                data,
+                selected_patterns=[
+                    "engulfing",
+                    "head_and_shoulders",
+                    "regime_transition",
+                ],
+            )
+
+        assert [call.args[0] for call in run_detector.call_args_list] == ["engulfing"]
+        assert [m.to_dict() for m in matches] == [
+            m.to_dict() for m in pattern_detector.detect_engulfing(data)
+        ]
+        assert set(pattern_detector._MIN_BARS) == set(
+            pattern_detector._PATTERN_DETECTORS
+        )
+
+    def test_detect_all_patterns_with_single_bar(self):
+        """Test a single bar is too short for any multi-candle pattern."""
+        data = [
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("105.00"),
+                "low_price": Decimal("95.00"),
+                "close_price": Decimal("101.00"),
+            }
+        ]
+        matches = pattern_detector.detect_all_patterns(data)
+
+        assert all(m.candles == 1 for m in matches)
+
 
 class TestPatternMatch:
     """Test PatternMatch class."""
@@ -468,6 +1005,114 @@ class TestPatternMatch:
         assert result["confidence"] == 0.8
         assert result["description"] == "Test description"
 
+    def test_pattern_match_to_dict_omits_missing_predictions(self):
+        """Test only the prediction fields that were set are serialized."""
+        match = pattern_detector.PatternMatch(
+            pattern="test_pattern",
+            pattern_name="Test Pattern",
+            index=10,
+            candles=3,
+            signal="bullish",
+            confidence=0.8,
+            description="Test description",
+            possible_gain=0.0,
+            loss_probability=0.3,
+        )
+
+        assert list(match.to_dict()) == [
+            "pattern",
+            "pattern_name",
+            "index",
+            "candles",
+            "signal",
+            "confidence",
+            "description",
+            "possible_gain",
+            "loss_probability",
+        ]
+
+    def test_pattern_match_has_no_instance_dict(self):
+        """Test PatternMatch and Candlestick store their fields in slots."""
+        match = pattern_detector.PatternMatch(
+            pattern="test_pattern",
+            pattern_name="Test Pattern",
+            index=10,
+            candles=3,
+            signal="bullish",
+            confidence=0.8,
+            description="Test description",
+        )
+        candle = pattern_detector.Candlestick(100.0, 105.0, 95.0, 102.0, 0)
+
+        assert not hasattr(match, "__dict__")
+        assert not hasattr(candle, "__dict__")
+        with pytest.raises(AttributeError):
+            match.extra = True
+
+    def test_pattern_match_formats_description_on_first_read(self):
+        """Test a description template is filled in from its arguments."""
+        match = pattern_detector.PatternMatch(
+            pattern="flag",
+            pattern_name="Flag",
+            index=10,
+            candles=10,
+            signal="bullish",
+            confidence=0.65,
+            description="{} continuation pattern. Flag: {:.2f}",
+            description_args=("Bullish", 3.456),
+        )
+
+        assert match.description == "Bullish continuation pattern. Flag: 3.46"
+        assert match.to_dict()["description"] == match.description
+
+        match.description = "Replaced"
+        assert match.to_dict()["description"] == "Replaced"
+
+
+class TestPatternPredictions:
+    """Test _calculate_pattern_predictions function."""
+
+    def test_predictions_use_pattern_parameters(self):
+        """Test known patterns use their own ranges and others the defaults."""
+        soldiers = pattern_detector._calculate_pattern_predictions(
+            "three_white_soldiers", "bullish", 0.8
+        )
+        unknown = pattern_detector._calculate_pattern_predictions(
+            "spinning_top", "bullish", 0.8
+        )
+
+        assert soldiers["possible_gain"] == 13.0  # 5 + (15 - 5) * 0.8
+        assert soldiers["gain_probability"] == 0.56  # 0.70 * 0.8
+        assert unknown["possible_gain"] == 8.6  # 3 + (10 - 3) * 0.8
+        neutral = pattern_detector._calculate_pattern_predictions(
+            "spinning_top", "neutral", 0.55
+        )
+        assert neutral == {}
+
+    def test_cached_predictions_return_fresh_dicts(self):
+        """Test repeated calls hit the cache but never share dicts."""
+        pattern_detector._calculate_pattern_predictions_core.cache_clear()
+
+        first = pattern_detector._calculate_pattern_predictions(
+            "double_top", "bearish", 0.7
+        )
+        first["consequences"]["best_case"]["gain"] = -1.0
+        second = pattern_detector._calculate_pattern_predictions(
+            "double_top", "bearish", 0.7
+        )
+
+        assert second["consequences"]["best_case"]["gain"] == 7.0  # 10 * 0.7
+        cache_info = pattern_detector._calculate_pattern_predictions_core.cache_info()
+        assert cache_info.hits == 1
+        assert cache_info.misses == 1
+
+    def test_pattern_parameters_are_read_only(self):
+        """Test the shared parameter tables cannot be mutated."""
+        with pytest.raises(TypeError):
+            pattern_detector._PATTERN_PARAMS["double_top"]["success_rate"] = 1.0
+        with pytest.raises(TypeError):
+            pattern_detector._DEFAULT_PARAMS["success_rate"] = 1.0
+
 
 class TestAbandonedBaby:
     """Test Abandoned Baby pattern detection."""
@@ -552,6 +1197,45 @@ class TestFlag:
         # May or may not detect depending on exact structure
         assert isinstance(matches, list)
 
+    def test_detect_flag_ignores_bars_without_close(self):
+        """Test window highs and lows skip bars without a valid close."""
+        data = []
+        for i in range(5):
+            price = 100.0 + i * 3.0
+            data.append(
+                {
+                    "high_price": price + 1,
+                    "low_price": price - 0.5,
+                    "close_price": price,
+                }
+            )
+        for i in range(6):
+            price = 113.0 - i * 0.6
+            data.append(
+                {
+                    "high_price": price + 0.5,
+                    "low_price": price - 0.5,
+                    "close_price": price,
+                }
+            )
+        data[7] = {"close_price": None}
+
+        matches = pattern_detector.detect_flag(data)
+
+        assert [(m.index, m.signal) for m in matches] == [(10, "bullish")]
+        assert matches[0].description.endswith("Flagpole: 13.50, Flag: 3.40")
+
+    def test_detect_flag_with_non_positive_flag_low(self):
+        """Test a flag whose low reaches zero is skipped rather than raising."""
+        data = [
+            {"high_price": 5.0 + i, "low_price": 1.0 + i, "close_price": 3.0 + i}
+            for i in range(5)
+        ] + [
+            {"high_price": 1.0, "low_price": 0.0, "close_price": 0.0} for _ in range(6)
+        ]
+
+        assert pattern_detector.detect_flag(data) == []
+
     def test_detect_flag_with_insufficient_data(self):
         """Test pattern detection with insufficient data."""
         data = [{"close_price": Decimal("100.00")} for _ in range(10)]
@@ -664,3 +1348,263 @@ class TestWedge:
 
         # Need sufficient data for wedge pattern
         assert isinstance(matches, list)
+
+
+class TestKicking:
+    """Test Kicking pattern detection."""
+
+    def test_detect_kicking_with_gapped_marubozu_candles(self):
+        """Test a bearish marubozu gapped over by a bullish one is detected."""
+        data = [
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("101.00"),
+                "low_price": Decimal("98.00"),
+                "close_price": Decimal("99.00"),
+            },
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("100.00"),
+                "low_price": Decimal("96.00"),
+                "close_price": Decimal("96.00"),
+            },
+            {
+                "open_price": Decimal("101.00"),
+                "high_price": Decimal("105.00"),
+                "low_price": Decimal("101.00"),
+                "close_price": Decimal("105.00"),
+            },
+        ]
+
+        matches = pattern_detector.detect_kicking(data)
+
+        assert [m.index for m in matches] == [2]
+        assert matches[0].signal == "bullish"
+
+
+class TestHomingPigeon:
+    """Test Homing Pigeon pattern detection."""
+
+    def test_detect_homing_pigeon_with_contained_bearish_candle(self):
+        """Test a smaller bearish candle inside the previous one is detected."""
+        data = [
+            {
+                "open_price": Decimal("110.00"),
+                "high_price": Decimal("111.00"),
+                "low_price": Decimal("99.00"),
+                "close_price": Decimal("100.00"),
+            },
+            {
+                "open_price": Decimal("108.00"),
+                "high_price": Decimal("109.00"),
+                "low_price": Decimal("101.00"),
+                "close_price": Decimal("102.00"),
+            },
+        ]
+
+        matches = pattern_detector.detect_homing_pigeon(data)
+        assert [m.index for m in matches] == [1]
+
+        # A second candle with a larger body is not a homing pigeon
+        data[1]["close_price"] = Decimal("99.50")
+        data[1]["low_price"] = Decimal("99.50")
+        data[1]["open_price"] = Decimal("110.00")
+        assert pattern_detector.detect_homing_pigeon(data) == []
+
+
+class TestSpinningTop:
+    """Test Spinning Top pattern detection."""
+
+    def test_detect_spinning_top_requires_long_wicks_on_both_sides(self):
+        """Test only small-bodied candles with two long wicks are detected."""
+        data = [
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("104.00"),
+                "low_price": Decimal("96.00"),
+                "close_price": Decimal("101.00"),
+            },
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("101.50"),
+                "low_price": Decimal("96.00"),
+                "close_price": Decimal("101.00"),
+            },
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("100.00"),
+                "low_price": Decimal("100.00"),
+                "close_price": Decimal("100.00"),
+            },
+        ]
+
+        matches = pattern_detector.detect_spinning_top(data)
+
+        assert [m.index for m in matches] == [0]
+        assert matches[0].signal == "neutral"
+
+
+class TestStickSandwich:
+    """Test Stick Sandwich pattern detection."""
+
+    def test_detect_stick_sandwich_with_matching_outer_closes(self):
+        """Test a bullish candle between two bearish ones with equal closes."""
+        data = [
+            {"open_price": Decimal("104.00"), "close_price": Decimal("100.00")},
+            {"open_price": Decimal("101.00"), "close_price": Decimal("103.00")},
+            {"open_price": Decimal("105.00"), "close_price": Decimal("100.50")},
+        ]
+
+        matches = pattern_detector.detect_stick_sandwich(data)
+        assert [m.index for m in matches] == [2]
+
+        # Outer closes more than 2% apart break the pattern
+        data[2]["close_price"] = Decimal("97.00")
+        assert pattern_detector.detect_stick_sandwich(data) == []
+
+
+class TestAdvanceBlock:
+    """Test Advance Block pattern detection."""
+
+    def test_detect_advance_block_with_shrinking_bodies(self):
+        """Test rising bullish candles with shrinking bodies and growing wicks."""
+        data = [
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("106.50"),
+                "low_price": Decimal("99.50"),
+                "close_price": Decimal("106.00"),
+            },
+            {
+                "open_price": Decimal("104.00"),
+                "high_price": Decimal("109.00"),
+                "low_price": Decimal("103.50"),
+                "close_price": Decimal("108.00"),
+            },
+            {
+                "open_price": Decimal("107.00"),
+                "high_price": Decimal("111.00"),
+                "low_price": Decimal("106.50"),
+                "close_price": Decimal("109.00"),
+            },
+        ]
+
+        matches = pattern_detector.detect_advance_block(data)
+
+        assert [m.index for m in matches] == [2]
+        assert matches[0].signal == "bearish"
+
+
+class TestConcealBabySwallow:
+    """Test Conceal Baby Swallow pattern detection."""
+
+    def test_detect_conceal_baby_swallow_with_valid_pattern(self):
+        """Test two bearish marubozu, a gap down and a smaller inside candle."""
+        data = [
+            {
+                "open_price": Decimal("110.00"),
+                "high_price": Decimal("110.00"),
+                "low_price": Decimal("106.00"),
+                "close_price": Decimal("106.00"),
+            },
+            {
+                "open_price": Decimal("106.00"),
+                "high_price": Decimal("106.00"),
+                "low_price": Decimal("102.00"),
+                "close_price": Decimal("102.00"),
+            },
+            {
+                "open_price": Decimal("101.00"),
+                "high_price": Decimal("101.50"),
+                "low_price": Decimal("97.00"),
+                "close_price": Decimal("98.00"),
+            },
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("100.50"),
+                "low_price": Decimal("98.50"),
+                "close_price": Decimal("99.00"),
+            },
+        ]
+
+        matches = pattern_detector.detect_conceal_baby_swallow(data)
+
+        assert [m.index for m in matches] == [3]
+        assert matches[0].signal == "bullish"
+
+    def test_detect_conceal_baby_swallow_requires_marubozu(self):
+        """Test a wick on the first candle rules the pattern out."""
+        data = [
+            {
+                "open_price": Decimal("110.00"),
+                "high_price": Decimal("111.00"),
+                "low_price": Decimal("106.00"),
+                "close_price": Decimal("106.00"),
+            },
+            {
+                "open_price": Decimal("106.00"),
+                "high_price": Decimal("106.00"),
+                "low_price": Decimal("102.00"),
+                "close_price": Decimal("102.00"),
+            },
+            {
+                "open_price": Decimal("101.00"),
+                "high_price": Decimal("101.50"),
+                "low_price": Decimal("97.00"),
+                "close_price": Decimal("98.00"),
+            },
+            {
+                "open_price": Decimal("100.00"),
+                "high_price": Decimal("100.50"),
+                "low_price": Decimal("98.50"),
+                "close_price": Decimal("99.00"),
+            },
+        ]
+
+        assert pattern_detector.detect_conceal_baby_swallow(data) == []
+
+
+class TestTransitionIndicators:
+    """Test _calculate_transition_indicators function."""
+
+    def test_breakout_must_clear_every_earlier_close(self):
+        """Test a breakout clears the whole earlier range, ignoring NaN closes."""
+        prev_closes = np.array([100.0, np.nan, 104.0])
+
+        def breaking_out(price, closes=prev_closes):
+            return pattern_detector._calculate_transition_indicators(
+                20.0, 20.0, 0.05, 0.05, price, closes
+            )[2]
+
+        assert breaking_out(107.0) is True
+        assert breaking_out(105.0) is False
+        assert breaking_out(97.0) is True
+        assert breaking_out(99.0) is False
+        assert breaking_out(200.0, np.array([np.nan])) is False
+
+
+class TestParsedPriceRows:
+    """Test _parsed_price_rows function."""
+
+    def test_parsed_price_rows_parse_each_field_once(self):
+        """Test price fields become floats, keeping what does not parse."""
+        data = [
+            {
+                "open_price": "ignored",
+                "high_price": Decimal("105.50"),
+                "low_price": "98.25",
+                "close_price": 101,
+            },
+            {"high_price": "bad", "low_price": None, "close_price": Decimal("NaN")},
+        ]
+
+        rows = pattern_detector._parsed_price_rows(data)
+
+        assert rows[0] == {
+            "high_price": 105.5,
+            "low_price": 98.25,
+            "close_price": 101.0,
+        }
+        assert rows[1]["high_price"] is None
+        assert rows[1]["low_price"] is None
+        assert rows[1]["close_price"].is_nan()
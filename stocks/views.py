@@ -1,7 +1,9 @@
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from django.db import transaction
 from django.db.models import Avg, Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -64,13 +66,34 @@ from .services import alpha_vantage_service
 logger = logging.getLogger(__name__)
 
 
-class StockListView(generics.ListAPIView):
+class LatestPricePageMixin:
+    """
+    Prime ``Stock.latest_price`` for every row on a page with one query.
+
+    ``latest_price_stock_attr`` names the attribute holding the stock on each
+    row; set it to None when the rows are stocks themselves.
+    """
+
+    latest_price_stock_attr = "stock"
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            attr = self.latest_price_stock_attr
+            Stock.prefetch_latest_prices(
+                getattr(row, attr) if attr else row for row in page
+            )
+        return page
+
+
+class StockListView(LatestPricePageMixin, generics.ListAPIView):
     """
     List all active stocks with optional search and filtering.
     """
 
     serializer_class = StockSerializer
     permission_classes = [permissions.IsAuthenticated]
+    latest_price_stock_attr = None
 
     def get_queryset(self):
         queryset = Stock.objects.filter(is_active=True)
@@ -108,7 +131,11 @@ class AllStocksListView(generics.ListAPIView):
     pagination_class = None  # Disable pagination to return all stocks
 
     def get_queryset(self):
-        return Stock.objects.filter(is_active=True).order_by("symbol")
+        return (
+            Stock.objects.filter(is_active=True)
+            .only("id", "symbol", "name")
+            .order_by("symbol")
+        )
 
 
 class StockDetailView(generics.RetrieveAPIView):
@@ -154,7 +181,9 @@ class StockTimeSeriesView(APIView):
         limit = validated_data.get("limit")  # Can be None if -1 or 0 was sent
 
         # Build query
-        queryset = StockPrice.objects.filter(stock=stock, interval=interval)
+        queryset = StockPrice.objects.filter(
+            stock=stock, interval=interval
+        ).with_metrics()
 
         if start_date:
             queryset = queryset.filter(date__gte=start_date)
@@ -193,7 +222,11 @@ class StockPriceListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = StockPrice.objects.select_related("stock")
+        queryset = (
+            StockPrice.objects.select_related("stock")
+            .defer("stock__description")
+            .with_metrics()
+        )
 
         # Filter by stock symbol
         symbol = self.request.query_params.get("symbol", None)
@@ -233,7 +266,7 @@ class StockPriceListView(generics.ListAPIView):
         return queryset.order_by("-date", "stock__symbol")
 
 
-class UserWatchlistView(generics.ListCreateAPIView):
+class UserWatchlistView(LatestPricePageMixin, generics.ListCreateAPIView):
     """
     List user's watchlist or add a stock to watchlist.
     """
@@ -419,7 +452,7 @@ def user_dashboard(request):
     user = request.user
 
     # Get user's watchlist with latest prices
-    watchlist = UserWatchlist.objects.filter(user=user).select_related("stock")
+    watchlist = UserWatchlist.objects.filter(user=user).lite()
     watchlist_data = []
 
     for item in watchlist:
@@ -500,7 +533,9 @@ class IntradayPriceView(APIView):
         session_type = validated_data["session_type"]
 
         # Build query
-        queryset = IntradayPrice.objects.filter(stock=stock, interval=interval)
+        queryset = IntradayPrice.objects.filter(
+            stock=stock, interval=interval
+        ).with_metrics()
 
         if start_time:
             queryset = queryset.filter(timestamp__gte=start_time)
@@ -587,7 +622,7 @@ class StockTickDataView(APIView):
                 )
 
         # Build query
-        queryset = StockTick.objects.filter(stock=stock)
+        queryset = StockTick.objects.filter(stock=stock).with_metrics()
 
         if start_time:
             queryset = queryset.filter(timestamp__gte=start_time)
@@ -630,7 +665,11 @@ class IntradayPriceListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = IntradayPrice.objects.select_related("stock")
+        queryset = (
+            IntradayPrice.objects.select_related("stock")
+            .defer("stock__description")
+            .with_metrics()
+        )
 
         # Filter by stock symbol
         symbol = self.request.query_params.get("symbol", None)
@@ -645,6 +684,8 @@ class IntradayPriceListView(generics.ListAPIView):
         # Filter by session type
         session_type = self.request.query_params.get("session_type", None)
         if session_type:
+            if session_type not in IntradayPrice.SESSION_TYPE_CODES:
+                return queryset.none()
             queryset = queryset.filter(session_type=session_type)
 
         # Filter by time range
@@ -676,7 +717,11 @@ class StockTickListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = StockTick.objects.select_related("stock")
+        queryset = (
+            StockTick.objects.select_related("stock")
+            .defer("stock__description")
+            .with_metrics()
+        )
 
         # Filter by stock symbol
         symbol = self.request.query_params.get("symbol", None)
@@ -686,6 +731,8 @@ class StockTickListView(generics.ListAPIView):
         # Filter by trade type
         trade_type = self.request.query_params.get("trade_type", None)
         if trade_type and trade_type != "all":
+            if trade_type not in StockTick.TRADE_TYPE_CODES:
+                return queryset.none()
             queryset = queryset.filter(trade_type=trade_type)
 
         # Filter by market hours
@@ -979,7 +1026,7 @@ def sync_stock_data(request):
     )
 
 
-class PortfolioListView(generics.ListCreateAPIView):
+class PortfolioListView(LatestPricePageMixin, generics.ListCreateAPIView):
     """
     List user's portfolio holdings or add a new stock purchase.
     """
@@ -1091,7 +1138,8 @@ def portfolio_summary(request):
         cash_balance = 0.00
 
     # Get all portfolio holdings
-    holdings = Portfolio.objects.filter(user=user).select_related("stock")
+    holdings = list(Portfolio.objects.filter(user=user).lite())
+    Stock.prefetch_latest_prices(holding.stock for holding in holdings)
 
     # Calculate totals
     total_cost = Decimal("0.00")
@@ -1146,7 +1194,7 @@ def portfolio_summary(request):
     )
 
 
-class OrderListView(generics.ListCreateAPIView):
+class OrderListView(LatestPricePageMixin, generics.ListCreateAPIView):
     """
     List user's orders or create a new order.
     """
@@ -1236,6 +1284,31 @@ class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
         )
 
 
+def _unmet_conditions_reason(order, latest_close):
+    """Explain why a waiting order's execution conditions are not met."""
+    if order.order_type != "target":
+        return _("Order cannot be executed - conditions not met.")
+    if latest_close is None:
+        return _("Target price order cannot execute - no price data available.")
+    return _("Target price not met. Current: $%(current)s, Target: $%(target)s") % {
+        "current": f"{latest_close:,.2f}",
+        "target": f"{order.target_price:,.2f}",
+    }
+
+
+def _failed_order_data(order, error_reason):
+    """Build the execute_orders response entry for an order that did not run."""
+    return {
+        "id": str(order.id),
+        "stock_symbol": order.stock.symbol,
+        "transaction_type": order.transaction_type,
+        "order_type": order.order_type,
+        "quantity": float(order.quantity),
+        "status": order.status,
+        "error": error_reason,
+    }
+
+
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
 def execute_orders(request):
@@ -1245,25 +1318,21 @@ def execute_orders(request):
     """
     user = request.user if request.user.is_authenticated else None
 
-    # Get all waiting orders
+    # Get all waiting orders, screened against their execution conditions
     if user:
         orders = Order.objects.filter(user=user, status="waiting")
     else:
         orders = Order.objects.filter(status="waiting")
+    orders = orders.with_executability()
+    # Loaded before executing, so orders failing in the batch are not repeated
+    skipped = list(orders.filter(is_executable=False).select_related("stock"))
 
     executed_count = 0
     executed_orders = []
     failed_orders = []
 
-    for order in orders:
-        # Store original status
-
-        # Try to execute
-        executed = order.execute()
-
-        # Refresh from DB to get updated status
-        order.refresh_from_db()
-
+    # Execute in one batch; each order's in-memory state reflects the outcome
+    for order, executed in Order.execute_batch(orders.filter(is_executable=True)):
         if executed:
             executed_count += 1
             executed_orders.append(
@@ -1308,31 +1377,9 @@ def execute_orders(request):
                     except Portfolio.DoesNotExist:
                         error_reason = _("No shares available to sell for this stock.")
             elif not order.can_execute:
-                if order.order_type == "target":
-                    latest_price = order.stock.latest_price
-                    if latest_price:
-                        if order.transaction_type == "buy":
-                            error_reason = _(
-                                "Target price not met. Current: $%(current)s, "
-                                "Target: $%(target)s"
-                            ) % {
-                                "current": f"{latest_price.close_price:,.2f}",
-                                "target": f"{order.target_price:,.2f}",
-                            }
-                        else:  # sell
-                            error_reason = _(
-                                "Target price not met. Current: $%(current)s, "
-                                "Target: $%(target)s"
-                            ) % {
-                                "current": f"{latest_price.close_price:,.2f}",
-                                "target": f"{order.target_price:,.2f}",
-                            }
-                    else:
-                        error_reason = _(
-                            "Target price order cannot execute - no price data available."
-                        )
-                else:
-                    error_reason = _("Order cannot be executed - conditions not met.")
+                error_reason = _unmet_conditions_reason(
+                    order, order.stock.latest_close_price
+                )
             else:
                 latest_price = order.stock.latest_price
                 if not latest_price:
@@ -1342,17 +1389,15 @@ def execute_orders(request):
                 else:
                     error_reason = _("Order execution failed - unknown reason.")
 
-            failed_orders.append(
-                {
-                    "id": str(order.id),
-                    "stock_symbol": order.stock.symbol,
-                    "transaction_type": order.transaction_type,
-                    "order_type": order.order_type,
-                    "quantity": float(order.quantity),
-                    "status": order.status,
-                    "error": error_reason,
-                }
-            )
+            failed_orders.append(_failed_order_data(order, error_reason))
+
+    # Orders screened out in SQL are reported without being executed
+    failed_orders.extend(
+        _failed_order_data(
+            order, _unmet_conditions_reason(order, order.execution_price)
+        )
+        for order in skipped
+    )
 
     response_data = {
         "executed_count": executed_count,
@@ -1438,7 +1483,9 @@ class TradingBotListView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated, IsAdminRole]
 
     def get_queryset(self):
-        return TradingBotConfig.objects.filter(user=self.request.user)
+        return TradingBotConfig.objects.filter(
+            user=self.request.user
+        ).with_assignment_flags()
 
     def perform_create(self, serializer):
         bot = serializer.save(user=self.request.user)
@@ -1460,7 +1507,9 @@ class TradingBotDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, IsAdminRole]
 
     def get_queryset(self):
-        return TradingBotConfig.objects.filter(user=self.request.user)
+        return TradingBotConfig.objects.filter(
+            user=self.request.user
+        ).with_assignment_flags()
 
     def perform_update(self, serializer):
         bot = serializer.save()
@@ -1551,59 +1600,91 @@ def execute_bot(request, pk):
         results = bot.run_analysis()
 
         # Create execution records for skipped stocks (executed trades will create their own records)
-        from .models import TradingBotExecution
+        from datetime import timedelta
 
-        for skipped_stock in results.get("skipped", []):
-            try:
-                stock = Stock.objects.get(symbol=skipped_stock.get("stock"))
-                # Create execution record for skipped stocks
-                execution = TradingBotExecution.objects.create(
-                    bot_config=bot_config,
-                    stock=stock,
-                    action=skipped_stock.get("action", "skip"),
-                    reason=skipped_stock.get("reason", "No reason provided"),
-                    indicators_data=skipped_stock.get("indicators", {}),
-                    patterns_detected={
+        from .models import BotSignalHistory, TradingBotExecution
+
+        skipped = results.get("skipped", [])
+        skipped_stocks = Stock.objects.in_bulk(
+            {skipped_stock.get("stock") for skipped_stock in skipped},
+            field_name="symbol",
+        )
+        execution_rows = []
+        for skipped_stock in skipped:
+            stock = skipped_stocks.get(skipped_stock.get("stock"))
+            if stock is None:
+                logger.warning(
+                    f"Stock {skipped_stock.get('stock')} not found when creating execution record"
+                )
+                continue
+            execution_rows.append(
+                {
+                    "bot_config": bot_config,
+                    "stock": stock,
+                    "action": skipped_stock.get("action", "skip"),
+                    "reason": skipped_stock.get("reason", "No reason provided"),
+                    "indicators_data": skipped_stock.get("indicators", {}),
+                    "patterns_detected": {
                         p.get("pattern", f"pattern_{idx}"): p
                         for idx, p in enumerate(skipped_stock.get("patterns", []))
                     },
-                    risk_score=Decimal(str(skipped_stock.get("risk_score")))
+                    "risk_score": Decimal(str(skipped_stock.get("risk_score")))
                     if skipped_stock.get("risk_score")
                     else None,
-                    executed_order=None,
-                )
-
-                # Link to signal history if available
-                from datetime import timedelta
-
-                from .models import BotSignalHistory
+                    "executed_order": None,
+                }
+            )
 
-                # Find signal history within 1 minute of execution
-                time_window_start = execution.timestamp - timedelta(minutes=1)
-                time_window_end = execution.timestamp + timedelta(minutes=1)
+        try:
+            executions = TradingBotExecution.record_batch(execution_rows)
+        except Exception:
+            # Fall back to one insert per record so a bad row only loses itself
+            logger.exception("Error batching execution records for skipped stocks")
+            executions = []
+            for row in execution_rows:
+                try:
+                    with transaction.atomic():
+                        execution = TradingBotExecution.objects.create(**row)
+                    executions.append(execution)
+                except Exception:
+                    logger.exception(
+                        f"Error creating execution record for {row['stock'].symbol}"
+                    )
 
-                signal_history = (
+        # Link each execution to the newest signal history within 1 minute of
+        # it, fetching the candidates for every execution in one query
+        if executions:
+            try:
+                window = timedelta(minutes=1)
+                candidates = defaultdict(list)
+                for signal_history in (
                     BotSignalHistory.objects.filter(
                         bot_config=bot_config,
-                        stock=stock,
-                        timestamp__gte=time_window_start,
-                        timestamp__lte=time_window_end,
+                        stock__in={execution.stock_id for execution in executions},
+                        timestamp__gte=min(e.timestamp for e in executions) - window,
+                        timestamp__lte=max(e.timestamp for e in executions) + window,
                     )
                     .order_by("-timestamp")
-                    .first()
-                )
-
-                if signal_history:
-                    signal_history.execution = execution
-                    signal_history.save()
-            except Stock.DoesNotExist:
-                logger.warning(
-                    f"Stock {skipped_stock.get('stock')} not found when creating execution record"
-                )
+                    .only("id", "stock_id", "timestamp")
+                ):
+                    candidates[signal_history.stock_id].append(signal_history)
+
+                linked_histories = []
+                for execution in executions:
+                    signal_history = next(
+                        (
+                            candidate
+                            for candidate in candidates[execution.stock_id]
+                            if abs(candidate.timestamp - execution.timestamp) <= window
+                        ),
+                        None,
+                    )
+                    if signal_history:
+                        signal_history.execution = execution
+                        linked_histories.append(signal_history)
+                BotSignalHistory.objects.bulk_update(linked_histories, ["execution"])
             except Exception:
-                logger.exception(
-                    f"Error creating execution record for {skipped_stock.get('stock')}"
-                )
+                logger.exception("Error linking signal history to skipped stocks")
 
         # Execute trades for buy/sell signals (using all bot configurations)
         trades_executed = 0
@@ -2068,9 +2149,9 @@ class BotSignalHistoryDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated, IsAdminRole]
 
     def get_queryset(self):
-        return BotSignalHistory.objects.filter(
+        return BotSignalHistory.full_objects.filter(
             bot_config__user=self.request.user
-        ).select_related("bot_config", "stock", "execution")
+        ).select_related("bot_config", "stock", "execution", "payload")
 
 
 class BotSignalAnalyticsView(APIView):
@@ -3,7 +3,7 @@ from decimal import Decimal
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import connections, models, router
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
@@ -180,6 +180,101 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.email}'s Profile"
 
+    def adjust_cash(self, amount):
+        """
+        Add ``amount`` to the cash balance in one conditional UPDATE.
+
+        See ``add_to_balance``. The historical record that ``save()`` would
+        have written is added, attributed to the request user if there is one.
+
+        Args:
+            amount: Amount to add (negative to deduct)
+
+        Returns:
+            True if the balance was updated, False if it would go negative
+        """
+        if not add_to_balance(self, "cash", amount, {"updated_at": timezone.now()}):
+            return False
+        type(self).history.bulk_history_create(
+            [self], update=True, default_user=history_request_user()
+        )
+        return True
+
+
+def add_to_balance(instance, field_name, amount, extra_values=None):
+    """
+    Add ``amount`` to a balance column in one conditional UPDATE.
+
+    The arithmetic runs in the database and the row only changes when the
+    balance stays non-negative, so concurrent writers cannot both spend the
+    same cash. The new balance comes back with ``RETURNING`` instead of a
+    second SELECT and is set on ``instance`` along with ``extra_values``.
+
+    Args:
+        instance: Saved model instance whose row is updated
+        field_name: Name of the DecimalField holding the balance
+        amount: Amount to add (negative to deduct)
+        extra_values: Other field values to write in the same UPDATE
+
+    Returns:
+        True if the balance was updated, False if it would go negative
+    """
+    extra_values = extra_values or {}
+    opts = instance._meta
+    balance_field = opts.get_field(field_name)
+    connection = connections[router.db_for_write(type(instance), instance=instance)]
+    quote = connection.ops.quote_name
+    balance = quote(balance_field.column)
+
+    assignments = [f"{balance} = {balance} + %s"]
+    params = [balance_field.get_db_prep_save(amount, connection)]
+    for name, value in extra_values.items():
+        field = opts.get_field(name)
+        assignments.append(f"{quote(field.column)} = %s")
+        params.append(field.get_db_prep_save(value, connection))
+
+    with connection.cursor() as cursor:
+        # Identifiers come from model metadata, not user input
+        cursor.execute(
+            f"UPDATE {quote(opts.db_table)} "  # noqa: S608
+            f"SET {', '.join(assignments)} "
+            f"WHERE {quote(opts.pk.column)} = %s AND {balance} >= %s "
+            f"RETURNING {balance}",
+            [
+                *params,
+                opts.pk.get_db_prep_value(instance.pk, connection),
+                # The balance this change would leave at zero
+                balance_field.get_db_prep_save(-amount, connection),
+            ],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return False
+
+    setattr(
+        instance,
+        field_name,
+        balance_field.to_python(row[0]).quantize(
+            Decimal(1).scaleb(-balance_field.decimal_places)
+        ),
+    )
+    for name, value in extra_values.items():
+        setattr(instance, name, value)
+    return True
+
+
+def history_request_user():
+    """
+    Return the authenticated user of the current request, if any.
+
+    Reads the request that simple_history's middleware stores on
+    ``HistoricalRecords.context``, for history rows written outside
+    ``save()``.
+    """
+    request = getattr(HistoricalRecords.context, "request", None)
+    user = getattr(request, "user", None)
+    return user if user and user.is_authenticated else None
+
 
 # Signal to create user profile automatically
 @receiver(post_save, sender=User)